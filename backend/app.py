@@ -3,22 +3,31 @@ Flask API Server
 Serves optimization results and STL files to frontend.
 """
 
-from flask import Flask, request, jsonify, send_from_directory, send_file
+from flask import Flask, Response, request, jsonify, send_from_directory, send_file
 from flask_cors import CORS
 import os
 import json
 import sys
 import zipfile
-import hashlib
 import time
+import queue
+import threading
 from pathlib import Path
 from io import BytesIO
 
 # Import your modules
-from optimizer import run_optimization
+from optimizer import (run_optimization, run_multi_material_optimization,
+                       EVALUATORS, TERMINATIONS, SURROGATES)
 from geometry_generator import generate_bracket_stl
 from material_library import load_materials
 from material_advisor import get_material_advisor
+from model_registry import get_model_registry
+from job_queue import OptimizationJobManager, JobQueueFull, FINISHED_STATES
+from single_flight import SingleFlight
+from warm_start import WarmStartIndex
+from result_cache import (compute_request_hash, load_cached_results,
+                          store_cached_results)
+from load_sweep import load_grid, build_scenarios, run_load_sweep
 
 app = Flask(__name__)
 CORS(app)  # Allow frontend to access API
@@ -36,28 +45,30 @@ optimization_cache = {}
 CACHE_DIR = Path('data/cache')
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
+# Identical in-flight requests share one computation (threads via futures,
+# gunicorn workers via <key>.lock files next to the cache entries)
+app.config['INFLIGHT_WAIT_TIMEOUT'] = float(
+    os.environ.get('OPTIMIZER_INFLIGHT_TIMEOUT', 1800))
+single_flight = SingleFlight(CACHE_DIR)
 
-def _compute_request_hash(load, material, pop_size, n_gen):
-    """Create stable hash for optimization inputs."""
-    payload = {
-        'load': round(load, 4),
-        'material': material,
-        'pop_size': pop_size,
-        'n_gen': n_gen
-    }
-    hash_input = json.dumps(payload, sort_keys=True).encode('utf-8')
-    return hashlib.sha1(hash_input).hexdigest()
+# Cache misses seed NSGA-II with Pareto designs of cached runs at nearby loads
+app.config['WARM_START'] = os.environ.get('OPTIMIZER_WARM_START', '1') != '0'
+warm_start_index = WarmStartIndex(CACHE_DIR)
 
+# Surrogate used when a request does not name one (see optimizer.SURROGATES)
+app.config['DEFAULT_SURROGATE'] = os.environ.get('OPTIMIZER_SURROGATE', 'auto')
 
-def _load_cached_results(cache_path):
-    """Load cached optimization results from disk if available."""
-    try:
-        with open(cache_path, 'r') as f:
-            cached_payload = json.load(f)
-        return cached_payload.get('results') or cached_payload
-    except Exception as exc:
-        print(f"[API] Warning: failed to load cache {cache_path}: {exc}")
-        return None
+# Warm-load surrogate ensembles once per process (also runs in the gunicorn
+# master with --preload) and hot reload them when the files change
+app.config['MODEL_RELOAD_INTERVAL'] = float(
+    os.environ.get('MODEL_RELOAD_INTERVAL', 10.0))
+model_registry = get_model_registry()
+try:
+    model_registry.preload()
+    if app.config['MODEL_RELOAD_INTERVAL'] > 0:
+        model_registry.start_watcher(app.config['MODEL_RELOAD_INTERVAL'])
+except Exception as preload_exc:
+    print(f"[API] Warning: surrogate preload failed: {preload_exc}")
 
 
 def _ensure_design_assets(results):
@@ -123,7 +134,8 @@ def index():
     return jsonify({
         'status': 'online',
         'message': 'AI Prosthetic Optimizer API v1.0',
-        'endpoints': ['/api/materials', '/api/optimize', '/models/<filename>']
+        'endpoints': ['/api/materials', '/api/optimize', '/api/jobs', '/api/sweep',
+                      '/models/<filename>']
     })
 
 
@@ -143,6 +155,186 @@ def get_materials():
         }), 500
 
 
+def _parse_optimization_request(data):
+    """
+    Validate an optimization request body.
+
+    Returns:
+        dict: Normalized inputs (load, material, pop_size, n_gen, evaluator,
+              termination, surrogate). Multi-material requests also carry 'materials'
+              (sorted), and 'material' is their '+'-joined name.
+
+    Raises:
+        ValueError: If an input is malformed
+    """
+    data = data or {}
+    inputs = {
+        'load': float(data.get('load', 50.0)),
+        'material': data.get('material', 'PLA'),
+        'pop_size': int(data.get('pop_size', 40)),
+        'n_gen': int(data.get('n_gen', 50)),
+        'evaluator': data.get('evaluator', 'surrogate'),
+        'termination': data.get('termination', 'n_gen'),
+        'surrogate': data.get('surrogate', app.config['DEFAULT_SURROGATE'])
+    }
+    if inputs['evaluator'] not in EVALUATORS:
+        raise ValueError(
+            f'Invalid evaluator. Must be one of: {", ".join(EVALUATORS)}')
+    if inputs['termination'] not in TERMINATIONS:
+        raise ValueError(
+            f'Invalid termination. Must be one of: {", ".join(TERMINATIONS)}')
+    if inputs['surrogate'] not in SURROGATES:
+        raise ValueError(
+            f'Invalid surrogate. Must be one of: {", ".join(SURROGATES)}')
+
+    materials = data.get('materials')
+    if materials:
+        if not isinstance(materials, list):
+            raise ValueError('materials must be a list of material names')
+        known = load_materials()
+        unknown = [name for name in materials if name not in known]
+        if unknown:
+            raise ValueError(f'Unknown materials: {", ".join(map(str, unknown))}')
+        inputs['materials'] = sorted(set(materials))
+        inputs['material'] = '+'.join(inputs['materials'])
+    return inputs
+
+
+def _optimization_kwargs(inputs):
+    """run_optimization() (or multi-material) keyword arguments for inputs."""
+    kwargs = {
+        'load': inputs['load'],
+        'pop_size': inputs['pop_size'],
+        'n_gen': inputs['n_gen'],
+        'evaluator': inputs['evaluator'],
+        'termination': inputs['termination'],
+        'surrogate': inputs['surrogate']
+    }
+    if inputs.get('materials'):
+        kwargs['material_names'] = inputs['materials']
+    else:
+        kwargs['material_name'] = inputs['material']
+    return kwargs
+
+
+def _run_optimization_request(inputs):
+    """Run a single- or multi-material optimization for normalized inputs."""
+    if inputs.get('materials'):
+        seeds = {
+            name: _warm_start_kwargs({**inputs, 'material': name}).get('initial_designs')
+            for name in inputs['materials']
+        }
+        return run_multi_material_optimization(
+            **_optimization_kwargs(inputs), initial_designs=seeds)
+    return run_optimization(
+        **_optimization_kwargs(inputs), **_warm_start_kwargs(inputs))
+
+
+def _warm_start_kwargs(inputs):
+    """initial_designs for run_optimization() from the nearest cached runs."""
+    if not app.config['WARM_START']:
+        return {}
+    try:
+        designs, sources = warm_start_index.seed_designs(
+            inputs['material'], inputs['load'], limit=inputs['pop_size'])
+    except Exception as exc:
+        print(f"[API] Warning: warm start lookup failed: {exc}")
+        return {}
+    if len(designs) == 0:
+        return {}
+
+    print(f"[API] Warm start: {len(designs)} designs from cached loads "
+          f"{', '.join(f'{load:g}N' for load in sources)}")
+    return {'initial_designs': designs.tolist()}
+
+
+def _request_cache_key(inputs):
+    return compute_request_hash(
+        inputs['load'], inputs['material'], inputs['pop_size'],
+        inputs['n_gen'], inputs['evaluator'], inputs['termination'],
+        inputs['surrogate'])
+
+
+def _lookup_cached_results(cache_key):
+    """Return cached results for a key (with STL assets ensured) or None."""
+    cache_path = CACHE_DIR / f"{cache_key}.json"
+    if not cache_path.exists():
+        return None
+
+    print(f"[API] Cache hit: {cache_key}")
+    cached_results = load_cached_results(cache_path)
+    if not cached_results:
+        print(f"[API] Cache invalid, recomputing: {cache_key}")
+        return None
+
+    _ensure_design_assets(cached_results)
+    return cached_results
+
+
+def _finalize_results(results, inputs, cache_key):
+    """Generate STL files for fresh results and persist them to the disk cache."""
+    # Generate STL files for each design
+    for design in results['pareto_front']:
+        try:
+            stl_path = generate_bracket_stl(
+                params=design['parameters'],
+                output_dir=app.config['MODELS_FOLDER']
+            )
+            # Add STL filename to design
+            design['stl_file'] = os.path.basename(stl_path)
+
+            # Cache design for later download
+            optimization_cache[str(design['id'])] = design
+        except Exception as e:
+            print(
+                f"[API] Warning: STL generation failed for design {design['id']}: {e}")
+            design['stl_file'] = None
+
+    print(
+        f"[API] Optimization complete: {len(results['pareto_front'])} designs")
+
+    # Persist results to disk cache
+    try:
+        store_cached_results(CACHE_DIR, cache_key, inputs, results)
+        print(f"[API] Cache stored: {cache_key}")
+    except Exception as cache_exc:
+        print(
+            f"[API] Warning: failed to write cache {cache_key}: {cache_exc}")
+
+    return results
+
+
+def _finalize_job(job):
+    """Job-queue completion hook: same post-processing as /api/optimize."""
+    inputs = dict(job.inputs)
+    inputs['material'] = inputs.pop('material_name')
+    inputs.pop('initial_designs', None)
+    _finalize_results(job.results, inputs, job.cache_key)
+
+
+def _release_job_lock(job):
+    """Job-queue finish hook: let other workers waiting on this key proceed."""
+    single_flight.release(job.cache_key)
+
+
+# Background optimization jobs (bounded process pool with backpressure)
+app.config['JOB_WORKERS'] = int(os.environ.get('OPTIMIZER_JOB_WORKERS', 2))
+app.config['JOB_QUEUE_LIMIT'] = int(os.environ.get('OPTIMIZER_JOB_QUEUE_LIMIT', 8))
+app.config['JOB_EVENT_INTERVAL'] = float(os.environ.get('OPTIMIZER_JOB_EVENT_INTERVAL', 0.5))
+app.config['JOB_EVENT_HEARTBEAT'] = 15.0
+app.config['SWEEP_MAX_SCENARIOS'] = int(os.environ.get('OPTIMIZER_SWEEP_MAX_SCENARIOS', 200))
+app.config['SWEEP_WORKERS'] = int(os.environ.get('OPTIMIZER_SWEEP_WORKERS', os.cpu_count() or 1))
+app.config['SWEEP_MAX_CONCURRENT'] = int(os.environ.get('OPTIMIZER_SWEEP_MAX_CONCURRENT', 1))
+# Each running sweep owns a SWEEP_WORKERS process pool; further sweeps get 429
+sweep_slots = threading.BoundedSemaphore(app.config['SWEEP_MAX_CONCURRENT'])
+job_manager = OptimizationJobManager(
+    max_workers=app.config['JOB_WORKERS'],
+    max_pending=app.config['JOB_QUEUE_LIMIT'],
+    on_complete=_finalize_job,
+    on_finish=_release_job_lock
+)
+
+
 @app.route('/api/optimize', methods=['POST'])
 def optimize():
     """
@@ -153,90 +345,52 @@ def optimize():
         "load": 50.0,
         "material": "PLA",
         "pop_size": 40,
-        "n_gen": 50
+        "n_gen": 50,
+        "evaluator": "surrogate",  // optional: surrogate | physics | hybrid
+        "termination": "n_gen",    // optional: n_gen | plateau | hypervolume | igd
+        "surrogate": "auto",       // optional: auto | ensemble | joint | compact
+        "materials": ["PLA", "Aluminum6061"]  // optional: optimize several
+                                              // materials in parallel and merge
     }
     """
     try:
-        data = request.get_json()
-
-        # Validate inputs
-        load = float(data.get('load', 50.0))
-        material = data.get('material', 'PLA')
-        pop_size = int(data.get('pop_size', 40))
-        n_gen = int(data.get('n_gen', 50))
+        try:
+            inputs = _parse_optimization_request(request.get_json())
+        except (TypeError, ValueError) as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
 
         print(
-            f"[API] Optimization request: {load}N, {material}, pop={pop_size}, gen={n_gen}")
+            f"[API] Optimization request: {inputs['load']}N, {inputs['material']}, "
+            f"pop={inputs['pop_size']}, gen={inputs['n_gen']}, evaluator={inputs['evaluator']}, termination={inputs['termination']}, surrogate={inputs['surrogate']}")
 
         # Check disk cache first
-        cache_key = _compute_request_hash(load, material, pop_size, n_gen)
-        cache_path = CACHE_DIR / f"{cache_key}.json"
-
-        if cache_path.exists():
-            print(f"[API] Cache hit: {cache_key}")
-            cached_results = _load_cached_results(cache_path)
-            if cached_results:
-                _ensure_design_assets(cached_results)
-                return jsonify({
-                    'success': True,
-                    'results': cached_results,
-                    'cached': True,
-                    'cache_key': cache_key
-                })
-            else:
-                print(f"[API] Cache invalid, recomputing: {cache_key}")
-
-        # Cache miss → run optimization
-        results = run_optimization(
-            load=load,
-            material_name=material,
-            pop_size=pop_size,
-            n_gen=n_gen
-        )
+        cache_key = _request_cache_key(inputs)
+        cached_results = _lookup_cached_results(cache_key)
+        if cached_results:
+            return jsonify({
+                'success': True,
+                'results': cached_results,
+                'cached': True,
+                'cache_key': cache_key
+            })
 
-        # Generate STL files for each design
-        for design in results['pareto_front']:
-            try:
-                stl_path = generate_bracket_stl(
-                    params=design['parameters'],
-                    output_dir=app.config['MODELS_FOLDER']
-                )
-                # Add STL filename to design
-                design['stl_file'] = os.path.basename(stl_path)
-
-                # Cache design for later download
-                optimization_cache[str(design['id'])] = design
-            except Exception as e:
-                print(
-                    f"[API] Warning: STL generation failed for design {design['id']}: {e}")
-                design['stl_file'] = None
+        # Cache miss → run optimization once, even for concurrent duplicates
+        def compute():
+            results = _run_optimization_request(inputs)
+            return _finalize_results(results, inputs, cache_key)
 
-        print(
-            f"[API] Optimization complete: {len(results['pareto_front'])} designs")
-
-        # Persist results to disk cache
-        cache_payload = {
-            'inputs': {
-                'load': load,
-                'material': material,
-                'pop_size': pop_size,
-                'n_gen': n_gen
-            },
-            'results': results,
-            'cached_at': time.time()
-        }
-        try:
-            with open(cache_path, 'w') as f:
-                json.dump(cache_payload, f, indent=2)
-            print(f"[API] Cache stored: {cache_key}")
-        except Exception as cache_exc:
-            print(
-                f"[API] Warning: failed to write cache {cache_key}: {cache_exc}")
+        results, shared = single_flight.do(
+            cache_key, compute, lambda: _lookup_cached_results(cache_key),
+            timeout=app.config['INFLIGHT_WAIT_TIMEOUT'])
 
         return jsonify({
             'success': True,
             'results': results,
-            'cached': False,
+            'cached': shared,
+            'coalesced': shared,
             'cache_key': cache_key
         })
 
@@ -248,6 +402,326 @@ def optimize():
         }), 500
 
 
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """
+    Queue an optimization and return its job id immediately.
+
+    Request body: same as /api/optimize. Returns 202 with the job id,
+    or 429 when the job queue is full.
+    """
+    try:
+        inputs = _parse_optimization_request(request.get_json())
+    except (TypeError, ValueError) as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+    if inputs.get('materials'):
+        return jsonify({
+            'success': False,
+            'error': 'Multi-material runs are only available through /api/optimize'
+        }), 400
+
+    try:
+        cache_key = _request_cache_key(inputs)
+        job_kwargs = _optimization_kwargs(inputs)
+        coalesced = False
+
+        cached_results = _lookup_cached_results(cache_key)
+        if cached_results:
+            job = job_manager.add_completed(job_kwargs, cached_results, cache_key)
+        elif job_manager.find_active(cache_key) is not None:
+            # Same request already running in this process
+            job = job_manager.find_active(cache_key)
+            coalesced = True
+        elif single_flight.acquire(cache_key):
+            try:
+                job = job_manager.submit(
+                    {**job_kwargs, **_warm_start_kwargs(inputs)}, cache_key)
+            except Exception:
+                single_flight.release(cache_key)
+                raise
+        else:
+            # Another worker is computing it - wait for its cache entry
+            job = job_manager.submit_waiter(
+                job_kwargs,
+                lambda: single_flight.wait(
+                    cache_key, lambda: _lookup_cached_results(cache_key),
+                    timeout=app.config['INFLIGHT_WAIT_TIMEOUT']),
+                cache_key)
+            coalesced = True
+
+        print(f"[API] Job {job.job_id} {job.status}: {inputs}")
+        return jsonify({
+            'success': True,
+            'job_id': job.job_id,
+            'status': job.status,
+            'cached': cached_results is not None,
+            'coalesced': coalesced,
+            'status_url': f"/api/jobs/{job.job_id}"
+        }), 202
+
+    except JobQueueFull as e:
+        response = jsonify({
+            'success': False,
+            'error': str(e)
+        })
+        response.headers['Retry-After'] = '10'
+        return response, 429
+    except Exception as e:
+        print(f"[API] Error submitting job: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Job status, progress (generation, feasibility) and partial results."""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({
+            'success': False,
+            'error': f'Job {job_id} not found'
+        }), 404
+
+    return jsonify({
+        'success': True,
+        'job': job.snapshot()
+    })
+
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    """Cancel a queued or running job."""
+    if job_manager.get(job_id) is None:
+        return jsonify({
+            'success': False,
+            'error': f'Job {job_id} not found'
+        }), 404
+
+    if not job_manager.cancel(job_id):
+        return jsonify({
+            'success': False,
+            'error': f'Job {job_id} already finished or is waiting on another worker'
+        }), 409
+
+    return jsonify({
+        'success': True,
+        'job': job_manager.get(job_id).snapshot()
+    })
+
+
+def _sse_event(event, payload):
+    """Format one Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+
+def _stream_job_events(job, interval, heartbeat):
+    """
+    Yield SSE messages for a job until it finishes.
+
+    A 'progress' event is sent whenever a new generation is reported; mentor
+    messages are sent once each as 'mentor' events. The stream ends with a
+    single 'completed', 'failed' or 'cancelled' event carrying the snapshot.
+    """
+    last_generation = None
+    sent_messages = 0
+    last_sent = time.time()
+
+    while True:
+        snapshot = job.snapshot()
+        progress = snapshot['progress']
+
+        for message in snapshot['mentor_log'][sent_messages:]:
+            yield _sse_event('mentor', {'message': message})
+        sent_messages = len(snapshot['mentor_log'])
+
+        generation = progress.get('generation')
+        if generation is not None and generation != last_generation:
+            last_generation = generation
+            yield _sse_event('progress', {
+                'job_id': job.job_id,
+                'status': snapshot['status'],
+                'progress': progress,
+                'pareto_front': snapshot['partial_results']['pareto_front']
+            })
+            last_sent = time.time()
+
+        if snapshot['status'] in FINISHED_STATES:
+            yield _sse_event(snapshot['status'], snapshot)
+            return
+
+        if time.time() - last_sent >= heartbeat:
+            # Comment line keeps proxies from closing an idle stream
+            yield ": keep-alive\n\n"
+            last_sent = time.time()
+        time.sleep(interval)
+
+
+@app.route('/api/jobs/<job_id>/events', methods=['GET'])
+def job_events(job_id):
+    """
+    Stream per-generation progress of a job as Server-Sent Events.
+
+    Events: 'progress' (generation, feasibility, best objectives and the
+    current non-dominated set), 'mentor' (AI mentor messages), then one of
+    'completed' / 'failed' / 'cancelled' with the final job snapshot.
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({
+            'success': False,
+            'error': f'Job {job_id} not found'
+        }), 404
+
+    stream = _stream_job_events(
+        job, app.config['JOB_EVENT_INTERVAL'], app.config['JOB_EVENT_HEARTBEAT'])
+    return Response(stream, mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+
+def _parse_sweep_request(data):
+    """
+    Validate a load-sweep request body.
+
+    Returns:
+        tuple: (scenarios, settings) for run_load_sweep()
+
+    Raises:
+        ValueError: If an input is malformed or the grid is too large
+    """
+    data = data or {}
+    materials = data.get('materials') or [data.get('material', 'PLA')]
+    known = load_materials()
+    unknown = [name for name in materials if name not in known]
+    if unknown:
+        raise ValueError(f'Unknown materials: {", ".join(map(str, unknown))}')
+
+    if data.get('loads') is not None:
+        loads = [float(load) for load in data['loads']]
+    else:
+        loads = load_grid(float(data.get('load_min', 20.0)),
+                          float(data.get('load_max', 200.0)),
+                          float(data.get('load_step', 5.0)))
+    if not loads or min(loads) <= 0:
+        raise ValueError('Loads must be positive')
+
+    scenarios = build_scenarios(loads, materials)
+    if len(scenarios) > app.config['SWEEP_MAX_SCENARIOS']:
+        raise ValueError(
+            f"Sweep has {len(scenarios)} scenarios; the limit is "
+            f"{app.config['SWEEP_MAX_SCENARIOS']}")
+
+    settings = {
+        'pop_size': int(data.get('pop_size', 40)),
+        'n_gen': int(data.get('n_gen', 50)),
+        'evaluator': data.get('evaluator', 'surrogate'),
+        'termination': data.get('termination', 'n_gen'),
+        'surrogate': data.get('surrogate', app.config['DEFAULT_SURROGATE'])
+    }
+    if settings['evaluator'] not in EVALUATORS:
+        raise ValueError(
+            f'Invalid evaluator. Must be one of: {", ".join(EVALUATORS)}')
+    if settings['termination'] not in TERMINATIONS:
+        raise ValueError(
+            f'Invalid termination. Must be one of: {", ".join(TERMINATIONS)}')
+    if settings['surrogate'] not in SURROGATES:
+        raise ValueError(
+            f'Invalid surrogate. Must be one of: {", ".join(SURROGATES)}')
+    return scenarios, settings
+
+
+@app.route('/api/sweep', methods=['POST'])
+def load_sweep():
+    """
+    Optimize a grid of (load, material) scenarios.
+
+    Request body:
+    {
+        "materials": ["PLA"],          // or "material": "PLA"
+        "load_min": 20, "load_max": 200, "load_step": 5,   // or "loads": [...]
+        "pop_size": 40, "n_gen": 50,
+        "evaluator": "surrogate", "termination": "n_gen", "surrogate": "auto"
+    }
+
+    Streams one JSON line per scenario (load, material, cache_key and the
+    Pareto front) as it finishes, then a final {"done": true} line. Every
+    scenario is also written to the disk cache, so a later /api/optimize
+    call with the same inputs is a cache hit.
+
+    At most SWEEP_MAX_CONCURRENT sweeps run at once (429 otherwise). When
+    the client disconnects, scenarios that have not started are cancelled.
+    """
+    try:
+        scenarios, settings = _parse_sweep_request(request.get_json())
+    except (TypeError, ValueError) as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+    if not sweep_slots.acquire(blocking=False):
+        response = jsonify({
+            'success': False,
+            'error': f"{app.config['SWEEP_MAX_CONCURRENT']} sweep(s) already running"
+        })
+        response.headers['Retry-After'] = '30'
+        return response, 429
+
+    print(f"[API] Load sweep: {len(scenarios)} scenarios, {settings}")
+    events = queue.Queue()
+    cancelled = threading.Event()
+
+    def on_result(summary, results, cached, error):
+        line = dict(summary)
+        if results is not None:
+            line['pareto_front'] = results['pareto_front']
+        events.put(line)
+
+    def run():
+        started = time.time()
+        try:
+            run_load_sweep(scenarios, CACHE_DIR, max_workers=app.config['SWEEP_WORKERS'],
+                           on_result=on_result, cancel_event=cancelled, **settings)
+            events.put({'done': True, 'n_scenarios': len(scenarios),
+                        'elapsed_s': round(time.time() - started, 2)})
+        except Exception as exc:
+            print(f"[API] Load sweep failed: {exc}")
+            events.put({'done': True, 'error': str(exc)})
+        finally:
+            # Released only once the pool has shut down
+            sweep_slots.release()
+
+    try:
+        threading.Thread(target=run, name='load-sweep', daemon=True).start()
+    except Exception:
+        sweep_slots.release()
+        raise
+
+    def stream():
+        try:
+            while True:
+                line = events.get()
+                yield json.dumps(line) + "\n"
+                if line.get('done'):
+                    return
+        finally:
+            # GeneratorExit on client disconnect: stop scheduling scenarios
+            if not cancelled.is_set():
+                cancelled.set()
+
+    return Response(stream(), mimetype='application/x-ndjson', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+
 @app.route('/api/demo', methods=['GET'])
 def demo_results():
     """
@@ -579,6 +1053,8 @@ def status():
             'success': True,
             'status': 'operational',
             'models_generated': model_count,
+            'surrogates': model_registry.describe(),
+            'jobs': job_manager.stats(),
             'version': '1.0.0'
         })
     except Exception as e:
@@ -598,6 +1074,11 @@ if __name__ == '__main__':
     print("\nEndpoints:")
     print("  GET  /api/materials        - List available materials")
     print("  POST /api/optimize         - Run optimization")
+    print("  POST /api/jobs             - Queue optimization (returns job id)")
+    print("  GET  /api/jobs/<id>        - Job status, progress, partial results")
+    print("  GET  /api/jobs/<id>/events - Live progress (Server-Sent Events)")
+    print("  DELETE /api/jobs/<id>      - Cancel job")
+    print("  POST /api/sweep            - Pareto fronts over a grid of loads (NDJSON)")
     print("  GET  /api/demo             - Get demo results (fast)")
     print("  POST /api/material-advice  - Get smart material recommendation")
     print("  GET  /api/status           - API health check")
@@ -0,0 +1,279 @@
+"""
+Compact Surrogate
+Log-space ridge regression over beam-theory features. Stress and
+deflection are products of power laws in length, width, thickness, the
+rib stiffening factor and the fillet ratio, so their logarithms are
+(nearly) linear in the logarithms of those terms. A few dozen
+coefficients stored in a small JSON file replace the tree ensembles, and
+a prediction for a whole population is one matrix multiply.
+"""
+
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from ensemble_predictor import CONDITION_FEATURES, TARGETS, _TargetView
+
+
+COMPACT_FORMAT_VERSION = 1
+
+# Rib reinforcement and stress-concentration terms of physics_calculator
+RIB_STIFFENING = 0.15
+HOLE_THRESHOLD = 5.0
+
+
+def _basis_terms(feature_columns, degree):
+    """
+    Names and raw-input dependencies of the basis columns.
+
+    Returns:
+        tuple: (term names, list of raw columns each term depends on)
+    """
+    terms, sources = [], []
+    for col in feature_columns:
+        if col == 'rib_count':
+            terms.append('log_rib_factor')
+            sources.append(['rib_count'])
+        elif col == 'fillet_radius':
+            terms.append('log_fillet_ratio')
+            sources.append(['fillet_radius', 'base_thickness'])
+        elif col == 'hole_diameter':
+            terms.append('large_hole')
+            sources.append(['hole_diameter'])
+        else:
+            terms.append(f"log_{col}")
+            sources.append([col])
+
+    if degree >= 2:
+        n_linear = len(terms)
+        for i in range(n_linear):
+            for j in range(i, n_linear):
+                terms.append(f"{terms[i]}*{terms[j]}")
+                sources.append(sorted(set(sources[i]) | set(sources[j])))
+    return terms, sources
+
+
+def basis_matrix(X, feature_columns, degree=1):
+    """
+    (N, n_terms) log-space basis for a raw feature matrix.
+
+    Args:
+        X: (N, n_features) matrix in feature_columns order
+        feature_columns (list): Raw column names
+        degree (int): 1 for log-linear, 2 adds pairwise products
+
+    Returns:
+        ndarray: Basis matrix
+    """
+    X = np.atleast_2d(np.asarray(X, dtype=float))
+    column = {col: X[:, i] for i, col in enumerate(feature_columns)}
+
+    linear = []
+    for col in feature_columns:
+        if col == 'rib_count':
+            linear.append(np.log1p(RIB_STIFFENING * column[col]))
+        elif col == 'fillet_radius':
+            linear.append(np.log1p(column[col] / column['base_thickness']))
+        elif col == 'hole_diameter':
+            linear.append((column[col] > HOLE_THRESHOLD).astype(float))
+        else:
+            linear.append(np.log(column[col]))
+    B = np.column_stack(linear)
+
+    if degree >= 2:
+        i, j = np.triu_indices(B.shape[1])
+        B = np.hstack([B, B[:, i] * B[:, j]])
+    return B
+
+
+class CompactSurrogate:
+    """
+    Log-space ridge model predicting every target in one pass.
+
+    Exposes the JointEnsemblePredictor interface (predict, target(),
+    conditioned, feature_columns) so the optimizer can use it in place of
+    a multi-output ensemble. Uncertainty is the training residual spread
+    in log space, mapped back as std ≈ mean * sigma_log.
+    """
+
+    def __init__(self, feature_columns, targets, degree, coef, intercept,
+                 residual_sigma, target_importances, metadata=None):
+        self.feature_columns = list(feature_columns)
+        self.targets = list(targets)
+        self.degree = int(degree)
+        self.coef = np.asarray(coef, dtype=float)
+        self.intercept = np.asarray(intercept, dtype=float)
+        self.residual_sigma = np.asarray(residual_sigma, dtype=float)
+        self.target_importances = np.asarray(target_importances, dtype=float)
+        self.metadata = dict(metadata or {})
+        self.terms, _ = _basis_terms(self.feature_columns, self.degree)
+
+    def __len__(self):
+        return 1
+
+    @property
+    def n_models(self):
+        return 1
+
+    @property
+    def conditioned(self):
+        """True if load and material properties are model inputs."""
+        return all(col in self.feature_columns for col in CONDITION_FEATURES)
+
+    def target(self, name):
+        """Single-target view with the EnsemblePredictor interface."""
+        return _TargetView(self, self.targets.index(name))
+
+    def _as_matrix(self, X):
+        if hasattr(X, 'columns'):
+            return X[self.feature_columns].to_numpy(dtype=float)
+        return np.atleast_2d(np.asarray(X, dtype=float))
+
+    def predict(self, X):
+        """
+        Mean and standard deviation of every target.
+
+        Returns:
+            tuple: (mean, std) arrays of shape (N, n_targets)
+        """
+        log_pred = basis_matrix(self._as_matrix(X), self.feature_columns,
+                                self.degree) @ self.coef + self.intercept
+        mean = np.exp(log_pred)
+        return mean, mean * self.residual_sigma
+
+    def predict_members(self, X):
+        """(1, N, n_targets) mean predictions (a single 'member')."""
+        return self.predict(X)[0][np.newaxis]
+
+    def target_importance(self, index):
+        """Normalized importance of each raw feature for one target."""
+        return self.target_importances[index]
+
+    def to_dict(self):
+        return {
+            'format_version': COMPACT_FORMAT_VERSION,
+            'type': 'log_ridge',
+            'feature_columns': self.feature_columns,
+            'targets': self.targets,
+            'degree': self.degree,
+            'terms': self.terms,
+            'coef': self.coef.tolist(),
+            'intercept': self.intercept.tolist(),
+            'residual_sigma': self.residual_sigma.tolist(),
+            'target_importances': self.target_importances.tolist(),
+            **self.metadata
+        }
+
+
+def fit_compact_surrogate(X, Y, feature_columns, targets=TARGETS, degree=1, alpha=1e-6):
+    """
+    Fit log(Y) = basis(X) @ coef + intercept by ridge regression.
+
+    Args:
+        X: (N, n_features) raw inputs in feature_columns order
+        Y: (N, n_targets) targets (rows with a non-positive target are skipped)
+        feature_columns (list): Raw column names
+        targets (list): Target names, in Y column order
+        degree (int): 1 for log-linear, 2 adds pairwise products
+        alpha (float): Ridge penalty on the standardized basis
+
+    Returns:
+        CompactSurrogate: Fitted model
+    """
+    feature_columns = list(feature_columns)
+    Y = np.asarray(Y, dtype=float)
+    # Targets rounded to zero (e.g. deflection of very stiff designs) have no log
+    positive = np.all(Y > 0, axis=1)
+    B = basis_matrix(np.asarray(X, dtype=float)[positive], feature_columns, degree)
+    log_Y = np.log(Y[positive])
+
+    # Solve on the standardized basis so alpha is scale-free; constant
+    # columns (e.g. one material only) get a zero coefficient
+    mean, scale = B.mean(axis=0), B.std(axis=0)
+    scale[scale == 0] = np.inf
+    Z = (B - mean) / scale
+    y_mean = log_Y.mean(axis=0)
+    gram = Z.T @ Z + alpha * len(Z) * np.eye(Z.shape[1])
+    coef_z = np.linalg.solve(gram, Z.T @ (log_Y - y_mean))
+
+    coef = coef_z / scale[:, np.newaxis]
+    intercept = y_mean - mean @ coef
+    residual_sigma = (log_Y - (B @ coef + intercept)).std(axis=0, ddof=1)
+
+    # Importance of a raw feature: spread of its basis terms' contribution
+    # (|standardized coefficient|), shared equally by the features of a term
+    _, sources = _basis_terms(feature_columns, degree)
+    importances = np.zeros((len(targets), len(feature_columns)))
+    for term, cols in enumerate(sources):
+        for col in cols:
+            importances[:, feature_columns.index(col)] += \
+                np.abs(coef_z[term]) / len(cols)
+    totals = importances.sum(axis=1, keepdims=True)
+    importances = np.divide(importances, totals, out=np.zeros_like(importances),
+                            where=totals > 0)
+
+    return CompactSurrogate(feature_columns, targets, degree, coef, intercept,
+                            residual_sigma, importances,
+                            metadata={'alpha': alpha, 'n_train': len(B)})
+
+
+def save_compact_surrogate(surrogate, path):
+    """Write the model as JSON (atomically, via rename)."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.tmp-', suffix='.json', dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(surrogate.to_dict(), f, indent=2)
+        os.replace(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+    return path
+
+
+def load_compact_surrogate(path):
+    """
+    Read a model written by save_compact_surrogate().
+
+    Raises:
+        ValueError: If the file is not a compact surrogate of this version
+    """
+    with open(path, 'r') as f:
+        payload = json.load(f)
+    if payload.get('format_version') != COMPACT_FORMAT_VERSION:
+        raise ValueError(f"Unsupported compact surrogate format in {path}")
+
+    known = {'format_version', 'type', 'feature_columns', 'targets', 'degree',
+             'terms', 'coef', 'intercept', 'residual_sigma', 'target_importances'}
+    return CompactSurrogate(
+        payload['feature_columns'], payload['targets'], payload['degree'],
+        payload['coef'], payload['intercept'], payload['residual_sigma'],
+        payload['target_importances'],
+        metadata={k: v for k, v in payload.items() if k not in known})
+
+
+if __name__ == '__main__':
+    # Fit on beam theory directly and compare a few predictions
+    from ensemble_predictor import FEATURE_COLUMNS, with_conditions
+    from material_library import get_material
+    from physics_calculator import calculate_stress_and_deflection_batch
+
+    rng = np.random.default_rng(0)
+    lower = np.array([40.0, 25.0, 2.0, 2, 1.5, 1.0, 3.0])
+    upper = np.array([70.0, 40.0, 5.0, 5, 3.5, 4.0, 8.0])
+    X_design = lower + rng.random((5000, 7)) * (upper - lower)
+    X_design[:, 3] = np.round(X_design[:, 3])
+
+    pla = get_material('PLA')
+    X = with_conditions(X_design, 80.0, pla)
+    physics = calculate_stress_and_deflection_batch(X_design, 80.0, 'PLA')
+    Y = np.column_stack([physics['max_stress'], physics['max_deflection']])
+
+    model = fit_compact_surrogate(X, Y, FEATURE_COLUMNS)
+    mean, _ = model.predict(X[:5])
+    print(f"Terms: {len(model.terms)}, residual σ (log): {model.residual_sigma}")
+    for predicted, actual in zip(mean, Y[:5]):
+        print(f"  stress {predicted[0]:7.2f} vs {actual[0]:7.2f} MPa, "
+              f"deflection {predicted[1]:.4f} vs {actual[1]:.4f} mm")
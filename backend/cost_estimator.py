@@ -3,8 +3,84 @@ Manufacturing Cost Estimator
 Calculates the cost to produce a part based on material and manufacturing time.
 """
 
-from material_library import get_material
 import numpy as np
+from physics_calculator import as_design_matrix, material_property_arrays
+
+
+# Methods with a dedicated time model; anything else gets a flat estimate
+MANUFACTURING_METHODS = ('3d_printing', 'cnc_milling')
+
+SETUP_COST = 5  # ₹5 for basic setup (one-time per part type)
+
+
+def estimate_costs_batch(designs, material, methods=MANUFACTURING_METHODS):
+    """
+    Cost engine for N designs x M manufacturing methods in one NumPy pass.
+
+    Cost = Material Cost + Machine Time Cost + Setup Cost
+
+    Args:
+        designs: (N, 7) matrix or structured array of design parameters
+        material: Material name, (N,) names, or structured material rows
+        methods (tuple): Manufacturing methods to price
+
+    Returns:
+        dict: {
+            'methods': methods,
+            'total_cost': (M, N) ₹,
+            'material_cost': (M, N) ₹,
+            'machine_cost': (M, N) ₹,
+            'manufacturing_time_hours': (M, N),
+            'mass_kg': (N,),
+            'volume_cm3': (N,)
+        }
+        Values are unrounded.
+    """
+    X = as_design_matrix(designs)
+    (base_length, base_width, base_thickness, rib_count,
+     rib_thickness, _, hole_diameter) = X.T
+    density, cost_per_kg = material_property_arrays(
+        material, ['density', 'cost_per_kg'], len(X))
+
+    # Volume: base + ribs - hole (cm³)
+    rib_height = 20  # mm
+    base_volume = (base_length * base_width * base_thickness) / 1000
+    total_rib_volume = (rib_thickness * base_width * rib_height) / 1000 * rib_count
+    hole_volume = (np.pi * (hole_diameter / 2)**2 * base_thickness) / 1000
+    volume_cm3 = base_volume + total_rib_volume - hole_volume
+
+    mass_kg = volume_cm3 * density / 1000
+    material_cost = mass_kg * cost_per_kg  # Same for every method
+
+    machine_cost = np.empty((len(methods), len(X)))
+    manufacturing_time = np.empty((len(methods), len(X)))
+
+    for m, method in enumerate(methods):
+        if method == '3d_printing':
+            # Layer count at 0.2mm layers, ~0.5 min per layer, ₹5 per hour
+            num_layers = (base_thickness + 20) / 0.2
+            manufacturing_time[m] = (num_layers * 0.5) / 60
+            machine_cost[m] = manufacturing_time[m] * 5
+        elif method == 'cnc_milling':
+            # Material removal from stock at ~5 cm³/min, ₹200 per hour
+            stock_volume = (base_length + 10) * (base_width + 10) * 10  # mm³
+            removal_volume = stock_volume / 1000 - volume_cm3  # cm³
+            manufacturing_time[m] = (removal_volume / 5) / 60
+            machine_cost[m] = manufacturing_time[m] * 200
+        else:
+            # Default estimate
+            manufacturing_time[m] = 1.0
+            machine_cost[m] = 10
+
+    return {
+        'methods': tuple(methods),
+        'total_cost': material_cost + machine_cost + SETUP_COST,
+        'material_cost': np.broadcast_to(material_cost, machine_cost.shape),
+        'machine_cost': machine_cost,
+        'manufacturing_time_hours': manufacturing_time,
+        'mass_kg': mass_kg,
+        'volume_cm3': volume_cm3
+    }
 
 
 def calculate_manufacturing_cost(params, material_name, manufacturing_method='3d_printing'):
@@ -26,85 +102,18 @@ def calculate_manufacturing_cost(params, material_name, manufacturing_method='3d
             'breakdown': Detailed breakdown
         }
     """
-    material = get_material(material_name)
-
-    # Calculate volume (mm³ to cm³)
-    base_volume = (params['base_length'] * params['base_width'] *
-                   params['base_thickness']) / 1000  # cm³
-
-    rib_height = 20  # mm
-    rib_volume_each = (params['rib_thickness'] * params['base_width'] *
-                       rib_height) / 1000  # cm³
-    total_rib_volume = rib_volume_each * params['rib_count']
-
-    # Subtract hole volume
-    hole_volume = (np.pi * (params['hole_diameter'] / 2)**2 *
-                   params['base_thickness']) / 1000  # cm³
-
-    total_volume_cm3 = base_volume + total_rib_volume - hole_volume
-
-    # Calculate mass (g)
-    mass_g = total_volume_cm3 * material['density']
-    mass_kg = mass_g / 1000
-
-    # Material cost
-    material_cost = mass_kg * material['cost_per_kg']
-
-    # Manufacturing time estimation
-    if manufacturing_method == '3d_printing':
-        # 3D printing time estimate
-        # Factors: volume, layer height (0.2mm), infill (20%), print speed
-        layer_height = 0.2  # mm
-        num_layers = (params['base_thickness'] + 20) / \
-            layer_height  # approximate
-        time_per_layer = 0.5  # minutes (simplified)
-        print_time_hours = (num_layers * time_per_layer) / 60
-
-        # PLA 3D printer cost: ₹5 per hour (electricity + depreciation)
-        machine_cost_per_hour = 5
-        machine_cost = print_time_hours * machine_cost_per_hour
-
-    elif manufacturing_method == 'cnc_milling':
-        # CNC milling time estimate
-        # Based on material removal volume
-        stock_volume = (params['base_length'] + 10) * \
-            (params['base_width'] + 10) * 10  # mm³
-        removal_volume = stock_volume / 1000 - total_volume_cm3  # cm³
-
-        # Milling rate: ~5 cm³/min for aluminum
-        milling_time_hours = (removal_volume / 5) / 60
-
-        # CNC machine cost: ₹200 per hour
-        machine_cost_per_hour = 200
-        machine_cost = milling_time_hours * machine_cost_per_hour
-
-    else:
-        # Default estimate
-        machine_cost = 10
-
-    # Setup cost (one-time per part type)
-    setup_cost = 5  # ₹5 for basic setup
-
-    # Total cost
-    total_cost = material_cost + machine_cost + setup_cost
-
-    # Get print time for readiness score
-    if manufacturing_method == '3d_printing':
-        manufacturing_time = print_time_hours
-    elif manufacturing_method == 'cnc_milling':
-        manufacturing_time = milling_time_hours
-    else:
-        manufacturing_time = 1.0
+    costs = estimate_costs_batch(params, material_name, (manufacturing_method,))
+    manufacturing_time = float(costs['manufacturing_time_hours'][0, 0])
 
     return {
-        'total_cost': round(total_cost, 2),
-        'material_cost': round(material_cost, 2),
-        'machine_cost': round(machine_cost, 2),
-        'setup_cost': setup_cost,
+        'total_cost': round(float(costs['total_cost'][0, 0]), 2),
+        'material_cost': round(float(costs['material_cost'][0, 0]), 2),
+        'machine_cost': round(float(costs['machine_cost'][0, 0]), 2),
+        'setup_cost': SETUP_COST,
         'print_time_hours': round(manufacturing_time, 2),
         'breakdown': {
-            'mass_kg': round(mass_kg, 4),
-            'volume_cm3': round(total_volume_cm3, 2),
+            'mass_kg': round(float(costs['mass_kg'][0]), 4),
+            'volume_cm3': round(float(costs['volume_cm3'][0]), 2),
             'manufacturing_time_hours': round(manufacturing_time, 2)
         }
     }
@@ -3,14 +3,125 @@ Design for Manufacturing (DFM) Rules
 Checks if a design can actually be manufactured without issues.
 """
 
+import numpy as np
 
-def check_dfm_rules(params, manufacturing_method='3d_printing'):
+from physics_calculator import as_design_matrix
+
+
+# Violation bits (design cannot be manufactured)
+DFM_BASE_TOO_THIN = 1 << 0
+DFM_RIB_TOO_THIN = 1 << 1
+DFM_HOLE_NOT_STANDARD = 1 << 2
+DFM_FILLET_TOO_SMALL = 1 << 3
+DFM_RIBS_TOO_CLOSE = 1 << 4
+DFM_HOLE_NEAR_EDGE = 1 << 5
+
+# Warning bits (manufacturable, but risky)
+DFM_WARN_WARPING = 1 << 0
+DFM_WARN_RIB_COUNT = 1 << 1
+DFM_WARN_ASPECT_RATIO = 1 << 2
+DFM_WARN_NEEDS_SUPPORT = 1 << 3
+DFM_WARN_THICK_BASE = 1 << 4
+
+# Common drill sizes (mm)
+STANDARD_HOLE_SIZES = np.array([3.0, 4.0, 5.0, 6.0, 8.0])
+
+RIB_HEIGHT = 20.0  # Assume ~20mm rib height for this design
+
+# Violation rules in dfm_violation_magnitudes() column order
+DFM_VIOLATION_BITS = [
+    DFM_BASE_TOO_THIN, DFM_RIB_TOO_THIN, DFM_HOLE_NOT_STANDARD,
+    DFM_FILLET_TOO_SMALL, DFM_RIBS_TOO_CLOSE, DFM_HOLE_NEAR_EDGE
+]
+DFM_VIOLATION_NAMES = [
+    'base_thickness', 'rib_thickness', 'hole_standard',
+    'fillet_radius', 'rib_spacing', 'hole_edge_clearance'
+]
+
+
+def dfm_violation_magnitudes(designs):
     """
-    Validate design against manufacturing constraints.
+    Continuous size of each DFM violation, in mm.
+
+    Column k is > 0 exactly when rule DFM_VIOLATION_BITS[k] is violated
+    and grows with the distance to feasibility, e.g. mm below minimum
+    thickness or mm away from the nearest standard hole size. Used as
+    graded optimizer constraints (g <= 0 is feasible).
+
+    Args:
+        designs: (N, 7) matrix or structured array of design parameters
+
+    Returns:
+        ndarray: (N, 6) violation magnitudes (0 where the rule is met)
+    """
+    X = as_design_matrix(designs)
+    (base_length, base_width, base_thickness, rib_count,
+     rib_thickness, fillet_radius, hole_diameter) = X.T
+
+    hole_offset = np.abs(hole_diameter[:, None] - STANDARD_HOLE_SIZES).min(axis=1)
+    rib_spacing = base_length / (np.maximum(rib_count, 0) + 1)
+    edge_distance = base_width / 2 - hole_diameter
+
+    magnitudes = np.column_stack([
+        2.0 - base_thickness,                           # Min base thickness
+        1.5 - rib_thickness,                            # Min rib thickness
+        hole_offset - 0.5,                              # Standard drill size
+        1.0 - fillet_radius,                            # Min fillet radius
+        np.where(rib_count > 0, 10.0 - rib_spacing, 0.0),  # Rib spacing
+        hole_diameter * 2 - edge_distance               # Edge clearance
+    ])
+    return np.maximum(magnitudes, 0.0)
+
+
+def evaluate_dfm_rules(designs):
+    """
+    Evaluate every DFM rule over a population of designs.
+
+    No strings are built here; use render_dfm_messages() for the designs
+    that are actually shown to users.
+
+    Args:
+        designs: (N, 7) matrix or structured array of design parameters
+
+    Returns:
+        tuple: (violations, warnings) uint16 bitmasks of length N, using
+               the DFM_* and DFM_WARN_* bits
+    """
+    X = as_design_matrix(designs)
+    (base_length, base_width, base_thickness, rib_count,
+     rib_thickness, _, _) = X.T
+    aspect_ratio = base_length / base_width
+
+    # Violation bits come from the graded magnitudes so both always agree
+    violations = np.zeros(len(X), dtype=np.uint16)
+    for column, bit in zip(dfm_violation_magnitudes(X).T, DFM_VIOLATION_BITS):
+        violations[column > 0] |= bit
+
+    warnings = np.zeros(len(X), dtype=np.uint16)
+    warnings[base_thickness > 8.0] |= DFM_WARN_WARPING
+    warnings[rib_count > 5] |= DFM_WARN_RIB_COUNT
+    warnings[aspect_ratio > 3.0] |= DFM_WARN_ASPECT_RATIO
+    if RIB_HEIGHT > 20:
+        warnings[rib_thickness < 2.0] |= DFM_WARN_NEEDS_SUPPORT
+    warnings[base_thickness > 6.0] |= DFM_WARN_THICK_BASE
+
+    return violations, warnings
+
+
+def count_flags(mask):
+    """Number of set bits per entry of a uint16 bitmask array."""
+    mask = np.asarray(mask, dtype=np.uint16)
+    return sum((mask >> bit) & 1 for bit in range(16)).astype(int)
+
+
+def render_dfm_messages(params, violations, warnings):
+    """
+    Turn one design's bitmasks into human-readable messages.
 
     Args:
         params (dict): Design parameters
-        manufacturing_method (str): 'sdprinting', 'cnc_milling', 'casting'
+        violations (int): Violation bitmask from evaluate_dfm_rules()
+        warnings (int): Warning bitmask from evaluate_dfm_rules()
 
     Returns:
         dict: {
@@ -19,84 +130,86 @@ def check_dfm_rules(params, manufacturing_method='3d_printing'):
             'warnings': list of warnings
         }
     """
-    violations = []
-    warnings = []
+    violations, warnings = int(violations), int(warnings)
+    violation_messages = []
+    warning_messages = []
 
-    # Rule 1: Minimum wall thickness for 3D printing
-    # PLA requires >= 2mm for structural integrity
-    if params['base_thickness'] < 2.0:
-        violations.append(
+    if violations & DFM_BASE_TOO_THIN:
+        violation_messages.append(
             f"Base thickness {params['base_thickness']}mm < 2mm minimum for 3D printing")
-
-    if params['rib_thickness'] < 1.5:
-        violations.append(
+    if violations & DFM_RIB_TOO_THIN:
+        violation_messages.append(
             f"Rib thickness {params['rib_thickness']}mm < 1.5mm minimum")
-
-    # Rule 2: Maximum thickness (avoid warping in 3D printing)
-    if params['base_thickness'] > 8.0:
-        warnings.append(
+    if warnings & DFM_WARN_WARPING:
+        warning_messages.append(
             f"Base thickness {params['base_thickness']}mm may cause warping in 3D printing")
-
-    # Rule 3: Hole diameter must match standard drill sizes
-    # Common sizes: 3, 4, 5, 6, 8 mm
-    standard_sizes = [3.0, 4.0, 5.0, 6.0, 8.0]
-    closest_size = min(standard_sizes, key=lambda x: abs(
-        x - params['hole_diameter']))
-    if abs(params['hole_diameter'] - closest_size) > 0.5:
-        violations.append(
+    if violations & DFM_HOLE_NOT_STANDARD:
+        closest_size = STANDARD_HOLE_SIZES[
+            np.argmin(np.abs(STANDARD_HOLE_SIZES - params['hole_diameter']))]
+        violation_messages.append(
             f"Hole diameter {params['hole_diameter']}mm not standard. Use {closest_size}mm")
-
-    # Rule 4: Minimum fillet radius (avoid sharp corners that cause stress)
-    if params['fillet_radius'] < 1.0:
-        violations.append(
+    if violations & DFM_FILLET_TOO_SMALL:
+        violation_messages.append(
             f"Fillet radius {params['fillet_radius']}mm < 1mm minimum (stress concentration)")
-
-    # Rule 5: Rib spacing must allow toolpath (for 3D printing nozzle)
-    if params['rib_count'] > 0:
+    if violations & DFM_RIBS_TOO_CLOSE:
         rib_spacing = params['base_length'] / (params['rib_count'] + 1)
-        if rib_spacing < 10.0:
-            violations.append(
-                f"Rib spacing {rib_spacing:.1f}mm < 10mm minimum (ribs too close)")
-
-    # Rule 6: Maximum rib count (diminishing returns + longer print time)
-    if params['rib_count'] > 5:
-        warnings.append(
+        violation_messages.append(
+            f"Rib spacing {rib_spacing:.1f}mm < 10mm minimum (ribs too close)")
+    if warnings & DFM_WARN_RIB_COUNT:
+        warning_messages.append(
             f"Rib count {params['rib_count']} > 5 may not improve strength significantly")
-
-    # Rule 7: Aspect ratio check (base_length / base_width)
-    aspect_ratio = params['base_length'] / params['base_width']
-    if aspect_ratio > 3.0:
-        warnings.append(
+    if warnings & DFM_WARN_ASPECT_RATIO:
+        aspect_ratio = params['base_length'] / params['base_width']
+        warning_messages.append(
             f"Aspect ratio {aspect_ratio:.1f} > 3.0 may cause bending issues")
-
-    # Rule 8: Hole position (must not be too close to edge)
-    # Assume hole is centered; check 2x diameter clearance
-    edge_distance = params['base_width'] / 2 - params['hole_diameter']
-    if edge_distance < params['hole_diameter'] * 2:
-        violations.append(
+    if violations & DFM_HOLE_NEAR_EDGE:
+        violation_messages.append(
             f"Hole too close to edge (need 2x diameter clearance)")
-
-    # Rule 9: Support/overhang heuristic
-    # Thin ribs on tall structures may need support material
-    rib_height = 20.0  # Assume ~20mm rib height for this design
-    if params['rib_thickness'] < 2.0 and rib_height > 20:
-        warnings.append(
+    if warnings & DFM_WARN_NEEDS_SUPPORT:
+        warning_messages.append(
             f"Thin ribs ({params['rib_thickness']}mm) on tall structure may need support material")
-
-    # Rule 10: Warping risk for thick bases
-    if params['base_thickness'] > 6.0:
-        warnings.append(
+    if warnings & DFM_WARN_THICK_BASE:
+        warning_messages.append(
             f"Thick base ({params['base_thickness']}mm) has higher warping risk - use heated bed")
 
-    is_valid = len(violations) == 0
-
     return {
-        'is_valid': is_valid,
-        'violations': violations,
-        'warnings': warnings
+        'is_valid': violations == 0,
+        'violations': violation_messages,
+        'warnings': warning_messages
     }
 
 
+def check_dfm_rules(params, manufacturing_method='3d_printing'):
+    """
+    Validate design against manufacturing constraints.
+
+    Rules (3D printing):
+        1. Base >= 2mm and ribs >= 1.5mm thick
+        2. Base > 8mm warns about warping
+        3. Hole within 0.5mm of a standard drill size (3, 4, 5, 6, 8 mm)
+        4. Fillet radius >= 1mm
+        5. Rib spacing >= 10mm for the nozzle toolpath
+        6. More than 5 ribs warns about diminishing returns
+        7. Length/width aspect ratio > 3 warns about bending
+        8. Centered hole needs 2x diameter edge clearance
+        9. Thin ribs on tall structures may need support
+        10. Base > 6mm warns about warping (heated bed)
+
+    Args:
+        params (dict): Design parameters
+        manufacturing_method (str): 'sdprinting', 'cnc_milling', 'casting'
+
+    Returns:
+        dict: {
+            'is_valid': bool,
+            'violations': list of rule violations,
+            'warnings': list of warnings
+        }
+    """
+    violations, warnings = evaluate_dfm_rules(params)
+    return render_dfm_messages(params, violations[0], warnings[0])
+
+
 def calculate_print_readiness_score(params, dfm_result, print_time_hours):
     """
     Calculate manufacturing readiness score (0-100).
@@ -132,6 +245,26 @@ def calculate_print_readiness_score(params, dfm_result, print_time_hours):
     return int(score)
 
 
+
+def calculate_print_readiness_score_batch(violations, warnings, print_time_hours):
+    """
+    Vectorized calculate_print_readiness_score() working on DFM bitmasks.
+
+    Args:
+        violations (ndarray): Violation bitmasks from evaluate_dfm_rules()
+        warnings (ndarray): Warning bitmasks from evaluate_dfm_rules()
+        print_time_hours (ndarray): Estimated print time in hours
+
+    Returns:
+        ndarray: Integer scores from 0-100
+    """
+    violation_penalty = 10 * count_flags(violations)
+    warning_penalty = 5 * count_flags(warnings)
+    score_time = np.minimum(
+        20, (np.asarray(print_time_hours) / 2 * 20).astype(int))
+
+    return np.maximum(0, 100 - violation_penalty - warning_penalty - score_time)
+
 # Test function
 if __name__ == '__main__':
     print("Testing DFM Rules Checker...")
@@ -0,0 +1,307 @@
+"""
+Ensemble Predictor
+Batched mean / uncertainty predictions from a surrogate model ensemble,
+either one ensemble per target or one multi-output (joint) ensemble.
+"""
+
+import numpy as np
+import pandas as pd
+
+from tree_engine import compile_ensemble
+
+
+DESIGN_FEATURES = [
+    'base_length', 'base_width', 'base_thickness',
+    'rib_count', 'rib_thickness', 'fillet_radius', 'hole_diameter'
+]
+
+# Operating conditions, so one model covers every load and material
+CONDITION_FEATURES = ['load', 'youngs_modulus', 'yield_strength']
+
+FEATURE_COLUMNS = DESIGN_FEATURES + CONDITION_FEATURES
+
+# Outputs of multi-output (joint) surrogates, in model output order
+TARGETS = ['max_stress', 'max_deflection']
+
+# Surrogates trained before CONDITION_FEATURES existed saw only the design
+# columns, evaluated at this fixed load and material
+LEGACY_TRAINING_CONDITIONS = {'load': 50.0, 'material': 'PLA'}
+
+
+def infer_feature_columns(models):
+    """
+    Column order an ensemble was trained on.
+
+    Uses sklearn's feature_names_in_ when the models were fitted on a
+    DataFrame, otherwise the feature count (design-only legacy models
+    have len(DESIGN_FEATURES) inputs).
+    """
+    names = getattr(models[0], 'feature_names_in_', None) \
+        if not hasattr(models, 'predict_members') else None
+    if names is not None:
+        return list(names)
+
+    n_features = models.n_features if hasattr(models, 'predict_members') \
+        else models[0].n_features_in_
+    if n_features == len(FEATURE_COLUMNS):
+        return list(FEATURE_COLUMNS)
+    if n_features == len(DESIGN_FEATURES):
+        return list(DESIGN_FEATURES)
+    raise ValueError(f"Cannot infer feature columns for {n_features} model inputs")
+
+
+def with_conditions(X_design, load, material):
+    """
+    Append operating-condition columns to a design matrix.
+
+    Args:
+        X_design: (N, len(DESIGN_FEATURES)) design matrix
+        load (float): Applied load in N
+        material (dict): Material properties (youngs_modulus, yield_strength)
+
+    Returns:
+        ndarray: (N, len(FEATURE_COLUMNS)) model input matrix
+    """
+    X_design = np.atleast_2d(np.asarray(X_design, dtype=float))
+    conditions = np.array(
+        [load, material['youngs_modulus'], material['yield_strength']], dtype=float)
+    return np.hstack([X_design, np.broadcast_to(conditions, (len(X_design), 3))])
+
+
+class EnsemblePredictor:
+    """
+    Predicts a matrix of designs with every ensemble member in one pass.
+
+    Member outputs are written into a preallocated (n_models, N) buffer that
+    is reused between calls and only grows when a larger batch arrives.
+    GradientBoosting ensembles are evaluated through the compiled tree
+    engine (which itself hands batches above SKLEARN_CROSSOVER_ROWS to the
+    sklearn members); other model types use one predict() call per member.
+    A predictor is not thread-safe; create one per optimization run.
+    """
+
+    def __init__(self, models, feature_columns=None, compiled=True):
+        """
+        Args:
+            models: List of trained regressors (ensemble) or a CompiledEnsemble
+            feature_columns (list): Column names the models were trained on
+                (default: inferred, see infer_feature_columns())
+            compiled (bool): Compile GradientBoosting members into one engine
+        """
+        if models is None or len(models) == 0:
+            raise ValueError("Ensemble predictor needs at least one model")
+
+        self.models = models
+        self.feature_columns = list(feature_columns) if feature_columns is not None \
+            else infer_feature_columns(models)
+        self.engine = None
+
+        if hasattr(models, 'predict_members'):
+            self.engine = models
+        elif compiled:
+            try:
+                self.engine = compile_ensemble(models)
+            except TypeError:
+                # Not a GradientBoosting ensemble - use sklearn directly
+                self.engine = None
+
+        self._buffer = np.empty((len(models), 0))
+
+    @property
+    def n_models(self):
+        return len(self.models)
+
+    @property
+    def conditioned(self):
+        """True if load and material properties are model inputs."""
+        return all(col in self.feature_columns for col in CONDITION_FEATURES)
+
+    @property
+    def feature_importances_(self):
+        """Feature importances averaged across the ensemble."""
+        if self.engine is not None:
+            return self.engine.feature_importances_
+        return np.mean(
+            [model.feature_importances_ for model in self.models], axis=0)
+
+    def predict_members(self, X):
+        """
+        Predict every design with every ensemble member.
+
+        Args:
+            X: (N, n_features) array or DataFrame of designs
+
+        Returns:
+            ndarray: (n_models, N) view into the reusable output buffer
+        """
+        if self.engine is not None:
+            X_pred = self._as_matrix(X)
+        else:
+            X_pred = self._as_frame(X)
+        n_rows = len(X_pred)
+
+        if self._buffer.shape[1] < n_rows:
+            self._buffer = np.empty((self.n_models, n_rows))
+
+        out = self._buffer[:, :n_rows]
+        if self.engine is not None:
+            return self.engine.predict_members(X_pred, out=out)
+
+        for i, model in enumerate(self.models):
+            out[i] = model.predict(X_pred)
+        return out
+
+    def predict(self, X, quantiles=None):
+        """
+        Get per-design mean and standard deviation across the ensemble.
+
+        Args:
+            X: (N, n_features) array or DataFrame of designs
+            quantiles (list): Optional quantile levels in [0, 1]
+
+        Returns:
+            tuple: (mean, std) arrays of length N, plus a
+                   (len(quantiles), N) array when quantiles are requested
+        """
+        members = self.predict_members(X)
+        mean = members.mean(axis=0)
+        std = members.std(axis=0)
+
+        if quantiles is None:
+            return mean, std
+        return mean, std, np.quantile(members, quantiles, axis=0)
+
+    def _as_matrix(self, X):
+        """Raw (N, n_features) array in training column order."""
+        if isinstance(X, pd.DataFrame):
+            return X[self.feature_columns].to_numpy(dtype=float)
+        return np.atleast_2d(np.asarray(X, dtype=float))
+
+    def _as_frame(self, X):
+        """Wrap raw arrays with the training column names."""
+        if isinstance(X, pd.DataFrame):
+            return X[self.feature_columns]
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        return pd.DataFrame(X, columns=self.feature_columns)
+
+
+class JointEnsemblePredictor:
+    """
+    Predicts every target of a multi-output ensemble in one pass.
+
+    Each member returns an (N, len(targets)) matrix from a single predict()
+    call, so stress and deflection share one model evaluation instead of
+    two independent ensembles. Members are sklearn regressors (e.g. a
+    TransformedTargetRegressor around an MLP); the optional regressor_
+    wrapper is looked through to find the training columns.
+    A predictor is not thread-safe; create one per optimization run.
+    """
+
+    def __init__(self, models, targets=TARGETS, feature_columns=None):
+        """
+        Args:
+            models: List of trained multi-output regressors (ensemble)
+            targets (list): Output column names, in model output order
+            feature_columns (list): Column names the models were trained on
+                (default: inferred, see infer_feature_columns())
+        """
+        if models is None or len(models) == 0:
+            raise ValueError("Ensemble predictor needs at least one model")
+
+        self.models = models
+        self.targets = list(targets)
+        self.feature_columns = list(feature_columns) if feature_columns is not None \
+            else infer_feature_columns([getattr(model, 'regressor_', model)
+                                        for model in models])
+        self._buffer = np.empty((len(models), 0, len(self.targets)))
+
+    @property
+    def n_models(self):
+        return len(self.models)
+
+    @property
+    def conditioned(self):
+        """True if load and material properties are model inputs."""
+        return all(col in self.feature_columns for col in CONDITION_FEATURES)
+
+    def target(self, name):
+        """Single-target view with the EnsemblePredictor interface."""
+        return _TargetView(self, self.targets.index(name))
+
+    def predict_members(self, X):
+        """
+        Predict every design with every ensemble member.
+
+        Args:
+            X: (N, n_features) array or DataFrame of designs
+
+        Returns:
+            ndarray: (n_models, N, n_targets) view into the reusable buffer
+        """
+        if isinstance(X, pd.DataFrame):
+            X_pred = X[self.feature_columns]
+        else:
+            X_pred = pd.DataFrame(np.atleast_2d(np.asarray(X, dtype=float)),
+                                  columns=self.feature_columns)
+        n_rows = len(X_pred)
+
+        if self._buffer.shape[1] < n_rows:
+            self._buffer = np.empty((self.n_models, n_rows, len(self.targets)))
+
+        out = self._buffer[:, :n_rows]
+        for i, model in enumerate(self.models):
+            out[i] = np.asarray(model.predict(X_pred)).reshape(n_rows, -1)
+        return out
+
+    def predict(self, X):
+        """
+        Per-design mean and standard deviation of every target.
+
+        Returns:
+            tuple: (mean, std) arrays of shape (N, n_targets)
+        """
+        members = self.predict_members(X)
+        return members.mean(axis=0), members.std(axis=0)
+
+    def target_importance(self, index):
+        """Importances stored per target at training time, averaged."""
+        return np.mean([model.target_importances_[index] for model in self.models],
+                       axis=0)
+
+
+class _TargetView:
+    """
+    One output of a joint predictor (predict, importances).
+
+    Works with any object offering predict() -> (mean, std) of shape
+    (N, n_targets), predict_members() and target_importance().
+    """
+
+    def __init__(self, joint, index):
+        self.joint = joint
+        self.index = index
+
+    @property
+    def feature_columns(self):
+        return self.joint.feature_columns
+
+    @property
+    def conditioned(self):
+        return self.joint.conditioned
+
+    @property
+    def n_models(self):
+        return self.joint.n_models
+
+    @property
+    def feature_importances_(self):
+        return self.joint.target_importance(self.index)
+
+    def predict(self, X, quantiles=None):
+        if quantiles is None:
+            mean, std = self.joint.predict(X)
+            return mean[:, self.index], std[:, self.index]
+
+        members = self.joint.predict_members(X)[:, :, self.index]
+        return (members.mean(axis=0), members.std(axis=0),
+                np.quantile(members, quantiles, axis=0))
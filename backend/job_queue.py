@@ -0,0 +1,301 @@
+"""
+Optimization Job Queue
+Runs optimizations on a bounded process pool so slow NSGA-II runs never
+hold an HTTP worker. Jobs report per-generation progress and partial
+Pareto fronts, and can be cancelled while queued or running.
+
+Job state lives in the memory of the API process that accepted the job,
+so status requests must reach the same process (one gunicorn worker with
+threads, or sticky routing).
+"""
+
+import multiprocessing
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, CancelledError
+
+from optimizer import run_optimization, OptimizationCancelled
+
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_COMPLETED = 'completed'
+JOB_FAILED = 'failed'
+JOB_CANCELLED = 'cancelled'
+
+FINISHED_STATES = (JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED)
+
+
+class JobQueueFull(Exception):
+    """Raised when the queue is at capacity (caller should retry later)."""
+
+
+def _run_job(job_kwargs, progress, cancel_event):
+    """
+    Worker-process entry point for one optimization job.
+
+    Args:
+        job_kwargs (dict): Keyword arguments for run_optimization()
+        progress: Manager dict shared with the API process
+        cancel_event: Manager event set when the job is cancelled
+
+    Returns:
+        dict: run_optimization() results
+    """
+    progress['started_at'] = time.time()
+    mentor_log = []
+
+    def report(event):
+        if cancel_event.is_set():
+            raise OptimizationCancelled("Job cancelled by user")
+        messages = event.pop('mentor_messages', [])
+        if messages:
+            # Manager proxies only see reassignment, not in-place appends
+            mentor_log.extend(messages)
+            progress['mentor_log'] = list(mentor_log)
+        progress['latest'] = event
+
+    if cancel_event.is_set():
+        raise OptimizationCancelled("Job cancelled before start")
+    return run_optimization(progress_callback=report, **job_kwargs)
+
+
+def _wait_for_results(wait):
+    """Thread entry point for follower jobs."""
+    results = wait()
+    if results is None:
+        raise RuntimeError(
+            "The identical in-flight optimization failed; please resubmit")
+    return results
+
+
+class OptimizationJob:
+    """Book-keeping for one submitted optimization."""
+
+    def __init__(self, job_id, inputs, cache_key):
+        self.job_id = job_id
+        self.inputs = inputs
+        self.cache_key = cache_key
+        self.status = JOB_QUEUED
+        self.created_at = time.time()
+        self.finished_at = None
+        self.results = None
+        self.error = None
+        self.future = None
+        self.progress = None
+        self.cancel_event = None
+        self.follower = False
+
+    def snapshot(self):
+        """JSON-serializable view of the job (also the SSE event payload)."""
+        progress = dict(self.progress) if self.progress is not None else {}
+        latest = progress.get('latest') or {}
+
+        status = self.status
+        if status == JOB_QUEUED and 'started_at' in progress:
+            status = JOB_RUNNING
+
+        snapshot = {
+            'job_id': self.job_id,
+            'status': status,
+            'inputs': {key: value for key, value in self.inputs.items()
+                       if key != 'initial_designs'},
+            'cache_key': self.cache_key,
+            'created_at': self.created_at,
+            'started_at': progress.get('started_at'),
+            'finished_at': self.finished_at,
+            'progress': {
+                key: value for key, value in latest.items() if key != 'pareto_front'
+            },
+            'partial_results': {'pareto_front': latest.get('pareto_front', [])},
+            'mentor_log': progress.get('mentor_log', [])
+        }
+        if latest.get('n_gen'):
+            snapshot['progress']['percent'] = round(
+                100.0 * latest['generation'] / latest['n_gen'], 1)
+        if self.results is not None:
+            snapshot['results'] = self.results
+        if self.error is not None:
+            snapshot['error'] = self.error
+        return snapshot
+
+
+class OptimizationJobManager:
+    """
+    Bounded process pool for optimization jobs.
+
+    At most max_workers jobs run at once and at most max_pending wait
+    behind them; submit() raises JobQueueFull beyond that so the API can
+    answer 429 instead of piling up work. The pool and the multiprocessing
+    manager are created lazily, so forking gunicorn workers is safe.
+    """
+
+    def __init__(self, max_workers=2, max_pending=8, on_complete=None,
+                 on_finish=None, retention_seconds=3600):
+        """
+        Args:
+            max_workers (int): Concurrent optimization processes
+            max_pending (int): Jobs allowed to wait for a free process
+            on_complete (callable): Called as on_complete(job) in the API
+                process after a job succeeds (STL generation, disk cache)
+            on_finish (callable): Called as on_finish(job) once a submitted
+                job reaches any final state (e.g. to release a lock)
+            retention_seconds (float): How long finished jobs stay queryable
+        """
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.on_complete = on_complete
+        self.on_finish = on_finish
+        self.retention_seconds = retention_seconds
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._executor = None
+        self._manager = None
+        self._waiters = None
+
+    def submit(self, job_kwargs, cache_key=None):
+        """
+        Queue an optimization.
+
+        Args:
+            job_kwargs (dict): Keyword arguments for run_optimization()
+            cache_key (str): Disk-cache key of the request
+
+        Returns:
+            OptimizationJob: The new job
+
+        Raises:
+            JobQueueFull: If max_workers + max_pending jobs are active
+        """
+        with self._lock:
+            self._prune()
+            if self.active_count() >= self.max_workers + self.max_pending:
+                raise JobQueueFull(
+                    f"Optimization queue is full ({self.active_count()} active jobs)")
+
+            self._ensure_pool()
+            job = OptimizationJob(uuid.uuid4().hex, dict(job_kwargs), cache_key)
+            job.progress = self._manager.dict()
+            job.cancel_event = self._manager.Event()
+            job.future = self._executor.submit(
+                _run_job, job.inputs, job.progress, job.cancel_event)
+            self._jobs[job.job_id] = job
+
+        job.future.add_done_callback(lambda future: self._finish(job, future))
+        return job
+
+    def add_completed(self, job_kwargs, results, cache_key=None):
+        """Register an already-finished job (e.g. served from disk cache)."""
+        job = OptimizationJob(uuid.uuid4().hex, dict(job_kwargs), cache_key)
+        job.status = JOB_COMPLETED
+        job.results = results
+        job.finished_at = time.time()
+        with self._lock:
+            self._prune()
+            self._jobs[job.job_id] = job
+        return job
+
+    def submit_waiter(self, job_kwargs, wait, cache_key=None):
+        """
+        Track a job whose result is computed elsewhere (another worker).
+
+        wait() runs on a thread and returns the shared results, or None if
+        the other computation failed. Waiters do not count against the
+        process pool limits.
+        """
+        job = OptimizationJob(uuid.uuid4().hex, dict(job_kwargs), cache_key)
+        job.follower = True
+        job.status = JOB_RUNNING
+        with self._lock:
+            self._prune()
+            if self._waiters is None:
+                self._waiters = ThreadPoolExecutor(thread_name_prefix='job-waiter')
+            job.future = self._waiters.submit(_wait_for_results, wait)
+            self._jobs[job.job_id] = job
+
+        job.future.add_done_callback(lambda future: self._finish(job, future))
+        return job
+
+    def find_active(self, cache_key):
+        """Unfinished job for the same request, if any (request coalescing)."""
+        for job in list(self._jobs.values()):
+            if job.cache_key == cache_key and job.status not in FINISHED_STATES:
+                return job
+        return None
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """
+        Cancel a queued or running job.
+
+        Returns:
+            bool: False if the job is unknown or already finished
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job.status in FINISHED_STATES or job.follower:
+            return False
+
+        # Running jobs stop at their next generation boundary
+        job.cancel_event.set()
+        if job.future.cancel():
+            self._mark(job, JOB_CANCELLED, error='Job cancelled by user')
+        return True
+
+    def active_count(self):
+        return sum(1 for job in self._jobs.values()
+                   if job.status not in FINISHED_STATES and not job.follower)
+
+    def stats(self):
+        return {
+            'max_workers': self.max_workers,
+            'max_pending': self.max_pending,
+            'active_jobs': self.active_count(),
+            'tracked_jobs': len(self._jobs)
+        }
+
+    def _finish(self, job, future):
+        if job.status in FINISHED_STATES:
+            return
+        try:
+            results = future.result()
+        except (CancelledError, OptimizationCancelled):
+            self._mark(job, JOB_CANCELLED, error='Job cancelled by user')
+            return
+        except Exception as exc:
+            print(f"[Jobs] Job {job.job_id} failed: {exc}")
+            self._mark(job, JOB_FAILED, error=str(exc))
+            return
+
+        job.results = results
+        if self.on_complete is not None and not job.follower:
+            try:
+                self.on_complete(job)
+            except Exception as exc:
+                print(f"[Jobs] Warning: post-processing failed for {job.job_id}: {exc}")
+        self._mark(job, JOB_COMPLETED)
+
+    def _mark(self, job, status, error=None):
+        job.status = status
+        job.error = error
+        job.finished_at = time.time()
+        print(f"[Jobs] Job {job.job_id} {status}")
+        if self.on_finish is not None and not job.follower:
+            try:
+                self.on_finish(job)
+            except Exception as exc:
+                print(f"[Jobs] Warning: finish hook failed for {job.job_id}: {exc}")
+
+    def _ensure_pool(self):
+        if self._executor is None:
+            self._manager = multiprocessing.Manager()
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+
+    def _prune(self):
+        cutoff = time.time() - self.retention_seconds
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished_at is not None and job.finished_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
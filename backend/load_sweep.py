@@ -0,0 +1,183 @@
+"""
+Load Sweep Runner
+Optimizes a grid of (load, material) scenarios on a process pool. Each
+material's loads are split into contiguous chains; the scenarios of a chain
+run one after another so every run is warm-started from its neighbour's
+Pareto front, while the chains themselves run in parallel. Results are
+written to the disk cache as soon as each scenario finishes.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+import numpy as np
+
+from optimizer import run_optimization
+from model_registry import get_model_registry
+from ensemble_predictor import DESIGN_FEATURES
+from result_cache import (compute_request_hash, cache_path_for,
+                          load_cached_results, store_cached_results)
+
+
+def load_grid(load_min, load_max, load_step):
+    """Loads from load_min to load_max inclusive (e.g. 20-200 N in 5 N steps)."""
+    if load_step <= 0 or load_max < load_min:
+        raise ValueError("Load grid needs load_step > 0 and load_max >= load_min")
+    n_steps = int(np.floor((load_max - load_min) / load_step + 1e-9))
+    return [round(load_min + i * load_step, 4) for i in range(n_steps + 1)]
+
+
+def build_scenarios(loads, materials):
+    """Every (load, material) combination, without duplicates."""
+    return [
+        {'load': float(load), 'material': material}
+        for material in dict.fromkeys(materials)
+        for load in sorted(set(float(load) for load in loads))
+    ]
+
+
+def plan_chains(scenarios, n_chains):
+    """
+    Split scenarios into warm-start chains.
+
+    Scenarios are grouped by material and sorted by load, then each material
+    is cut into contiguous runs of neighbouring loads. Chains are balanced
+    across materials so at most n_chains exist in total.
+
+    Returns:
+        list: Chains (lists of scenarios, in run order)
+    """
+    by_material = {}
+    for scenario in scenarios:
+        by_material.setdefault(scenario['material'], []).append(scenario)
+
+    n_chains = max(n_chains, len(by_material))
+    chains = []
+    for material, group in by_material.items():
+        group.sort(key=lambda scenario: scenario['load'])
+        share = max(1, round(n_chains * len(group) / len(scenarios)))
+        bounds = np.linspace(0, len(group), min(share, len(group)) + 1).round().astype(int)
+        chains.extend(group[start:stop] for start, stop in zip(bounds[:-1], bounds[1:]))
+    return chains
+
+
+def _front_parameters(results):
+    """Pareto design matrix of a result, for warm-starting the next load."""
+    return [[design['parameters'][col] for col in DESIGN_FEATURES]
+            for design in results['pareto_front']]
+
+
+def run_load_sweep(scenarios, cache_dir, pop_size=40, n_gen=50,
+                   evaluator='surrogate', termination='n_gen',
+                   max_workers=None, on_result=None, cancel_event=None,
+                   surrogate='auto'):
+    """
+    Optimize every scenario, reusing cached runs.
+
+    Args:
+        scenarios (list): Dicts with 'load' and 'material'
+        cache_dir (str or Path): Disk cache directory
+        pop_size (int): Population size per scenario
+        n_gen (int): Generations per scenario
+        evaluator (str): See optimizer.EVALUATORS
+        termination (str): See optimizer.TERMINATIONS
+        max_workers (int): Pool size (default: CPU count)
+        on_result (callable): Called as on_result(summary, results, cached,
+            error) in the calling process as each scenario finishes
+        cancel_event (threading.Event): When set, queued scenarios are
+            cancelled and no new ones start; running ones finish (and are
+            still cached)
+        surrogate (str): See optimizer.SURROGATES
+
+    Returns:
+        list: One summary dict per scenario, in completion order
+    """
+    n_workers = max(1, min(max_workers or os.cpu_count() or 1, len(scenarios)))
+    chains = plan_chains(scenarios, n_workers)
+    print(f"[Sweep] {len(scenarios)} scenarios in {len(chains)} chains "
+          f"on {n_workers} processes")
+
+    if evaluator != 'physics':
+        # Forked workers inherit the loaded ensembles
+        get_model_registry().preload()
+
+    settings = {'pop_size': pop_size, 'n_gen': n_gen, 'evaluator': evaluator,
+                'termination': termination, 'surrogate': surrogate}
+    summaries = []
+
+    def finish(scenario, cache_key, results, cached, error, elapsed):
+        summary = {**scenario, 'cache_key': cache_key, 'cached': cached,
+                   'elapsed_s': round(elapsed, 2)}
+        if error is not None:
+            summary['error'] = error
+        else:
+            front = results['pareto_front']
+            summary.update({
+                'n_pareto': len(front),
+                'best_mass': min(design['mass'] for design in front),
+                'best_cost': min(design['cost'] for design in front),
+                'n_generations': results.get('n_generations')
+            })
+        summaries.append(summary)
+        if on_result is not None:
+            on_result(summary, results, cached, error)
+
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        pending = {}
+
+        def submit_next(chain, seeds):
+            # Cached scenarios finish immediately and pass their front along
+            while chain:
+                scenario = chain.pop(0)
+                inputs = {**scenario, **settings}
+                cache_key = compute_request_hash(
+                    scenario['load'], scenario['material'], pop_size, n_gen,
+                    evaluator, termination, surrogate)
+                path = cache_path_for(cache_dir, cache_key)
+                cached = load_cached_results(path) if os.path.exists(path) else None
+                if cached:
+                    finish(scenario, cache_key, cached, True, None, 0.0)
+                    seeds = _front_parameters(cached)
+                    continue
+
+                future = pool.submit(
+                    run_optimization, load=scenario['load'],
+                    material_name=scenario['material'], initial_designs=seeds,
+                    **settings)
+                pending[future] = (chain, scenario, inputs, cache_key, time.time())
+                return
+
+        for chain in chains:
+            submit_next(chain, None)
+
+        cancelled = False
+        while pending:
+            if not cancelled and cancel_event is not None and cancel_event.is_set():
+                cancelled = True
+                for future in list(pending):
+                    if future.cancel():
+                        del pending[future]
+                for chain, *_ in pending.values():
+                    chain.clear()
+                print(f"[Sweep] Cancelled; waiting for {len(pending)} running scenarios")
+
+            done, _ = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+            for future in done:
+                chain, scenario, inputs, cache_key, started = pending.pop(future)
+                try:
+                    results = future.result()
+                except Exception as exc:
+                    print(f"[Sweep] {scenario['material']} @ {scenario['load']}N "
+                          f"failed: {exc}")
+                    finish(scenario, cache_key, None, False, str(exc),
+                           time.time() - started)
+                    submit_next(chain, None)
+                    continue
+
+                store_cached_results(cache_dir, cache_key, inputs, results)
+                finish(scenario, cache_key, results, False, None,
+                       time.time() - started)
+                submit_next(chain, _front_parameters(results))
+
+    return summaries
@@ -1,21 +1,90 @@
 import json
 import os
+import threading
+from types import MappingProxyType
+
+import numpy as np
 
 # Path to materials database
 MATERIALS_FILE = os.path.join(
     os.path.dirname(__file__), 'data', 'materials.json')
 
+# Numeric properties packed into the structured material table
+TABLE_FIELDS = ['density', 'youngs_modulus', 'yield_strength',
+                'cost_per_kg', 'co2_per_kg']
+
+
+class MaterialStore:
+    """
+    Parsed materials database, cached until materials.json changes.
+
+    Attributes:
+        materials: Immutable mapping of name -> immutable property mapping
+        names (tuple): Material names in file order
+        table (ndarray): Read-only structured array with one row per
+            material and the TABLE_FIELDS columns (missing values are NaN)
+    """
+
+    def __init__(self, raw_materials, mtime_ns):
+        self.mtime_ns = mtime_ns
+        self.materials = MappingProxyType({
+            name: MappingProxyType(dict(props))
+            for name, props in raw_materials.items()
+        })
+        self.names = tuple(raw_materials.keys())
+        self._index = {name: i for i, name in enumerate(self.names)}
+
+        table = np.zeros(len(self.names),
+                         dtype=[(field, np.float64) for field in TABLE_FIELDS])
+        for i, name in enumerate(self.names):
+            for field in TABLE_FIELDS:
+                table[field][i] = raw_materials[name].get(field, np.nan)
+        table.flags.writeable = False
+        self.table = table
+
+    def index(self, material_name):
+        """Row of a material in the structured table."""
+        if material_name not in self._index:
+            available = ', '.join(self.names)
+            raise ValueError(
+                f"Material '{material_name}' not found. Available: {available}")
+        return self._index[material_name]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_material_store():
+    """
+    Get the cached material store, re-reading the file only if it changed.
+
+    Returns:
+        MaterialStore: Current materials database
+    """
+    global _store
+    mtime_ns = os.stat(MATERIALS_FILE).st_mtime_ns
+
+    store = _store
+    if store is not None and store.mtime_ns == mtime_ns:
+        return store
+
+    with _store_lock:
+        if _store is None or _store.mtime_ns != mtime_ns:
+            with open(MATERIALS_FILE, 'r') as f:
+                _store = MaterialStore(json.load(f), mtime_ns)
+        return _store
+
 
 def load_materials():
     """
     Load all materials from database.
 
     Returns:
-        dict: Dictionary of material properties
+        dict: Dictionary of material properties (a fresh, mutable copy)
     """
-    with open(MATERIALS_FILE, 'r') as f:
-        materials = json.load(f)
-    return materials
+    return {name: dict(props)
+            for name, props in get_material_store().materials.items()}
 
 
 def get_material(material_name):
@@ -26,19 +95,25 @@ def get_material(material_name):
         material_name (str): Name of material (e.g., 'PLA', 'Aluminum6061')
 
     Returns:
-        dict: Material properties
+        Mapping: Read-only material properties
 
     Raises:
         ValueError: If material not found
     """
-    materials = load_materials()
+    store = get_material_store()
+    store.index(material_name)  # Raises ValueError for unknown materials
+    return store.materials[material_name]
 
-    if material_name not in materials:
-        available = ', '.join(materials.keys())
-        raise ValueError(
-            f"Material '{material_name}' not found. Available: {available}")
 
-    return materials[material_name]
+def get_material_table():
+    """
+    Packed numeric properties for vectorized consumers.
+
+    Returns:
+        tuple: (structured ndarray, tuple of material names in row order)
+    """
+    store = get_material_store()
+    return store.table, store.names
 
 
 # Test function
@@ -0,0 +1,354 @@
+"""
+Model Registry
+Loads, validates and caches the surrogate ensembles once per process.
+Entries are keyed by file path + mtime + content hash and can be hot
+reloaded by a background watcher when a retrained ensemble is dropped
+into backend/data/.
+
+Compiled ensembles are also exported next to each pickle as a directory
+of .npy arrays (e.g. stress_ensemble.trees/) and opened with mmap_mode='r',
+so gunicorn workers share one page-cache copy and a warm start is a few
+np.load calls instead of a full unpickle. When the pickle is still present
+it is unpickled lazily, on the first batch large enough for sklearn's
+predict() to beat the compiled traversal (see tree_engine); that worker
+then holds a private copy of the members, the price of the faster path.
+"""
+
+import hashlib
+import os
+import threading
+import time
+
+import joblib
+
+from tree_engine import (compile_ensemble, save_compiled, load_compiled,
+                         read_manifest, MANIFEST_FILE)
+from compact_surrogate import load_compact_surrogate
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+# Registry name -> ensemble pickle in DATA_DIR
+ENSEMBLE_FILES = {
+    'stress': 'stress_ensemble.pkl',
+    'deflection': 'deflection_ensemble.pkl',
+    'joint': 'joint_ensemble.pkl',
+    'compact': 'compact_surrogate.json'
+}
+
+# Ensembles a deployment may ship without (the per-target ones are required)
+OPTIONAL_ENSEMBLES = ('joint', 'compact')
+
+
+def _file_sha256(path):
+    """Content hash of a model file."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _source_sha256(path):
+    """
+    Hash identifying the ensemble an entry path was loaded from.
+
+    Artifact-only entries point at the manifest, which records the hash of
+    the pickle it was compiled from.
+    """
+    if os.path.basename(path) == MANIFEST_FILE:
+        manifest = read_manifest(os.path.dirname(path))
+        return manifest.get('source_sha256', '') if manifest else None
+    return _file_sha256(path)
+
+
+def _members_loader(name, path):
+    """Loader for an artifact's sklearn members (None if the pickle fails)."""
+    def load():
+        try:
+            models = joblib.load(path)
+            _validate_ensemble(models, path)
+        except Exception as exc:
+            print(f"[Models] Warning: could not load '{name}' members from "
+                  f"{os.path.basename(path)}, large batches stay compiled ({exc})")
+            return None
+        print(f"[Models] Loaded '{name}' sklearn members for large batches")
+        return list(models)
+    return load
+
+
+def artifact_dir_for(path):
+    """Compiled-array artifact directory for an ensemble pickle."""
+    return os.path.splitext(path)[0] + '.trees'
+
+
+def export_artifact(path, models=None, sha256=None):
+    """
+    Compile an ensemble pickle and write its memory-mappable artifact.
+
+    Args:
+        path (str): Ensemble pickle path
+        models: Already-loaded model list (avoids a second unpickle)
+        sha256 (str): Already-computed content hash of the pickle
+
+    Returns:
+        str: Artifact directory
+    """
+    if models is None:
+        models = joblib.load(path)
+    if sha256 is None:
+        sha256 = _file_sha256(path)
+    return save_compiled(
+        compile_ensemble(models),
+        artifact_dir_for(path),
+        metadata={'source_file': os.path.basename(path),
+                  'source_sha256': sha256}
+    )
+
+
+def _validate_ensemble(models, path):
+    """Raise ValueError if a loaded ensemble is unusable."""
+    if models is None:
+        raise ValueError(
+            f"Models loaded as None - model file may be corrupted: {path}")
+    if len(models) == 0:
+        raise ValueError(f"Models loaded but are empty: {path}")
+
+    n_features = set()
+    for model in models:
+        if not hasattr(model, 'predict'):
+            raise ValueError(
+                f"Ensemble member {type(model).__name__} has no predict(): {path}")
+        n_features.add(getattr(model, 'n_features_in_', None))
+    if len(n_features) > 1:
+        raise ValueError(f"Ensemble members use different feature counts: {path}")
+
+
+class ModelEntry:
+    """A loaded ensemble plus the file identity it was loaded from."""
+
+    def __init__(self, name, path, mtime, sha256, models, engine, mmapped=False):
+        self.name = name
+        self.path = path
+        self.mtime = mtime
+        self.sha256 = sha256
+        self.models = models
+        self.engine = engine
+        self.mmapped = mmapped
+        self.loaded_at = time.time()
+
+    @property
+    def key(self):
+        return (self.path, self.mtime, self.sha256)
+
+    @property
+    def ensemble(self):
+        """Compiled engine when available, otherwise the raw model list."""
+        return self.engine if self.engine is not None else self.models
+
+    def describe(self):
+        return {
+            'file': os.path.basename(self.path),
+            'members': len(self.ensemble),
+            'compiled': self.engine is not None,
+            'mmapped': self.mmapped,
+            'sha256': self.sha256[:12],
+            'loaded_at': self.loaded_at
+        }
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of surrogate ensembles.
+
+    get() never touches the disk once an entry is loaded; file changes are
+    picked up by refresh(), which the optional watcher thread calls
+    periodically. A reload builds the new entry first and then swaps it in,
+    so in-flight requests keep using the previous ensemble.
+    """
+
+    def __init__(self, data_dir=DATA_DIR, files=ENSEMBLE_FILES, use_artifacts=True):
+        self.data_dir = data_dir
+        self.files = dict(files)
+        self.use_artifacts = use_artifacts
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._watch_interval = None
+        self._watcher = None
+        self._watcher_pid = None
+
+    def path_for(self, name):
+        if name not in self.files:
+            raise KeyError(f"Unknown model '{name}'. Known: {', '.join(self.files)}")
+        return os.path.join(self.data_dir, self.files[name])
+
+    def get(self, name):
+        """
+        Get a loaded ensemble, loading it on first use.
+
+        Args:
+            name (str): Registry name (see ENSEMBLE_FILES)
+
+        Returns:
+            ModelEntry: Cached entry
+        """
+        self._ensure_watcher()
+
+        entry = self._entries.get(name)
+        if entry is not None:
+            return entry
+
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                entry = self._load(name)
+                self._entries[name] = entry
+        return entry
+
+    def available(self, name):
+        """True if an ensemble is loaded or its file exists."""
+        if name in self._entries:
+            return True
+        path = self.path_for(name)
+        return os.path.exists(path) or \
+            (self.use_artifacts and read_manifest(artifact_dir_for(path)) is not None)
+
+    def preload(self):
+        """
+        Eagerly load every registered ensemble (call at startup).
+
+        An optional ensemble that fails to load is skipped with a warning;
+        the optimizer falls back to the per-target ensembles for it.
+        """
+        for name in self.files:
+            if name not in OPTIONAL_ENSEMBLES:
+                self.get(name)
+            elif self.available(name):
+                try:
+                    self.get(name)
+                except Exception as exc:
+                    print(f"[Models] Warning: optional '{name}' failed to load ({exc})")
+        return self.describe()
+
+    def refresh(self):
+        """
+        Reload ensembles whose files changed on disk.
+
+        A new mtime alone is not enough: the content hash must differ too,
+        so touching a file does not trigger an unpickle.
+
+        Returns:
+            list: Names of the ensembles that were reloaded
+        """
+        reloaded = []
+        for name, entry in list(self._entries.items()):
+            path = entry.path
+            try:
+                mtime = os.path.getmtime(path)
+                if mtime == entry.mtime:
+                    continue
+                if _source_sha256(path) == entry.sha256:
+                    entry.mtime = mtime
+                    continue
+                new_entry = self._load(name)
+            except Exception as exc:
+                print(f"[Models] Warning: reload of '{name}' failed, "
+                      f"keeping previous ensemble ({exc})")
+                continue
+
+            with self._lock:
+                self._entries[name] = new_entry
+            reloaded.append(name)
+            print(f"[Models] Hot reloaded '{name}' ({new_entry.sha256[:12]})")
+        return reloaded
+
+    def start_watcher(self, interval=10.0):
+        """Poll the model files every `interval` seconds in a daemon thread."""
+        self._watch_interval = interval
+        self._ensure_watcher()
+
+    def describe(self):
+        return {name: entry.describe() for name, entry in self._entries.items()}
+
+    def _ensure_watcher(self):
+        # Threads do not survive fork, so each gunicorn worker starts its own
+        if self._watch_interval is None or self._watcher_pid == os.getpid():
+            return
+        self._watcher_pid = os.getpid()
+        self._watcher = threading.Thread(
+            target=self._watch, name='model-registry-watcher', daemon=True)
+        self._watcher.start()
+
+    def _watch(self):
+        while True:
+            time.sleep(self._watch_interval)
+            self.refresh()
+
+    def _load(self, name):
+        path = self.path_for(name)
+        artifact_dir = artifact_dir_for(path)
+        manifest = read_manifest(artifact_dir) if self.use_artifacts else None
+
+        if not os.path.exists(path):
+            # Artifact-only deployments ship the .trees directory without the pickle
+            if manifest is not None:
+                return self._open_artifact(name, artifact_dir, manifest)
+            raise FileNotFoundError(f"{name.capitalize()} model not found at {path}")
+
+        mtime = os.path.getmtime(path)
+        sha256 = _file_sha256(path)
+
+        if manifest is not None and manifest.get('source_sha256') == sha256:
+            entry = self._open_artifact(name, artifact_dir, manifest)
+            entry.path, entry.mtime = path, mtime
+            entry.engine.source_loader = _members_loader(name, path)
+            return entry
+
+        if path.endswith('.json'):
+            # Compact surrogates are a few coefficients - nothing to compile
+            surrogate = load_compact_surrogate(path)
+            print(f"[Models] Loaded '{name}': {len(surrogate.terms)}-term "
+                  f"compact surrogate from {os.path.basename(path)}")
+            return ModelEntry(name, path, mtime, sha256, surrogate, None)
+
+        models = joblib.load(path)
+        _validate_ensemble(models, path)
+
+        try:
+            engine = compile_ensemble(models)
+        except TypeError:
+            engine = None
+
+        if engine is not None and self.use_artifacts:
+            try:
+                save_compiled(engine, artifact_dir, metadata={
+                    'source_file': os.path.basename(path),
+                    'source_sha256': sha256
+                })
+            except OSError as exc:
+                print(f"[Models] Warning: could not write artifact {artifact_dir} ({exc})")
+
+        print(f"[Models] Loaded '{name}': {len(models)} members from "
+              f"{os.path.basename(path)} (compiled={engine is not None})")
+        return ModelEntry(name, path, mtime, sha256, models, engine)
+
+    def _open_artifact(self, name, artifact_dir, manifest):
+        engine, manifest = load_compiled(artifact_dir, mmap_mode='r')
+        manifest_path = os.path.join(artifact_dir, MANIFEST_FILE)
+        print(f"[Models] Mapped '{name}': {len(engine)} members / "
+              f"{engine.n_trees} trees from {os.path.basename(artifact_dir)}")
+        return ModelEntry(
+            name, manifest_path, os.path.getmtime(manifest_path),
+            manifest.get('source_sha256', ''), None, engine, mmapped=True)
+
+
+# Singleton instance
+_registry_instance = None
+
+
+def get_model_registry():
+    """Get singleton model registry instance."""
+    global _registry_instance
+    if _registry_instance is None:
+        _registry_instance = ModelRegistry()
+    return _registry_instance
@@ -5,26 +5,62 @@ Uses NSGA-II genetic algorithm to find Pareto-optimal designs.
 
 import numpy as np
 import pandas as pd
-import joblib
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pymoo.core.callback import Callback
 from pymoo.core.problem import Problem
 from pymoo.algorithms.moo.nsga2 import NSGA2
 from pymoo.operators.crossover.sbx import SBX
 from pymoo.operators.mutation.pm import PM
 from pymoo.operators.sampling.rnd import FloatRandomSampling  # ADD THIS LINE
+from pymoo.core.termination import Termination
+from pymoo.indicators.hv import HV
+from pymoo.indicators.igd import IGD
 from pymoo.optimize import minimize
 from pymoo.termination import get_termination
 
 from material_library import get_material
-from dfm_rules import check_dfm_rules, calculate_print_readiness_score
-from cost_estimator import calculate_manufacturing_cost
+from dfm_rules import (evaluate_dfm_rules, dfm_violation_magnitudes,
+                       calculate_print_readiness_score_batch,
+                       DFM_VIOLATION_NAMES)
+from cost_estimator import estimate_costs_batch, MANUFACTURING_METHODS
+from ensemble_predictor import (EnsemblePredictor, JointEnsemblePredictor,
+                                DESIGN_FEATURES, with_conditions,
+                                LEGACY_TRAINING_CONDITIONS)
+from model_registry import get_model_registry
+from physics_calculator import calculate_stress_and_deflection_batch
 
 
 GLOBAL_STRESS_SIGMA = None
-FEATURE_COLUMNS = [
-    'base_length', 'base_width', 'base_thickness',
-    'rib_count', 'rib_thickness', 'fillet_radius', 'hole_diameter'
-]
+GLOBAL_STRESS_SIGMA_KEY = None
+
+# How stress/deflection are computed inside the NSGA-II loop:
+#   surrogate - ML ensembles (default)
+#   physics   - vectorized beam theory, no models needed
+#   hybrid    - beam theory in the loop, ensemble uncertainty on the final front
+EVALUATORS = ('surrogate', 'physics', 'hybrid')
+
+# Which surrogate models the 'surrogate' and 'hybrid' evaluators use:
+#   auto     - joint ensemble if joint_ensemble.pkl exists, else per-target (default)
+#   ensemble - per-target stress and deflection ensembles
+#   joint    - multi-output ensemble (joint_ensemble.pkl)
+#   compact  - log-space ridge surrogate (compact_surrogate.json)
+# A multi-output surrogate that is missing or fails to load falls back to
+# the per-target ensembles with a warning.
+SURROGATES = ('auto', 'ensemble', 'joint', 'compact')
+
+# Largest share of the initial population taken from warm-start designs
+WARM_START_FRACTION = 0.5
+
+# When to stop NSGA-II (n_gen is always the hard generation cap):
+#   n_gen       - run exactly n_gen generations (default)
+#   plateau     - best feasible mass and cost stopped improving
+#   hypervolume - hypervolume of the feasible front stopped growing
+#   igd         - the feasible front stopped moving (IGD to an older front)
+TERMINATIONS = ('n_gen', 'plateau', 'hypervolume', 'igd')
+CONVERGENCE_TOL = 1e-3      # Relative improvement counted as "no progress"
+CONVERGENCE_PERIOD = 10     # Generations the improvement is measured over
 
 
 def predict_with_uncertainty(models, X):
@@ -32,21 +68,29 @@ def predict_with_uncertainty(models, X):
     Get mean prediction and standard deviation from ensemble.
 
     Args:
-        models: List of trained models (ensemble)
-        X: Input features as DataFrame
+        models: List of trained models (ensemble) or an EnsemblePredictor
+        X: Input features as DataFrame (first row is used)
 
     Returns:
         tuple: (mean_prediction, std_prediction)
     """
-    predictions = np.array([model.predict(X)[0] for model in models])
-    return predictions.mean(), predictions.std()
+    predictor = models if isinstance(models, EnsemblePredictor) \
+        else EnsemblePredictor(models)
+    mean, std = predictor.predict(X)
+    return mean[0], std[0]
 
 
-def _get_global_stress_sigma(stress_models):
-    """Estimate global stress residual sigma using training data."""
-    global GLOBAL_STRESS_SIGMA
-    if GLOBAL_STRESS_SIGMA is not None:
+def _get_global_stress_sigma(stress_predictor, cache_key=None):
+    """
+    Estimate global stress residual sigma using training data.
+
+    The value is cached until the stress ensemble identified by cache_key
+    changes (e.g. after a hot reload).
+    """
+    global GLOBAL_STRESS_SIGMA, GLOBAL_STRESS_SIGMA_KEY
+    if GLOBAL_STRESS_SIGMA is not None and GLOBAL_STRESS_SIGMA_KEY == cache_key:
         return GLOBAL_STRESS_SIGMA
+    GLOBAL_STRESS_SIGMA_KEY = cache_key
 
     script_dir = os.path.dirname(os.path.abspath(__file__))
     data_path = os.path.join(script_dir, 'data', 'training_data.csv')
@@ -63,10 +107,7 @@ def _get_global_stress_sigma(stress_models):
         if df.empty:
             raise ValueError('training dataset empty')
 
-        predictions = np.mean(
-            [model.predict(df[FEATURE_COLUMNS]) for model in stress_models],
-            axis=0
-        )
+        predictions, _ = stress_predictor.predict(df[stress_predictor.feature_columns])
         residuals = df['max_stress'].values - predictions
         GLOBAL_STRESS_SIGMA = float(np.std(residuals, ddof=1))
         print(
@@ -89,19 +130,32 @@ class BracketOptimizationProblem(Problem):
     Constraints:
         1. Stress < yield_strength / safety_factor
         2. Deflection < 0.5 mm
-        3. DFM rules must be satisfied
+        3-8. DFM rules must be satisfied (one graded column per rule,
+             see dfm_rules.DFM_VIOLATION_NAMES)
     """
 
-    def __init__(self, load, material_name, stress_models, deflection_models):
+    def __init__(self, load, material_name, stress_models=None,
+                 deflection_models=None, evaluator='surrogate', joint_models=None):
         """
         Initialize optimization problem.
 
         Args:
             load (float): Applied load in Newtons
             material_name (str): Material name
-            stress_models: List of trained surrogate models for stress prediction (ensemble)
-            deflection_models: List of trained surrogate models for deflection prediction (ensemble)
+            stress_models: Stress surrogate ensemble (model list or CompiledEnsemble)
+            deflection_models: Deflection surrogate ensemble (model list or CompiledEnsemble)
+            evaluator (str): 'surrogate', 'physics' or 'hybrid' (see EVALUATORS)
+            joint_models: Multi-output stress + deflection ensemble (model
+                list or CompactSurrogate); used instead of the per-target
+                ensembles when given
         """
+        if evaluator not in EVALUATORS:
+            raise ValueError(
+                f"Unknown evaluator '{evaluator}'. Available: {', '.join(EVALUATORS)}")
+        if evaluator != 'physics' and joint_models is None and \
+                (stress_models is None or deflection_models is None):
+            raise ValueError(f"Evaluator '{evaluator}' needs surrogate ensembles")
+
         # Define parameter bounds
         # [base_length, base_width, base_thickness, rib_count, rib_thickness, fillet_radius, hole_diameter]
         xl = np.array([40.0, 25.0, 2.0, 2, 1.5, 1.0, 3.0])  # Lower bounds
@@ -110,7 +164,7 @@ class BracketOptimizationProblem(Problem):
         super().__init__(
             n_var=7,      # 7 design parameters
             n_obj=2,      # 2 objectives (mass, cost)
-            n_constr=3,   # 3 constraints (stress, deflection, DFM)
+            n_constr=2 + len(DFM_VIOLATION_NAMES),  # stress, deflection, DFM rules
             xl=xl,
             xu=xu
         )
@@ -118,23 +172,51 @@ class BracketOptimizationProblem(Problem):
         self.load = load
         self.material = get_material(material_name)
         self.material_name = material_name
+        self.evaluator = evaluator
         self.stress_models = stress_models  # Ensemble of models
         self.deflection_models = deflection_models  # Ensemble of models
+        self.stress_predictor = None
+        self.deflection_predictor = None
+        self.joint_predictor = None
+        if joint_models is not None:
+            # Per-target views keep sigma estimation and the mentor working
+            self.joint_predictor = joint_models if hasattr(joint_models, 'target') \
+                else JointEnsemblePredictor(joint_models)
+            self.stress_predictor = self.joint_predictor.target('max_stress')
+            self.deflection_predictor = self.joint_predictor.target('max_deflection')
+        elif stress_models is not None and deflection_models is not None:
+            self.stress_predictor = EnsemblePredictor(stress_models)
+            self.deflection_predictor = EnsemblePredictor(deflection_models)
+        if self.stress_predictor is not None and (
+                not self.stress_predictor.conditioned or
+                not self.deflection_predictor.conditioned):
+            print(f"  Note: design-only surrogates, rescaled from "
+                  f"{LEGACY_TRAINING_CONDITIONS['load']} N "
+                  f"{LEGACY_TRAINING_CONDITIONS['material']} (retrain for load inputs)")
 
         # Constraint limits
         # Constraint limits
         self.safety_factor_target = 1.5  # CHANGED from 2.0 (less strict)
         self.max_deflection = 1.0  # CHANGED from 0.5mm (more lenient)
 
+        # Seconds spent inside _evaluate: stress/deflection predictions
+        # (beam theory for the physics evaluator) and mass/cost/DFM scoring
+        self.timings = {'surrogate_s': 0.0, 'cost_dfm_s': 0.0}
+
         # AI Mentor logging
         self.logs = []
         self.current_generation = 0
         self.best_mass_history = []
         self.best_cost_history = []
+        self.feasible_history = []
+        # (best mass, best cost) of feasible designs, only for generations
+        # that had any; drives the 'plateau' termination
+        self.feasible_best_history = []
 
         print(f"Optimization problem initialized:")
         print(f"  Material: {self.material['name']}")
         print(f"  Load: {load} N")
+        print(f"  Evaluator: {evaluator}")
         print(f"  Target Safety Factor: {self.safety_factor_target}")
         print(f"  Max Deflection: {self.max_deflection} mm")
 
@@ -142,80 +224,116 @@ class BracketOptimizationProblem(Problem):
         """
         Evaluate population of designs.
 
+        The whole population is scored at once: one batched surrogate (or
+        beam-theory) pass and NumPy broadcasting for mass, cost and DFM.
+
         Args:
             X: (n_designs, 7) array of parameter values
         """
-        n_designs = X.shape[0]
-
-        # Initialize output arrays
-        f1 = np.zeros(n_designs)  # Objective 1: mass
-        f2 = np.zeros(n_designs)  # Objective 2: cost
-        g1 = np.zeros(n_designs)  # Constraint 1: stress
-        g2 = np.zeros(n_designs)  # Constraint 2: deflection
-        g3 = np.zeros(n_designs)  # Constraint 3: DFM
-
-        for i in range(n_designs):
-            # Extract parameters
-            params = {
-                'base_length': X[i, 0],
-                'base_width': X[i, 1],
-                'base_thickness': X[i, 2],
-                'rib_count': int(round(X[i, 3])),
-                'rib_thickness': X[i, 4],
-                'fillet_radius': X[i, 5],
-                'hole_diameter': X[i, 6]
-            }
-
-            # Predict stress and deflection using ensemble with uncertainty
-            X_pred = pd.DataFrame([params])
-            stress, stress_std = predict_with_uncertainty(
-                self.stress_models, X_pred)
-            deflection, defl_std = predict_with_uncertainty(
-                self.deflection_models, X_pred)
-
-            # Calculate mass
-            base_volume = (params['base_length'] * params['base_width'] *
-                           params['base_thickness']) / 1000  # cm³
-            rib_volume = (params['rib_thickness'] * params['base_width'] * 20 *
-                          params['rib_count']) / 1000  # cm³
-            total_volume = base_volume + rib_volume
-            mass = total_volume * self.material['density']  # grams
-
-            # Calculate cost
-            try:
-                cost_result = calculate_manufacturing_cost(
-                    params, self.material_name, '3d_printing')
-                cost = cost_result['total_cost']
-            except:
-                cost = mass * \
-                    self.material['cost_per_kg'] / 1000 + 10  # Fallback
-
-            # Check DFM rules
-            dfm = check_dfm_rules(params)
-
-            # Set objectives (to minimize)
-            f1[i] = mass
-            f2[i] = cost
-
-            # Set constraints (g <= 0 is feasible)
-            max_stress_allowed = self.material['yield_strength'] / \
-                self.safety_factor_target
-            g1[i] = stress - max_stress_allowed  # Stress constraint
-            g2[i] = deflection - self.max_deflection  # Deflection constraint
-            g3[i] = 0.0 if dfm['is_valid'] else 1.0  # DFM constraint
+        # Rib count is discrete - evaluate the rounded value everywhere
+        X_eval = np.array(X, dtype=float)
+        X_eval[:, 3] = np.round(X_eval[:, 3])
+
+        # Predict stress and deflection for the full population
+        start = time.perf_counter()
+        stress, deflection = self.predict_performance(X_eval)
+        scored = time.perf_counter()
+        self.timings['surrogate_s'] += scored - start
+
+        # Objective 1: mass (grams)
+        (base_length, base_width, base_thickness, rib_count,
+         rib_thickness, _, _) = X_eval.T
+        base_volume = (base_length * base_width * base_thickness) / 1000  # cm³
+        rib_volume = (rib_thickness * base_width * 20 * rib_count) / 1000  # cm³
+        f1 = (base_volume + rib_volume) * self.material['density']
+
+        # Objective 2: cost (₹), rounded like the scalar cost estimator
+        costs = estimate_costs_batch(X_eval, self.material_name, ('3d_printing',))
+        f2 = np.round(costs['total_cost'][0], 2)
+
+        # Constraints (g <= 0 is feasible)
+        max_stress_allowed = self.material['yield_strength'] / \
+            self.safety_factor_target
+        g1 = stress - max_stress_allowed  # Stress constraint
+        g2 = deflection - self.max_deflection  # Deflection constraint
+        # Graded DFM constraints: mm of violation per rule, so constraint
+        # domination can rank infeasible designs by how close they are
+        g_dfm = dfm_violation_magnitudes(X_eval)
+        self.timings['cost_dfm_s'] += time.perf_counter() - scored
 
         out["F"] = np.column_stack([f1, f2])
-        out["G"] = np.column_stack([g1, g2, g3])
+        out["G"] = np.column_stack([g1, g2, g_dfm])
 
         # AI Mentor: Log generation insights
-        self._log_generation_insights(X, f1, f2, g1, g2, g3)
+        self._log_generation_insights(X, f1, f2, g1, g2, g_dfm)
+
+    def predict_performance(self, X_eval):
+        """
+        Stress (MPa) and deflection (mm) for designs with rounded rib counts.
+
+        Uses the ensembles for the 'surrogate' evaluator and beam theory for
+        'physics' and 'hybrid'.
+        """
+        if self.evaluator == 'surrogate':
+            stress, _, deflection, _ = self.predict_surrogates(X_eval)
+            return stress, deflection
+
+        physics = calculate_stress_and_deflection_batch(
+            X_eval, self.load, self.material_name)
+        return physics['max_stress'], physics['max_deflection']
+
+    def predict_surrogates(self, X_eval):
+        """
+        Ensemble stress and deflection at this problem's load and material.
 
-    def _log_generation_insights(self, X, f1, f2, g1, g2, g3):
+        Conditioned surrogates get load, E and yield strength as inputs.
+        Design-only (legacy) surrogates were trained at one load/material,
+        so their outputs are rescaled with the linear beam-theory relations
+        stress ∝ load and deflection ∝ load / E. A joint ensemble predicts
+        both targets with one call per member.
+
+        Returns:
+            tuple: (stress_mean, stress_std, deflection_mean, deflection_std)
+        """
+        legacy = LEGACY_TRAINING_CONDITIONS
+        load_ratio = self.load / legacy['load']
+        stiffness_ratio = get_material(legacy['material'])['youngs_modulus'] / \
+            self.material['youngs_modulus']
+
+        joint = self.joint_predictor
+        if joint is not None:
+            if joint.conditioned:
+                mean, std = joint.predict(
+                    with_conditions(X_eval, self.load, self.material))
+            else:
+                mean, std = joint.predict(X_eval)
+                scale = np.array([load_ratio, load_ratio * stiffness_ratio])
+                mean, std = mean * scale, std * scale
+            stress, deflection = (joint.targets.index(name)
+                                  for name in ('max_stress', 'max_deflection'))
+            return (mean[:, stress], std[:, stress],
+                    mean[:, deflection], std[:, deflection])
+
+        outputs = []
+        for predictor, legacy_scale in (
+                (self.stress_predictor, load_ratio),
+                (self.deflection_predictor, load_ratio * stiffness_ratio)):
+            if predictor.conditioned:
+                mean, std = predictor.predict(
+                    with_conditions(X_eval, self.load, self.material))
+            else:
+                mean, std = predictor.predict(X_eval)
+                mean, std = mean * legacy_scale, std * legacy_scale
+            outputs.extend([mean, std])
+        return tuple(outputs)
+
+    def _log_generation_insights(self, X, f1, f2, g1, g2, g_dfm):
         """Generate AI mentor insights for current generation."""
         self.current_generation += 1
 
         # Calculate feasibility
-        feasible = (g1 <= 0) & (g2 <= 0) & (g3 <= 0)
+        dfm_failed = np.any(g_dfm > 0, axis=1)
+        feasible = (g1 <= 0) & (g2 <= 0) & ~dfm_failed
         frac_feasible = np.mean(feasible) * 100
 
         # Design parameter trends
@@ -233,11 +351,15 @@ class BracketOptimizationProblem(Problem):
         # Track improvements
         self.best_mass_history.append(best_mass)
         self.best_cost_history.append(best_cost)
+        self.feasible_history.append(float(frac_feasible))
+        if np.any(feasible):
+            self.feasible_best_history.append(
+                (np.min(f1[feasible]), np.min(f2[feasible])))
 
         # Constraint violation stats
         stress_violations = np.sum(g1 > 0)
         deflection_violations = np.sum(g2 > 0)
-        dfm_violations = np.sum(g3 > 0)
+        dfm_violations = np.sum(dfm_failed)
 
         # Generate insight message every 5 generations or at key milestones
         if self.current_generation % 5 == 0 or self.current_generation == 1:
@@ -256,7 +378,210 @@ class BracketOptimizationProblem(Problem):
             self.logs.append(message)
 
 
-def run_optimization(load=50.0, material_name='PLA', pop_size=50, n_gen=100):
+class ConvergenceTermination(Termination):
+    """
+    Stops NSGA-II once a convergence metric changes by less than `tol`
+    over the last `period` generations, or at `n_max_gen` at the latest.
+
+    State is read from algorithm.problem (minimize() deep-copies the
+    termination, so it must not hold its own problem reference).
+    """
+
+    def __init__(self, mode, n_max_gen, tol=CONVERGENCE_TOL,
+                 period=CONVERGENCE_PERIOD):
+        super().__init__()
+        if mode not in TERMINATIONS or mode == 'n_gen':
+            raise ValueError(f"Unknown convergence mode '{mode}'")
+        self.mode = mode
+        self.n_max_gen = n_max_gen
+        self.tol = tol
+        self.period = period
+        self.converged = False
+        self._fronts = []
+        self._hv = None
+        self._scale = None
+
+    def _update(self, algorithm):
+        if algorithm.n_gen >= self.n_max_gen:
+            return 1.0
+
+        if self.mode == 'plateau':
+            change = self._plateau_change(algorithm.problem)
+        else:
+            change = self._front_change(algorithm)
+
+        if change is not None and change < self.tol:
+            self.converged = True
+            print(f"  Converged ({self.mode}) at generation {algorithm.n_gen}: "
+                  f"change {change:.2e} over {self.period} generations")
+            return 1.0
+        return algorithm.n_gen / self.n_max_gen
+
+    def _plateau_change(self, problem):
+        """
+        Relative improvement of the running best feasible mass/cost over
+        the period (generations without a feasible design do not count).
+        """
+        history = problem.feasible_best_history
+        if len(history) <= self.period:
+            return None
+        best = np.minimum.accumulate(np.asarray(history, dtype=float), axis=0)
+        then, now = best[-self.period - 1], best[-1]
+        return float(np.max((then - now) / np.maximum(np.abs(then), 1e-12)))
+
+    def _front_change(self, algorithm):
+        """Hypervolume gain or IGD shift of the feasible front over the period."""
+        opt = algorithm.opt
+        feasible = np.all(opt.get('feasible'), axis=1) if opt is not None else []
+        if not np.any(feasible):
+            self._fronts = []
+            return None
+
+        F = opt.get('F')[feasible]
+        self._fronts.append(F)
+        if len(self._fronts) <= self.period:
+            return None
+        then = self._fronts[-self.period - 1]
+        self._fronts = self._fronts[-self.period - 1:]
+
+        if self.mode == 'hypervolume':
+            if self._hv is None:
+                # Reference point fixed from the first front we compare against
+                worst = np.max(then, axis=0)
+                self._hv = HV(ref_point=worst + 0.1 * np.abs(worst) + 1e-9)
+            hv_then, hv_now = self._hv.do(then), self._hv.do(F)
+            return (hv_now - hv_then) / max(hv_now, 1e-12)
+
+        # IGD of the current front to the older one, relative to the
+        # objective magnitudes of the first compared front. A fixed scale
+        # (not the spread of the fronts, which is ~0 for 1-3 point fronts)
+        # keeps tiny shifts tiny.
+        if self._scale is None:
+            self._scale = np.abs(np.max(then, axis=0))
+            self._scale[self._scale == 0] = 1.0
+        return IGD(then / self._scale).do(F / self._scale)
+
+
+def build_termination(termination, n_gen):
+    """
+    pymoo termination for a TERMINATIONS mode.
+
+    Args:
+        termination (str): One of TERMINATIONS
+        n_gen (int): Hard generation cap
+
+    Returns:
+        pymoo Termination
+    """
+    if termination not in TERMINATIONS:
+        raise ValueError(
+            f"Unknown termination '{termination}'. Available: {', '.join(TERMINATIONS)}")
+    if termination == 'n_gen':
+        return get_termination("n_gen", n_gen)
+    return ConvergenceTermination(termination, n_gen)
+
+
+class OptimizationCancelled(Exception):
+    """Raised from a progress callback to stop a running optimization."""
+
+
+class ProgressCallback(Callback):
+    """
+    Reports per-generation progress of a pymoo run to a plain function.
+
+    The function receives a dict with the generation number, evaluations so
+    far, feasibility, best objectives, the current feasible non-dominated
+    set and any mentor messages logged since the previous report. Raising
+    OptimizationCancelled from it aborts the run.
+    """
+
+    def __init__(self, problem, n_gen, report):
+        super().__init__()
+        self.problem = problem
+        self.n_gen = n_gen
+        self.report = report
+        self._n_reported_logs = 0
+
+    def notify(self, algorithm):
+        problem = self.problem
+        mentor_messages = problem.logs[self._n_reported_logs:]
+        self._n_reported_logs = len(problem.logs)
+        self.report({
+            'generation': algorithm.n_gen,
+            'n_gen': self.n_gen,
+            'n_evaluations': algorithm.evaluator.n_eval,
+            'feasible_percent': round(problem.feasible_history[-1], 1),
+            'best_mass': round(float(problem.best_mass_history[-1]), 2),
+            'best_cost': round(float(problem.best_cost_history[-1]), 2),
+            'pareto_front': _snapshot_front(algorithm),
+            'mentor_messages': list(mentor_messages)
+        })
+
+
+def _snapshot_front(algorithm):
+    """Feasible non-dominated designs of the current generation."""
+    opt = algorithm.opt
+    if opt is None or len(opt) == 0:
+        return []
+
+    front = []
+    for X, F, feasible in zip(opt.get('X'), opt.get('F'), opt.get('feasible')):
+        if not np.all(feasible):
+            continue
+        front.append({
+            'mass': round(float(F[0]), 2),
+            'cost': round(float(F[1]), 2),
+            'parameters': {
+                col: (int(round(value)) if col == 'rib_count' else round(float(value), 2))
+                for col, value in zip(DESIGN_FEATURES, X)
+            }
+        })
+    return sorted(front, key=lambda design: design['mass'])
+
+
+def _initial_population(problem, pop_size, initial_designs, seed=42):
+    """
+    Warm-start population: known-good designs plus uniform random fill.
+
+    Seeds are clipped to the bounds (rib_count rounded) and capped at
+    WARM_START_FRACTION of the population so the run keeps exploring.
+    """
+    seeds = np.atleast_2d(np.asarray(initial_designs, dtype=float))
+    seeds = np.clip(seeds, problem.xl, problem.xu)
+    seeds[:, 3] = np.round(seeds[:, 3])
+    seeds = np.unique(seeds, axis=0)
+
+    n_seeds = min(len(seeds), int(pop_size * WARM_START_FRACTION))
+    if n_seeds < len(seeds):
+        seeds = seeds[np.linspace(0, len(seeds) - 1, n_seeds).round().astype(int)]
+
+    rng = np.random.default_rng(seed)
+    fill = problem.xl + rng.random((pop_size - n_seeds, problem.n_var)) * \
+        (problem.xu - problem.xl)
+    return np.vstack([seeds, fill]), n_seeds
+
+
+def _select_joint_surrogate(registry, surrogate):
+    """
+    Registry name of the multi-output surrogate to use, if any.
+
+    Returns:
+        str: 'joint' or 'compact', or None for the per-target ensembles
+    """
+    if surrogate == 'ensemble':
+        return None
+    if surrogate == 'auto':
+        return 'joint' if registry.available('joint') else None
+    if not registry.available(surrogate):
+        print(f"[Optimizer] Warning: {surrogate} surrogate not found, "
+              f"using the per-target ensembles")
+        return None
+    return surrogate
+
+
+def run_optimization(load=50.0, material_name='PLA', pop_size=50, n_gen=100,
+                     evaluator='surrogate', progress_callback=None,
+                     initial_designs=None, termination='n_gen', surrogate='auto'):
     """
     Run multi-objective optimization.
 
@@ -264,63 +589,95 @@ def run_optimization(load=50.0, material_name='PLA', pop_size=50, n_gen=100):
         load (float): Applied load in N
         material_name (str): Material name
         pop_size (int): Population size
-        n_gen (int): Number of generations
+        n_gen (int): Number of generations (hard cap for convergence modes)
+        evaluator (str): 'surrogate', 'physics' or 'hybrid' (see EVALUATORS)
+        progress_callback (callable): Optional function called with a progress
+            dict after every generation (see ProgressCallback); it may raise
+            OptimizationCancelled to stop the run
+        initial_designs: Optional (K, 7) designs (e.g. Pareto sets of cached
+            runs at nearby loads) used to warm-start the initial population
+        termination (str): 'n_gen', 'plateau', 'hypervolume' or 'igd'
+            (see TERMINATIONS); convergence modes stop before n_gen once
+            the front stops improving
+        surrogate (str): 'auto', 'ensemble', 'joint' or 'compact' (see
+            SURROGATES); ignored by the physics evaluator
 
     Returns:
-        dict: Optimization results with Pareto front
+        dict: Optimization results with Pareto front and per-phase
+            'timings' in seconds (see scripts/benchmark_optimizer.py)
     """
     print("=" * 70)
     print("RUNNING MULTI-OBJECTIVE OPTIMIZATION")
     print("=" * 70)
 
-    # Load surrogate ensemble models
-    print("\nLoading surrogate ensemble models...")
-
-    # Get the directory of this script
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    stress_model_path = os.path.join(script_dir, 'data', 'stress_ensemble.pkl')
-    deflection_model_path = os.path.join(
-        script_dir, 'data', 'deflection_ensemble.pkl')
-
-    print(f"Looking for models at:")
-    print(f"  Stress: {stress_model_path}")
-    print(f"  Deflection: {deflection_model_path}")
-    print(f"  Stress exists: {os.path.exists(stress_model_path)}")
-    print(f"  Deflection exists: {os.path.exists(deflection_model_path)}")
-
-    if not os.path.exists(stress_model_path):
-        raise FileNotFoundError(
-            f"Stress model not found at {stress_model_path}")
-    if not os.path.exists(deflection_model_path):
-        raise FileNotFoundError(
-            f"Deflection model not found at {deflection_model_path}")
-
-    stress_models = joblib.load(stress_model_path)
-    deflection_models = joblib.load(deflection_model_path)
-
-    if stress_models is None or deflection_models is None:
+    run_start = time.perf_counter()
+    if evaluator not in EVALUATORS:
         raise ValueError(
-            "Models loaded as None - model files may be corrupted")
-    if len(stress_models) == 0 or len(deflection_models) == 0:
-        raise ValueError("Models loaded but are empty")
-
-    print(
-        f"✅ Loaded {len(stress_models)} stress models and {len(deflection_models)} deflection models")    # Define problem
+            f"Unknown evaluator '{evaluator}'. Available: {', '.join(EVALUATORS)}")
+    if surrogate not in SURROGATES:
+        raise ValueError(
+            f"Unknown surrogate '{surrogate}'. Available: {', '.join(SURROGATES)}")
+    termination_criterion = build_termination(termination, n_gen)
+
+    stress_ensemble = deflection_ensemble = joint_ensemble = None
+    global_sigma = None
+    surrogate_used = None
+
+    if evaluator != 'physics':
+        # Surrogate ensembles come from the process-wide registry (loaded once)
+        registry = get_model_registry()
+        joint_name = _select_joint_surrogate(registry, surrogate)
+        if joint_name is not None:
+            try:
+                sigma_entry = registry.get(joint_name)
+            except Exception as exc:
+                print(f"[Optimizer] Warning: {joint_name} surrogate failed to load "
+                      f"({exc}), using the per-target ensembles")
+                joint_name = None
+
+        if joint_name is not None:
+            # One multi-output pass replaces the two per-target ensembles
+            joint_ensemble = sigma_entry.ensemble
+            surrogate_used = joint_name
+            print(f"\n✅ Using {joint_name} surrogate "
+                  f"({len(joint_ensemble)} joint stress/deflection models)")
+        else:
+            sigma_entry = registry.get('stress')
+            stress_ensemble = sigma_entry.ensemble
+            deflection_ensemble = registry.get('deflection').ensemble
+            surrogate_used = 'ensemble'
+            print(
+                f"\n✅ Using {len(stress_ensemble)} stress models and "
+                f"{len(deflection_ensemble)} deflection models")
+
+    # Define problem
     problem = BracketOptimizationProblem(
-        load, material_name, stress_models, deflection_models)
+        load, material_name, stress_ensemble, deflection_ensemble,
+        evaluator=evaluator, joint_models=joint_ensemble)
 
-    global_sigma = _get_global_stress_sigma(stress_models)
+    if problem.stress_predictor is not None:
+        global_sigma = _get_global_stress_sigma(
+            problem.stress_predictor, cache_key=sigma_entry.key)
     stress_ci95_placeholder = 1.96 * global_sigma if global_sigma is not None else None
+    model_load_s = time.perf_counter() - run_start
 
     # Configure NSGA-II algorithm
     print(f"\nConfiguring NSGA-II:")
     print(f"  Population size: {pop_size}")
-    print(f"  Generations: {n_gen}")
+    print(f"  Generations: {n_gen}" +
+          (f" (max, stop on {termination} convergence)" if termination != 'n_gen' else ''))
     print(f"  Expected evaluations: {pop_size * n_gen}")
 
+    sampling = FloatRandomSampling()
+    n_seeded = 0
+    if initial_designs is not None and len(initial_designs) > 0:
+        sampling, n_seeded = _initial_population(problem, pop_size, initial_designs)
+        print(f"  Warm start: {n_seeded} seeded designs + "
+              f"{pop_size - n_seeded} random")
+
     algorithm = NSGA2(
         pop_size=pop_size,
-        sampling=FloatRandomSampling(),  # CHANGED THIS LINE
+        sampling=sampling,
         crossover=SBX(prob=0.9, eta=15),
         mutation=PM(eta=20),
         eliminate_duplicates=True
@@ -330,15 +687,21 @@ def run_optimization(load=50.0, material_name='PLA', pop_size=50, n_gen=100):
     print("\n🚀 Starting optimization...")
     print("This will take 30-60 seconds...\n")
 
-    termination = get_termination("n_gen", n_gen)
+    minimize_kwargs = {}
+    if progress_callback is not None:
+        minimize_kwargs['callback'] = ProgressCallback(
+            problem, n_gen, progress_callback)
 
+    loop_start = time.perf_counter()
     result = minimize(
         problem,
         algorithm,
-        termination,
+        termination_criterion,
         seed=42,
-        verbose=True  # Show progress
+        verbose=True,  # Show progress
+        **minimize_kwargs
     )
+    loop_end = time.perf_counter()
 
     if result is None:
         raise RuntimeError(
@@ -371,33 +734,53 @@ def run_optimization(load=50.0, material_name='PLA', pop_size=50, n_gen=100):
 
     print(f"\n✅ Found {n_solutions} Pareto-optimal designs")
 
+    # pymoo increments n_gen after the last generation's _post_advance
+    n_gen_run = result.algorithm.n_gen - 1
+    converged = bool(getattr(result.algorithm.termination, 'converged', False))
+    print(f"  Generations run: {n_gen_run} of {n_gen}")
+
     # Package results
+    X_pareto = np.round(np.asarray(result.X, dtype=float), 2)
+    X_pareto[:, 3] = np.round(result.X[:, 3])
+
+    # Performance of the whole Pareto set in one pass. The hybrid evaluator
+    # reports beam-theory values with ensemble uncertainty attached.
+    stress_means, defl_means = problem.predict_performance(X_pareto)
+    if problem.stress_predictor is not None:
+        _, stress_stds, _, defl_stds = problem.predict_surrogates(X_pareto)
+    else:
+        stress_stds = np.zeros(n_solutions)
+        defl_stds = np.zeros(n_solutions)
+
+    # Cost of every Pareto design under every manufacturing method
+    method_costs = estimate_costs_batch(
+        X_pareto, problem.material_name, MANUFACTURING_METHODS)
+    print_row = MANUFACTURING_METHODS.index('3d_printing')
+
+    # DFM bitmasks and print readiness for the whole set (no message strings)
+    dfm_violations, dfm_warnings = evaluate_dfm_rules(X_pareto)
+    readiness_scores = calculate_print_readiness_score_batch(
+        dfm_violations, dfm_warnings,
+        np.round(method_costs['manufacturing_time_hours'][print_row], 2))
+
     pareto_solutions = []
     for i in range(n_solutions):
         params = {
-            'base_length': round(result.X[i, 0], 2),
-            'base_width': round(result.X[i, 1], 2),
-            'base_thickness': round(result.X[i, 2], 2),
-            'rib_count': int(round(result.X[i, 3])),
-            'rib_thickness': round(result.X[i, 4], 2),
-            'fillet_radius': round(result.X[i, 5], 2),
-            'hole_diameter': round(result.X[i, 6], 2)
+            'base_length': X_pareto[i, 0],
+            'base_width': X_pareto[i, 1],
+            'base_thickness': X_pareto[i, 2],
+            'rib_count': int(X_pareto[i, 3]),
+            'rib_thickness': X_pareto[i, 4],
+            'fillet_radius': X_pareto[i, 5],
+            'hole_diameter': X_pareto[i, 6]
         }
 
-        # Calculate uncertainty estimates for this design
-        X_pred = pd.DataFrame([params])
-        stress_mean, stress_std = predict_with_uncertainty(
-            problem.stress_models, X_pred)
-        defl_mean, defl_std = predict_with_uncertainty(
-            problem.deflection_models, X_pred)
-
-        # Calculate DFM and print readiness score
-        dfm_result = check_dfm_rules(params)
-        cost_result = calculate_manufacturing_cost(
-            params, problem.material_name, '3d_printing')
-        print_time = cost_result.get('print_time_hours', 1.0)
-        readiness_score = calculate_print_readiness_score(
-            params, dfm_result, print_time)
+        stress_mean, stress_std = stress_means[i], stress_stds[i]
+        defl_mean, defl_std = defl_means[i], defl_stds[i]
+
+        print_time = round(
+            float(method_costs['manufacturing_time_hours'][print_row, i]), 2)
+        readiness_score = int(readiness_scores[i])
 
         # Calculate sustainability metrics
         mass_kg = result.F[i, 0] / 1000.0  # Convert grams to kg
@@ -427,7 +810,11 @@ def run_optimization(load=50.0, material_name='PLA', pop_size=50, n_gen=100):
             'print_score': readiness_score,
             'print_time_hours': round(print_time, 2),
             'co2_kg': round(co2_kg, 4),
-            'efficiency_index': round(efficiency_index, 2)
+            'efficiency_index': round(efficiency_index, 2),
+            'cost_comparison': {
+                method: round(float(method_costs['total_cost'][m, i]), 2)
+                for m, method in enumerate(MANUFACTURING_METHODS)
+            }
         }
 
         if stress_ci95_placeholder is not None:
@@ -453,33 +840,169 @@ def run_optimization(load=50.0, material_name='PLA', pop_size=50, n_gen=100):
 
     # Generate AI Mentor Summary
     mentor_summary = _generate_mentor_summary(
-        problem, pareto_solutions, pop_size, n_gen)
+        problem, pareto_solutions, pop_size, n_gen_run)
+
+    run_end = time.perf_counter()
+    timings = {
+        'model_load_s': model_load_s,
+        'nsga_loop_s': loop_end - loop_start,
+        **problem.timings,
+        'postprocess_s': run_end - loop_end,
+        'total_s': run_end - run_start
+    }
 
     return {
         'pareto_front': pareto_solutions,
-        'n_generations': n_gen,
-        'n_evaluations': pop_size * n_gen,
+        'n_generations': n_gen_run,
+        'n_generations_requested': n_gen,
+        'n_evaluations': int(result.algorithm.evaluator.n_eval),
+        'termination': termination,
+        'converged': converged,
         'mentor_log': problem.logs,
         'mentor_summary': mentor_summary,
-        'stress_sigma': round(global_sigma, 4) if global_sigma is not None else None
+        'evaluator': evaluator,
+        'surrogate': surrogate_used,
+        'warm_start_designs': n_seeded,
+        'stress_sigma': round(global_sigma, 4) if global_sigma is not None else None,
+        'timings': {phase: round(seconds, 4) for phase, seconds in timings.items()}
+    }
+
+
+def _nondominated_mask(F):
+    """Boolean mask of the non-dominated rows of an (N, n_obj) minimization matrix."""
+    F = np.asarray(F, dtype=float)
+    no_worse = np.all(F[:, None, :] >= F[None, :, :], axis=2)
+    strictly_worse = np.any(F[:, None, :] > F[None, :, :], axis=2)
+    return ~np.any(no_worse & strictly_worse, axis=1)
+
+
+def run_multi_material_optimization(load=50.0, material_names=('PLA',), pop_size=50,
+                                    n_gen=100, evaluator='surrogate',
+                                    termination='n_gen', initial_designs=None,
+                                    max_workers=None, surrogate='auto'):
+    """
+    Optimize several materials in parallel and merge their Pareto fronts.
+
+    Each material is an independent NSGA-II run on a process pool. The
+    surrogate registry is loaded before the pool starts, so forked workers
+    inherit the ensembles (and memory-mapped artifacts share pages).
+
+    Args:
+        load (float): Applied load in N
+        material_names (list): Materials to compare
+        pop_size (int): Population size per material
+        n_gen (int): Generations per material
+        evaluator (str): See EVALUATORS
+        termination (str): See TERMINATIONS
+        initial_designs (dict): Optional material -> warm-start designs
+        max_workers (int): Pool size (default: one process per material,
+            capped at the CPU count)
+        surrogate (str): See SURROGATES
+
+    Returns:
+        dict: Global material-tagged Pareto front plus per-material summaries
+    """
+    material_names = list(dict.fromkeys(material_names))
+    if not material_names:
+        raise ValueError("At least one material is required")
+    initial_designs = initial_designs or {}
+
+    if evaluator != 'physics':
+        get_model_registry().preload()
+
+    n_workers = min(len(material_names), max_workers or os.cpu_count() or 1)
+    print(f"[Optimizer] Multi-material run: {', '.join(material_names)} "
+          f"on {n_workers} processes")
+
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        futures = {
+            name: pool.submit(
+                run_optimization, load=load, material_name=name,
+                pop_size=pop_size, n_gen=n_gen, evaluator=evaluator,
+                initial_designs=initial_designs.get(name), termination=termination,
+                surrogate=surrogate)
+            for name in material_names
+        }
+        per_material = {name: future.result() for name, future in futures.items()}
+
+    # Merge all fronts and keep the designs no other material beats
+    candidates = []
+    for name, results in per_material.items():
+        for design in results['pareto_front']:
+            candidates.append({**design, 'material': name})
+    F = np.array([[design['mass'], design['cost']] for design in candidates])
+    global_front = [design for design, keep in zip(candidates, _nondominated_mask(F)) if keep]
+    global_front.sort(key=lambda design: design['mass'])
+    for i, design in enumerate(global_front):
+        design['id'] = i
+
+    materials_summary = {}
+    for name, results in per_material.items():
+        front = results['pareto_front']
+        materials_summary[name] = {
+            'n_pareto': len(front),
+            'n_global_pareto': sum(1 for design in global_front if design['material'] == name),
+            'best_mass': front[0]['mass'],
+            'best_cost': min(design['cost'] for design in front),
+            'n_generations': results['n_generations'],
+            'converged': results.get('converged', False),
+            'mentor_summary': results['mentor_summary']
+        }
+
+    summary_lines = [
+        f"✓ {name}: {info['n_global_pareto']} of {info['n_pareto']} designs on the "
+        f"global front (lightest {info['best_mass']:.1f}g, cheapest ₹{info['best_cost']:.2f})"
+        for name, info in materials_summary.items()
+    ]
+    mentor_summary = (
+        f"🎓 AI Mentor Insights:\n\nCompared {len(material_names)} materials at {load}N. "
+        f"The merged front has {len(global_front)} designs.\n\n" + "\n".join(summary_lines))
+
+    return {
+        'pareto_front': global_front,
+        'materials': materials_summary,
+        'n_generations': max(r['n_generations'] for r in per_material.values()),
+        'n_generations_requested': n_gen,
+        'n_evaluations': sum(r['n_evaluations'] for r in per_material.values()),
+        'termination': termination,
+        'converged': all(r.get('converged', False) for r in per_material.values()),
+        'mentor_log': [f"[{name}] {message}" for name, r in per_material.items()
+                       for message in r['mentor_log']],
+        'mentor_summary': mentor_summary,
+        'evaluator': evaluator,
+        'surrogate': next(iter(per_material.values()))['surrogate']
     }
 
 
 def _generate_mentor_summary(problem, pareto_solutions, pop_size, n_gen):
     """Generate comprehensive AI mentor summary."""
 
-    # Get feature importance from stress models (average across ensemble)
-    avg_importance = np.mean(
-        [model.feature_importances_ for model in problem.stress_models], axis=0)
-    feature_names = ['Length', 'Width', 'Thickness',
-                     'Ribs', 'Rib Thick', 'Fillet', 'Hole']
-
-    # Find most important features
-    sorted_idx = np.argsort(avg_importance)[::-1]
-    top_feature = feature_names[sorted_idx[0]]
-    top_importance = avg_importance[sorted_idx[0]] * 100
-    second_feature = feature_names[sorted_idx[1]]
-    second_importance = avg_importance[sorted_idx[1]] * 100
+    if problem.stress_predictor is not None:
+        # Get feature importance from stress models (average across ensemble)
+        avg_importance = problem.stress_predictor.feature_importances_
+        feature_labels = {
+            'base_length': 'Length', 'base_width': 'Width',
+            'base_thickness': 'Thickness', 'rib_count': 'Ribs',
+            'rib_thickness': 'Rib Thick', 'fillet_radius': 'Fillet',
+            'hole_diameter': 'Hole', 'load': 'Load',
+            'youngs_modulus': 'Stiffness (E)', 'yield_strength': 'Yield strength'
+        }
+        feature_names = [feature_labels.get(col, col)
+                         for col in problem.stress_predictor.feature_columns]
+
+        # Find most important features
+        sorted_idx = np.argsort(avg_importance)[::-1]
+        top_feature = feature_names[sorted_idx[0]]
+        top_importance = avg_importance[sorted_idx[0]] * 100
+        second_feature = feature_names[sorted_idx[1]]
+        second_importance = avg_importance[sorted_idx[1]] * 100
+        model_findings = (
+            f"✓ {top_feature} is the dominant factor ({top_importance:.0f}% importance) for stress prediction\n"
+            f"✓ {second_feature} contributes {second_importance:.0f}% to structural performance  ")
+    else:
+        model_findings = (
+            "✓ Stress and deflection evaluated exactly with Euler-Bernoulli beam theory\n"
+            "✓ Thickness dominates stiffness (I ∝ h³), length drives deflection (δ ∝ L³)")
 
     # Calculate statistics
     total_designs = pop_size * n_gen
@@ -494,8 +1017,7 @@ I evaluated {total_designs:,} design candidates across {n_gen} generations.
 Found {n_pareto} Pareto-optimal solutions balancing mass vs. cost.
 
 KEY FINDINGS:
-✓ {top_feature} is the dominant factor ({top_importance:.0f}% importance) for stress prediction
-✓ {second_feature} contributes {second_importance:.0f}% to structural performance  
+{model_findings}
 ✓ Mass range: {pareto_solutions[0]['mass']:.1f}g to {pareto_solutions[-1]['mass']:.1f}g (Δ{mass_range:.1f}g)
 ✓ Cost range: ₹{pareto_solutions[0]['cost']:.2f} to ₹{pareto_solutions[-1]['cost']:.2f} (Δ₹{cost_range:.2f})
 
@@ -517,8 +1039,6 @@ All optimal designs meet manufacturing constraints (DFM) and safety requirements
 
 # Test function
 if __name__ == '__main__':
-    import time
-
     start_time = time.time()
 
     # Run optimization
@@ -5,7 +5,138 @@ This is the "fast evaluator" that replaces expensive FEA during optimization.
 """
 
 import numpy as np
-from material_library import get_material
+from material_library import get_material_store
+
+
+# Column order of an (N, 7) design matrix
+DESIGN_COLUMNS = [
+    'base_length', 'base_width', 'base_thickness',
+    'rib_count', 'rib_thickness', 'fillet_radius', 'hole_diameter'
+]
+
+
+def as_design_matrix(designs):
+    """
+    Convert designs to an (N, 7) float matrix in DESIGN_COLUMNS order.
+
+    Args:
+        designs: (N, 7) array, structured array / DataFrame with the
+            DESIGN_COLUMNS fields, or a single params dict
+
+    Returns:
+        ndarray: (N, 7) float64 matrix
+    """
+    if isinstance(designs, dict):
+        return np.array([[designs[col] for col in DESIGN_COLUMNS]], dtype=float)
+
+    names = getattr(getattr(designs, 'dtype', None), 'names', None)
+    if names is None and hasattr(designs, 'columns'):
+        names = list(designs.columns)
+    if names:
+        return np.column_stack(
+            [np.asarray(designs[col], dtype=float) for col in DESIGN_COLUMNS])
+
+    return np.atleast_2d(np.asarray(designs, dtype=float))
+
+
+def material_property_arrays(material, fields, n_designs):
+    """
+    Resolve material properties to per-design arrays.
+
+    Args:
+        material: Material name, sequence of N names, or a structured
+            array of material rows (e.g. from get_material_table())
+        fields (list): Property names to extract
+        n_designs (int): Number of designs
+
+    Returns:
+        list: One (n_designs,) or broadcastable array per field
+    """
+    if getattr(getattr(material, 'dtype', None), 'names', None):
+        return [np.asarray(material[field], dtype=float) for field in fields]
+
+    store = get_material_store()
+    if isinstance(material, str):
+        row = store.table[store.index(material)]
+        return [np.full(n_designs, row[field]) for field in fields]
+
+    rows = store.table[[store.index(name) for name in material]]
+    return [rows[field] for field in fields]
+
+
+def calculate_stress_and_deflection_batch(designs, load_magnitude, material):
+    """
+    Vectorized beam-theory evaluation of many designs at once.
+
+    Same model as calculate_stress_and_deflection() without rounding.
+    rib_count is used as given, so round it beforehand if needed.
+
+    Args:
+        designs: (N, 7) matrix or structured array of design parameters
+        load_magnitude: Applied force in N (scalar or (N,) array)
+        material: Material name, (N,) names, or structured material rows
+
+    Returns:
+        dict: 'max_stress' (MPa), 'max_deflection' (mm) and
+              'safety_factor' arrays of length N
+    """
+    X = as_design_matrix(designs)
+    (base_length, base_width, base_thickness, rib_count,
+     _, fillet_radius, hole_diameter) = X.T
+    youngs_modulus, yield_strength = material_property_arrays(
+        material, ['youngs_modulus', 'yield_strength'], len(X))
+
+    E = youngs_modulus * 1e9  # Pa
+    L = base_length / 1000  # m
+    b = base_width / 1000   # m
+    h = base_thickness / 1000  # m
+    load_magnitude = np.asarray(load_magnitude, dtype=float)
+
+    # Second moment of area with rib reinforcement
+    I_effective = (b * h**3) / 12 * (1 + 0.15 * rib_count)
+
+    # Bending stress at the fixed end, σ = M c / I
+    M = load_magnitude * L
+    stress_mpa = (M * (h / 2)) / I_effective / 1e6
+
+    # Fillet and hole stress concentration
+    stress_mpa = stress_mpa * (1.5 / (1 + fillet_radius / base_thickness))
+    stress_mpa = stress_mpa * np.where(hole_diameter > 5.0, 1.2, 1.0)
+
+    # Tip deflection, δ = F L³ / (3 E I)
+    deflection_mm = (load_magnitude * L**3) / (3 * E * I_effective) * 1000
+
+    return {
+        'max_stress': stress_mpa,
+        'max_deflection': deflection_mm,
+        'safety_factor': yield_strength / stress_mpa
+    }
+
+
+def calculate_mass_batch(designs, material):
+    """
+    Vectorized mass of many designs (base + ribs - hole), unrounded.
+
+    Args:
+        designs: (N, 7) matrix or structured array of design parameters
+        material: Material name, (N,) names, or structured material rows
+
+    Returns:
+        ndarray: Mass in grams per design
+    """
+    X = as_design_matrix(designs)
+    (base_length, base_width, base_thickness, rib_count,
+     rib_thickness, _, hole_diameter) = X.T
+    density, = material_property_arrays(material, ['density'], len(X))
+
+    rib_height = 20  # mm (fixed vertical height)
+    total_volume = (
+        base_length * base_width * base_thickness
+        + rib_thickness * base_width * rib_height * rib_count
+        - np.pi * (hole_diameter / 2)**2 * base_thickness
+    ) / 1000  # mm³ to cm³
+
+    return total_volume * density
 
 
 def calculate_stress_and_deflection(params, load_magnitude, material_name):
@@ -35,59 +166,13 @@ def calculate_stress_and_deflection(params, load_magnitude, material_name):
             'safety_factor': Safety factor against yield
         }
     """
-    # Get material properties
-    material = get_material(material_name)
-    E = material['youngs_modulus'] * 1e9  # Convert GPa to Pa
-    yield_strength = material['yield_strength']  # MPa
-
-    # Extract geometry (convert mm to meters for calculation)
-    L = params['base_length'] / 1000  # m
-    b = params['base_width'] / 1000   # m
-    h = params['base_thickness'] / 1000  # m
-
-    # Calculate second moment of area (rectangular cross-section)
-    # I = (b * h³) / 12
-    I = (b * h**3) / 12  # m^4
-
-    # Apply rib reinforcement factor
-    # Each rib adds stiffness (empirical approximation)
-    rib_reinforcement = 1 + (0.15 * params['rib_count'])
-    I_effective = I * rib_reinforcement
-
-    # Calculate bending moment at fixed end
-    # M = F * L (for cantilever beam with point load at free end)
-    M = load_magnitude * L  # N·m
-
-    # Calculate maximum stress
-    # σ = (M * c) / I, where c = distance to neutral axis = h/2
-    c = h / 2  # m
-    stress = (M * c) / I_effective  # Pa
-    stress_mpa = stress / 1e6  # Convert to MPa
-
-    # Apply stress concentration factor for fillets
-    # Smaller fillet radius = higher stress concentration
-    # Using simplified approximation: Kt = 1.5 / (1 + r/h)
-    fillet_factor = 1.5 / \
-        (1 + (params['fillet_radius'] / params['base_thickness']))
-    stress_mpa *= fillet_factor
-
-    # Adjust for hole (stress concentration around hole)
-    # Rough approximation: 20% stress increase if hole > 5mm
-    if params['hole_diameter'] > 5.0:
-        stress_mpa *= 1.2
-
-    # Calculate maximum deflection
-    # δ = (F * L³) / (3 * E * I)
-    deflection = (load_magnitude * L**3) / (3 * E * I_effective)  # m
-    deflection_mm = deflection * 1000  # Convert to mm
-
-    # Calculate safety factor
-    safety_factor = yield_strength / stress_mpa
+    result = calculate_stress_and_deflection_batch(
+        params, load_magnitude, material_name)
 
     return {
-        'max_stress': round(stress_mpa, 2),
-        'max_deflection': round(deflection_mm, 3),
-        'safety_factor': round(safety_factor, 2)
+        'max_stress': round(float(result['max_stress'][0]), 2),
+        'max_deflection': round(float(result['max_deflection'][0]), 3),
+        'safety_factor': round(float(result['safety_factor'][0]), 2)
     }
 
 
@@ -102,31 +187,7 @@ def calculate_mass(params, material_name):
     Returns:
         float: Mass in grams
     """
-    material = get_material(material_name)
-    density = material['density']  # g/cm³
-
-    # Calculate volume (simplified as base + ribs)
-    base_volume = (params['base_length'] * params['base_width'] *
-                   params['base_thickness'])  # mm³
-
-    # Volume of ribs (approximated as rectangular plates)
-    rib_height = 20  # mm (fixed vertical height)
-    rib_volume_each = (params['rib_thickness'] *
-                       params['base_width'] * rib_height)
-    total_rib_volume = rib_volume_each * params['rib_count']
-
-    # Subtract hole volume
-    hole_volume = np.pi * \
-        (params['hole_diameter'] / 2)**2 * params['base_thickness']
-
-    # Total volume in cm³
-    total_volume = (base_volume + total_rib_volume -
-                    hole_volume) / 1000  # mm³ to cm³
-
-    # Mass = volume × density
-    mass = total_volume * density  # grams
-
-    return round(mass, 2)
+    return round(float(calculate_mass_batch(params, material_name)[0]), 2)
 
 
 # Test function
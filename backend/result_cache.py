@@ -0,0 +1,73 @@
+"""
+Optimization Result Cache
+Request hashing and the on-disk JSON format shared by the API, the
+load-sweep runner and the CLI scripts.
+"""
+
+import hashlib
+import json
+import os
+import time
+
+
+def compute_request_hash(load, material, pop_size, n_gen, evaluator='surrogate',
+                         termination='n_gen', surrogate='auto'):
+    """Create stable hash for optimization inputs."""
+    payload = {
+        'load': round(load, 4),
+        'material': material,
+        'pop_size': pop_size,
+        'n_gen': n_gen
+    }
+    # Only non-default options change the key, so existing caches stay valid
+    if evaluator != 'surrogate':
+        payload['evaluator'] = evaluator
+    if termination != 'n_gen':
+        payload['termination'] = termination
+    if surrogate != 'auto':
+        payload['surrogate'] = surrogate
+    hash_input = json.dumps(payload, sort_keys=True).encode('utf-8')
+    return hashlib.sha1(hash_input).hexdigest()
+
+
+def cache_path_for(cache_dir, cache_key):
+    return os.path.join(str(cache_dir), f"{cache_key}.json")
+
+
+def load_cached_results(cache_path):
+    """Load cached optimization results from disk if available."""
+    try:
+        with open(cache_path, 'r') as f:
+            cached_payload = json.load(f)
+        return cached_payload.get('results') or cached_payload
+    except Exception as exc:
+        print(f"[Cache] Warning: failed to load cache {cache_path}: {exc}")
+        return None
+
+
+def store_cached_results(cache_dir, cache_key, inputs, results):
+    """
+    Write results to the disk cache.
+
+    Write-then-rename, so readers waiting on this key never see a partial file.
+
+    Args:
+        cache_dir (str or Path): Disk cache directory
+        cache_key (str): compute_request_hash() of the inputs
+        inputs (dict): Request inputs (load, material, pop_size, n_gen, ...)
+        results (dict): Optimization results
+
+    Returns:
+        str: Cache file path
+    """
+    cache_path = cache_path_for(cache_dir, cache_key)
+    cache_payload = {
+        'inputs': inputs,
+        'results': results,
+        'cached_at': time.time()
+    }
+    tmp_path = os.path.join(str(cache_dir), f".{cache_key}.{os.getpid()}.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(cache_payload, f, indent=2)
+    os.replace(tmp_path, cache_path)
+    return cache_path
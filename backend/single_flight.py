@@ -0,0 +1,183 @@
+"""
+Single-Flight Request Coalescing
+Makes sure identical optimization requests run once. Concurrent callers in
+the same process wait on the first caller's future; callers in other
+gunicorn workers see a <key>.lock file in the cache directory and wait for
+it to disappear, then read the result the holder left in the disk cache.
+"""
+
+import os
+import socket
+import threading
+import time
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """
+    In-flight registry keyed on the request hash.
+
+    A lock file holds "<hostname> <pid> <timestamp>". It is considered stale
+    (and broken) when its holder process is gone on this host, or when it
+    is older than stale_seconds, so a crashed worker cannot wedge a key.
+    """
+
+    def __init__(self, lock_dir, stale_seconds=3600.0, poll_interval=0.5):
+        """
+        Args:
+            lock_dir (str or Path): Directory for lock files (the disk cache)
+            stale_seconds (float): Age after which any lock is broken
+            poll_interval (float): Seconds between lock-file checks
+        """
+        self.lock_dir = str(lock_dir)
+        self.stale_seconds = stale_seconds
+        self.poll_interval = poll_interval
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._hostname = socket.gethostname()
+
+    def do(self, key, compute, lookup, timeout=None):
+        """
+        Run compute() once for a key, sharing the result with duplicates.
+
+        Args:
+            key (str): Request hash
+            compute (callable): Produces the result; must also store it where
+                lookup() can find it (e.g. write the disk cache)
+            lookup (callable): Returns the stored result or None
+            timeout (float): Maximum seconds to wait on another worker
+
+        Returns:
+            tuple: (result, shared) - shared is True when the result was
+                   produced by another request
+        """
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+
+        if not leader:
+            print(f"[SingleFlight] Coalesced in-process request: {key}")
+            return future.result(timeout=timeout), True
+
+        try:
+            result, shared = self._lead(key, compute, lookup, timeout)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result, shared
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def acquire(self, key):
+        """
+        Try to take the cross-process lock for a key without waiting.
+
+        Returns:
+            bool: True if this process now holds the lock
+        """
+        path = self._lock_path(key)
+        for _ in range(2):
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if not self._break_if_stale(path):
+                    return False
+                continue
+            with os.fdopen(fd, 'w') as f:
+                f.write(f"{self._hostname} {os.getpid()} {time.time()}")
+            return True
+        return False
+
+    def release(self, key):
+        """Drop the cross-process lock for a key (no-op if not held)."""
+        try:
+            os.remove(self._lock_path(key))
+        except FileNotFoundError:
+            pass
+
+    def is_locked(self, key):
+        """True while another live process holds the key's lock."""
+        path = self._lock_path(key)
+        return os.path.exists(path) and not self._break_if_stale(path)
+
+    def wait(self, key, lookup, timeout=None):
+        """
+        Wait for another process to release a key, then look up its result.
+
+        Returns:
+            The lookup() result, or None if the holder left nothing behind
+            (it failed or was cancelled) or the timeout expired
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        while self.is_locked(key):
+            if deadline is not None and time.time() >= deadline:
+                return None
+            time.sleep(self.poll_interval)
+        return lookup()
+
+    def _lead(self, key, compute, lookup, timeout):
+        deadline = None if timeout is None else time.time() + timeout
+
+        while True:
+            if self.acquire(key):
+                try:
+                    # Another worker may have finished just before we locked
+                    result = lookup()
+                    if result is not None:
+                        return result, True
+                    return compute(), False
+                finally:
+                    self.release(key)
+
+            print(f"[SingleFlight] Waiting on another worker: {key}")
+            remaining = None if deadline is None else max(deadline - time.time(), 0)
+            result = self.wait(key, lookup, timeout=remaining)
+            if result is not None:
+                return result, True
+            if deadline is not None and time.time() >= deadline:
+                raise TimeoutError(f"Timed out waiting for in-flight request {key}")
+            # Holder failed without storing a result - try to take over
+
+    def _lock_path(self, key):
+        return os.path.join(self.lock_dir, f"{key}.lock")
+
+    def _break_if_stale(self, path):
+        """Remove a dead holder's lock file. Returns True if it is gone."""
+        try:
+            with open(path, 'r') as f:
+                holder = f.read().split()
+            age = time.time() - os.path.getmtime(path)
+        except FileNotFoundError:
+            return True
+        except OSError:
+            return False
+
+        stale = age > self.stale_seconds
+        if not stale and len(holder) >= 2 and holder[0] == self._hostname:
+            stale = not _pid_alive(int(holder[1]))
+        # A freshly created lock may not have its contents written yet
+        if not stale:
+            return False
+
+        print(f"[SingleFlight] Breaking stale lock {os.path.basename(path)}")
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        return True
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
@@ -0,0 +1,357 @@
+"""
+Compiled Tree Engine
+Flattens GradientBoosting ensembles into contiguous NumPy arrays and
+evaluates every tree of every member for a whole batch of designs at once.
+
+The gather-based traversal has a low fixed cost but runs at a roughly flat
+~15k designs/s, while sklearn's Cython predict() has a per-call overhead
+and then scales much better: the engine wins for small batches (single
+designs, NSGA-II populations) and sklearn above ~150 rows (measured with
+scripts/benchmark_surrogates.py, 'artifact' vs 'sklearn' evaluators: 78 ms
+vs 33 ms at 1k rows, 699 ms vs 223 ms at 10k). Engines compiled from live models therefore hand large
+batches to the original members; memory-mapped artifacts do the same
+through a source_loader when their pickle is still on disk, unpickling it
+on the first large batch only.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import GradientBoostingRegressor
+
+
+# Batches larger than this go to the sklearn members when they are
+# available (see module docstring for the measured crossover)
+SKLEARN_CROSSOVER_ROWS = 150
+
+# Trees x rows evaluated per chunk. Only artifacts shipped without their
+# pickle (no sklearn members to fall back to) see large batches here; 250k cells bounds the
+# node/row temporaries to ~12 MB instead of ~100 MB.
+CHUNK_CELLS = 250_000
+
+# On-disk layout: one .npy per array plus a manifest, so every array can be
+# opened with np.load(mmap_mode='r') and shared through the page cache
+ARTIFACT_FORMAT_VERSION = 1
+ARTIFACT_ARRAYS = [
+    'feature', 'threshold', 'left', 'right', 'value', 'roots',
+    'member_offsets', 'baselines', 'member_feature_importances'
+]
+MANIFEST_FILE = 'manifest.json'
+
+
+class CompiledEnsemble:
+    """
+    All trees of an ensemble packed into flat node arrays.
+
+    Node arrays are indexed globally: children point into the same arrays
+    and leaves point to themselves, so a fixed number of vectorized steps
+    (the deepest tree's depth) walks every tree to its leaf. Leaf values
+    are pre-scaled by each member's learning rate.
+    """
+
+    def __init__(self, feature, threshold, left, right, value, roots,
+                 member_offsets, baselines, n_features, max_depth,
+                 feature_importances, source_models=None, source_loader=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.member_offsets = member_offsets
+        self.baselines = baselines
+        self.n_features = int(n_features)
+        self.max_depth = int(max_depth)
+        self.member_feature_importances = feature_importances
+        # Original sklearn members (None for artifacts opened from disk)
+        self.source_models = source_models
+        # Optional callable returning those members, called on the first
+        # large batch (lets artifacts keep the sklearn hand-off without
+        # unpickling up front)
+        self.source_loader = source_loader
+
+    def __len__(self):
+        return len(self.baselines)
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def feature_importances_(self):
+        """Feature importances averaged across ensemble members."""
+        return np.mean(self.member_feature_importances, axis=0)
+
+    def predict_members(self, X, out=None):
+        """
+        Predict every design with every ensemble member.
+
+        Args:
+            X: (N, n_features) array in training column order
+            out (ndarray): Optional (n_members, N) output buffer
+
+        Returns:
+            ndarray: (n_members, N) member predictions
+        """
+        # sklearn trees compare float32 inputs against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(
+                f"Expected (N, {self.n_features}) input, got {X.shape}")
+
+        n_rows = X.shape[0]
+        if out is None:
+            out = np.empty((len(self), n_rows))
+
+        if n_rows > SKLEARN_CROSSOVER_ROWS and self._sklearn_members() is not None:
+            return self._predict_sklearn(X, out)
+
+        chunk = max(1, CHUNK_CELLS // max(self.n_trees, 1))
+        starts = self.member_offsets[:-1]
+
+        for start in range(0, n_rows, chunk):
+            X_chunk = X[start:start + chunk]
+            rows = np.arange(X_chunk.shape[0])
+            node = np.repeat(self.roots[:, None], len(rows), axis=1)
+
+            for _ in range(self.max_depth):
+                go_left = X_chunk[rows, self.feature[node]] <= \
+                    self.threshold[node]
+                node = np.where(go_left, self.left[node], self.right[node])
+
+            tree_sums = np.add.reduceat(self.value[node], starts, axis=0)
+            out[:, start:start + len(rows)] = \
+                self.baselines[:, None] + tree_sums
+
+        return out
+
+    def _sklearn_members(self):
+        """Original members, loading them on first use if a loader is set."""
+        if self.source_models is None and self.source_loader is not None:
+            loader, self.source_loader = self.source_loader, None
+            self.source_models = loader()
+        return self.source_models
+
+    def _predict_sklearn(self, X, out):
+        """Large batches: one sklearn predict() per member."""
+        names = getattr(self.source_models[0], 'feature_names_in_', None)
+        X_pred = pd.DataFrame(X, columns=names) if names is not None else X
+        for i, model in enumerate(self.source_models):
+            out[i] = model.predict(X_pred)
+        return out
+
+
+def compile_ensemble(models):
+    """
+    Compile a list of GradientBoostingRegressor models.
+
+    Args:
+        models: List of fitted GradientBoostingRegressor (ensemble)
+
+    Returns:
+        CompiledEnsemble: Flattened ensemble
+
+    Raises:
+        TypeError: If a member is not a fitted GradientBoostingRegressor
+    """
+    if models is None or len(models) == 0:
+        raise ValueError("Cannot compile an empty ensemble")
+
+    features, thresholds, lefts, rights, values = [], [], [], [], []
+    roots, member_offsets, baselines, importances = [], [0], [], []
+    n_features = None
+    max_depth = 0
+    node_offset = 0
+
+    for model in models:
+        if not isinstance(model, GradientBoostingRegressor) or \
+                not hasattr(model, 'estimators_'):
+            raise TypeError(
+                f"Only fitted GradientBoostingRegressor models can be compiled, "
+                f"got {type(model).__name__}")
+
+        if n_features is None:
+            n_features = model.n_features_in_
+        elif model.n_features_in_ != n_features:
+            raise ValueError("Ensemble members use different feature counts")
+
+        if model.init_ == 'zero':
+            baselines.append(0.0)
+        else:
+            baseline = model.init_.predict(np.zeros((1, n_features)))
+            baselines.append(float(np.ravel(baseline)[0]))
+
+        importances.append(model.feature_importances_)
+
+        for estimator in model.estimators_[:, 0]:
+            tree = estimator.tree_
+            n_nodes = tree.node_count
+            is_leaf = tree.children_left == -1
+            local_ids = np.arange(n_nodes)
+
+            # Leaves loop back to themselves; their split is never used
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, 0.0, tree.threshold))
+            lefts.append(np.where(is_leaf, local_ids,
+                                  tree.children_left) + node_offset)
+            rights.append(np.where(is_leaf, local_ids,
+                                   tree.children_right) + node_offset)
+            values.append(tree.value[:, 0, 0] * model.learning_rate)
+
+            roots.append(node_offset)
+            max_depth = max(max_depth, tree.max_depth)
+            node_offset += n_nodes
+
+        member_offsets.append(len(roots))
+
+    return CompiledEnsemble(
+        feature=np.concatenate(features).astype(np.intp),
+        threshold=np.concatenate(thresholds).astype(np.float64),
+        left=np.concatenate(lefts).astype(np.intp),
+        right=np.concatenate(rights).astype(np.intp),
+        value=np.concatenate(values).astype(np.float64),
+        roots=np.asarray(roots, dtype=np.intp),
+        member_offsets=np.asarray(member_offsets, dtype=np.intp),
+        baselines=np.asarray(baselines, dtype=np.float64),
+        n_features=n_features,
+        max_depth=max_depth,
+        feature_importances=np.vstack(importances),
+        source_models=list(models)
+    )
+
+
+def save_compiled(engine, directory, metadata=None):
+    """
+    Write a compiled ensemble as a directory of .npy files.
+
+    The directory is built next to its destination and renamed into place,
+    so concurrent readers never see a half-written artifact.
+
+    Args:
+        engine (CompiledEnsemble): Ensemble to store
+        directory (str): Destination directory (e.g. stress_ensemble.trees)
+        metadata (dict): Extra manifest fields (e.g. source file hash)
+
+    Returns:
+        str: Destination directory
+    """
+    parent = os.path.dirname(os.path.abspath(directory))
+    os.makedirs(parent, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(prefix='.tmp-', dir=parent)
+
+    try:
+        for name in ARTIFACT_ARRAYS:
+            np.save(os.path.join(tmp_dir, f"{name}.npy"),
+                    np.ascontiguousarray(getattr(engine, name)))
+
+        manifest = {
+            'format_version': ARTIFACT_FORMAT_VERSION,
+            'n_features': engine.n_features,
+            'max_depth': engine.max_depth,
+            'n_members': len(engine),
+            'n_trees': engine.n_trees,
+            **(metadata or {})
+        }
+        with open(os.path.join(tmp_dir, MANIFEST_FILE), 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+        if os.path.isdir(directory):
+            stale_dir = tempfile.mkdtemp(prefix='.stale-', dir=parent)
+            os.rename(directory, os.path.join(stale_dir, 'old'))
+            os.rename(tmp_dir, directory)
+            shutil.rmtree(stale_dir, ignore_errors=True)
+        else:
+            os.rename(tmp_dir, directory)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    return directory
+
+
+def read_manifest(directory):
+    """Read an artifact manifest, or None if the artifact is missing/unknown."""
+    try:
+        with open(os.path.join(directory, MANIFEST_FILE), 'r') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('format_version') != ARTIFACT_FORMAT_VERSION:
+        return None
+    return manifest
+
+
+def load_compiled(directory, mmap_mode='r'):
+    """
+    Open a compiled ensemble written by save_compiled().
+
+    Args:
+        directory (str): Artifact directory
+        mmap_mode (str): Passed to np.load ('r' shares pages across workers)
+
+    Returns:
+        tuple: (CompiledEnsemble, manifest dict)
+    """
+    manifest = read_manifest(directory)
+    if manifest is None:
+        raise FileNotFoundError(f"No compiled ensemble artifact in {directory}")
+
+    arrays = {
+        name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode)
+        for name in ARTIFACT_ARRAYS
+    }
+    engine = CompiledEnsemble(
+        feature=arrays['feature'],
+        threshold=arrays['threshold'],
+        left=arrays['left'],
+        right=arrays['right'],
+        value=arrays['value'],
+        roots=arrays['roots'],
+        member_offsets=arrays['member_offsets'],
+        baselines=arrays['baselines'],
+        n_features=manifest['n_features'],
+        max_depth=manifest['max_depth'],
+        feature_importances=arrays['member_feature_importances']
+    )
+    return engine, manifest
+
+# Test function
+if __name__ == '__main__':
+    import time
+    import joblib
+
+    print("Testing Compiled Tree Engine...")
+    print("=" * 60)
+
+    data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+    models = joblib.load(os.path.join(data_dir, 'stress_ensemble.pkl'))
+
+    start = time.time()
+    engine = compile_ensemble(models)
+    print(f"Compiled {len(engine)} members / {engine.n_trees} trees "
+          f"({len(engine.value)} nodes) in {(time.time() - start)*1000:.1f} ms")
+
+    rng = np.random.default_rng(0)
+    xl = np.array([40.0, 25.0, 2.0, 2, 1.5, 1.0, 3.0])
+    xu = np.array([70.0, 40.0, 5.0, 5, 3.5, 4.0, 8.0])
+    X = xl + rng.random((1000, 7)) * (xu - xl)
+    X[:, 3] = np.round(X[:, 3])
+
+    # Check the flattened traversal itself, not the sklearn hand-off
+    engine.source_models = None
+
+    start = time.time()
+    compiled = engine.predict_members(X)
+    compiled_time = time.time() - start
+
+    start = time.time()
+    reference = np.array([model.predict(X) for model in models])
+    sklearn_time = time.time() - start
+
+    print(f"Max abs difference vs sklearn: {np.abs(compiled - reference).max():.2e}")
+    print(f"Compiled: {compiled_time*1000:.1f} ms, sklearn: {sklearn_time*1000:.1f} ms")
+    print("\n✅ Tree engine working correctly!")
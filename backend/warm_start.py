@@ -0,0 +1,141 @@
+"""
+Warm Start Index
+Indexes cached optimization runs by (material, load) so a cache miss can
+seed NSGA-II with the Pareto designs of the nearest cached loads instead of
+starting from a purely random population.
+"""
+
+import json
+import os
+import threading
+
+import numpy as np
+
+from ensemble_predictor import DESIGN_FEATURES
+
+
+class WarmStartIndex:
+    """
+    (material, load) index over the JSON files of the disk cache.
+
+    The directory is rescanned only when its mtime changes (cache writes
+    rename files into place, which bumps it), and each file's inputs are
+    parsed once per file mtime.
+    """
+
+    def __init__(self, cache_dir, max_sources=2, max_relative_distance=0.5):
+        """
+        Args:
+            cache_dir (str or Path): Disk cache directory (*.json results)
+            max_sources (int): Cached runs to draw seed designs from
+            max_relative_distance (float): Ignore runs whose load differs by
+                more than this fraction of the requested load
+        """
+        self.cache_dir = str(cache_dir)
+        self.max_sources = max_sources
+        self.max_relative_distance = max_relative_distance
+        self._entries = {}
+        self._dir_mtime = None
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Rescan the cache directory if it changed."""
+        try:
+            dir_mtime = os.path.getmtime(self.cache_dir)
+        except OSError:
+            return
+        if dir_mtime == self._dir_mtime:
+            return
+
+        with self._lock:
+            entries = {}
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith('.json') or name.startswith('.'):
+                    continue
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    mtime = os.path.getmtime(path)
+                except OSError:
+                    continue
+
+                previous = self._entries.get(path)
+                if previous is not None and previous['mtime'] == mtime:
+                    entries[path] = previous
+                    continue
+
+                inputs = _read_inputs(path)
+                if inputs is not None:
+                    entries[path] = {**inputs, 'path': path, 'mtime': mtime}
+
+            self._entries = entries
+            self._dir_mtime = dir_mtime
+
+    def nearest(self, material, load):
+        """
+        Cached runs for a material, nearest load first.
+
+        Returns:
+            list: Index entries (material, load, path, mtime)
+        """
+        self.refresh()
+        max_distance = self.max_relative_distance * abs(load)
+        candidates = [
+            entry for entry in self._entries.values()
+            if entry['material'] == material
+            and abs(entry['load'] - load) <= max_distance
+        ]
+        candidates.sort(key=lambda entry: abs(entry['load'] - load))
+        return candidates[:self.max_sources]
+
+    def seed_designs(self, material, load, limit=None):
+        """
+        Pareto designs of the nearest cached runs.
+
+        Args:
+            material (str): Material name
+            load (float): Requested load in N
+            limit (int): Maximum number of designs
+
+        Returns:
+            tuple: ((K, n_features) design matrix, list of source loads)
+        """
+        designs, sources = [], []
+        for entry in self.nearest(material, load):
+            rows = _read_pareto_parameters(entry['path'])
+            if rows:
+                designs.extend(rows)
+                sources.append(entry['load'])
+
+        if not designs:
+            return np.empty((0, len(DESIGN_FEATURES))), []
+
+        X = np.unique(np.asarray(designs, dtype=float), axis=0)
+        if limit is not None and len(X) > limit:
+            # Spread the picks along the front instead of taking one end
+            X = X[np.linspace(0, len(X) - 1, limit).round().astype(int)]
+        return X, sources
+
+
+def _read_inputs(path):
+    """(material, load) of a cache file, or None if it cannot be used."""
+    try:
+        with open(path, 'r') as f:
+            payload = json.load(f)
+        inputs = payload['inputs']
+        return {'material': inputs['material'], 'load': float(inputs['load'])}
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _read_pareto_parameters(path):
+    """Design-parameter rows of a cached Pareto front."""
+    try:
+        with open(path, 'r') as f:
+            payload = json.load(f)
+        front = payload.get('results', payload).get('pareto_front', [])
+        return [
+            [float(design['parameters'][col]) for col in DESIGN_FEATURES]
+            for design in front
+        ]
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return []
@@ -101,6 +101,101 @@ function displayResults(results) {
     selectDesign(paretoFront[0]);
 }
 
+/**
+ * Restore the live progress placeholder before a new run
+ */
+function resetLiveProgress() {
+    const status = document.getElementById('live-progress');
+    if (status) {
+        status.textContent = 'Live progress updates stream below';
+    }
+}
+
+/**
+ * Render live progress of a running optimization.
+ * The streamed front is a preview: points are not selectable until the
+ * final results (with STL files) arrive.
+ */
+function renderLiveProgress(progress, paretoFront, mentorMessages) {
+    const status = document.getElementById('live-progress');
+    if (status) {
+        const percent = progress.percent !== undefined ? ` (${progress.percent}%)` : '';
+        status.textContent =
+            `Gen ${progress.generation}/${progress.n_gen}${percent} · ` +
+            `${progress.feasible_percent}% feasible · ` +
+            `best ${progress.best_mass}g, ₹${progress.best_cost}`;
+    }
+
+    if (mentorMessages.length > 0) {
+        displayMentorInsights({ mentor_log: mentorMessages });
+    }
+
+    if (!paretoFront || paretoFront.length === 0) {
+        return;
+    }
+
+    document.getElementById('no-results').classList.add('hidden');
+    document.getElementById('results-container').classList.remove('hidden');
+
+    const dataPoints = paretoFront.map(design => ({ x: design.mass, y: design.cost }));
+
+    if (paretoChart && paretoChart.config.options.plugins.title.text === 'Evolving Pareto Front') {
+        paretoChart.data.datasets[0].data = dataPoints;
+        paretoChart.update('none');
+        return;
+    }
+
+    if (paretoChart) {
+        paretoChart.destroy();
+    }
+
+    const ctx = document.getElementById('pareto-chart').getContext('2d');
+    paretoChart = new Chart(ctx, {
+        type: 'scatter',
+        data: {
+            datasets: [{
+                label: 'Current Non-Dominated Designs',
+                data: dataPoints,
+                backgroundColor: 'rgba(150, 150, 150, 0.6)',
+                borderColor: 'rgba(150, 150, 150, 1)',
+                borderWidth: 2,
+                pointRadius: 6
+            }]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            animation: false,
+            plugins: {
+                title: {
+                    display: true,
+                    text: 'Evolving Pareto Front',
+                    font: { size: 16, weight: 'bold' }
+                },
+                legend: {
+                    display: false
+                }
+            },
+            scales: {
+                x: {
+                    title: {
+                        display: true,
+                        text: 'Mass (grams)',
+                        font: { size: 14, weight: 'bold' }
+                    }
+                },
+                y: {
+                    title: {
+                        display: true,
+                        text: 'Cost (₹)',
+                        font: { size: 14, weight: 'bold' }
+                    }
+                }
+            }
+        }
+    });
+}
+
 /**
  * Render Pareto front scatter plot
  */
@@ -4,61 +4,172 @@
  */
 
 /**
- * Run full optimization with user parameters
+ * Read optimization inputs from the form
+ */
+function getOptimizationInputs() {
+    return {
+        load: parseFloat(document.getElementById('load-input').value),
+        material: document.getElementById('material-select').value,
+        pop_size: parseInt(document.getElementById('pop-size').value),
+        n_gen: parseInt(document.getElementById('generations').value)
+    };
+}
+
+/**
+ * Toggle loading state and optimize/demo buttons
+ */
+function setOptimizationLoading(isLoading) {
+    document.getElementById('loading-state').classList.toggle('hidden', !isLoading);
+    document.getElementById('optimize-btn').disabled = isLoading;
+    document.getElementById('demo-btn').disabled = isLoading;
+}
+
+/**
+ * Show final optimization results
+ */
+function handleOptimizationResults(results, inputs) {
+    currentResults = results;
+
+    // Calculate stats for toast
+    const totalDesigns = results.n_evaluations ?? inputs.pop_size * inputs.n_gen;
+    const paretoCount = results.pareto_front ? results.pareto_front.length : 0;
+    const earlyStop = results.converged
+        ? ` Converged after ${results.n_generations} of ${results.n_generations_requested} generations.`
+        : '';
+
+    // Show success toast
+    showToast(
+        `✅ Optimization complete — ${totalDesigns.toLocaleString()} designs explored, ${paretoCount} champions found.${earlyStop}`,
+        'success',
+        6000
+    );
+
+    displayResults(results);
+    displayMentorInsights(results);
+}
+
+/**
+ * Run full optimization with user parameters.
+ * Streams live progress from a background job when the browser supports
+ * Server-Sent Events, otherwise waits on a single request.
  */
 async function runOptimization() {
-    const load = parseFloat(document.getElementById('load-input').value);
-    const material = document.getElementById('material-select').value;
-    const popSize = parseInt(document.getElementById('pop-size').value);
-    const generations = parseInt(document.getElementById('generations').value);
+    const inputs = getOptimizationInputs();
 
     // Show loading state
-    document.getElementById('loading-state').classList.remove('hidden');
-    document.getElementById('optimize-btn').disabled = true;
-    document.getElementById('demo-btn').disabled = true;
+    setOptimizationLoading(true);
+    resetLiveProgress();
+
+    if (!window.EventSource) {
+        await runOptimizationBlocking(inputs);
+        return;
+    }
 
     try {
-        const response = await fetch(`${API_BASE_URL}/api/optimize`, {
+        const response = await fetch(`${API_BASE_URL}/api/jobs`, {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
             },
-            body: JSON.stringify({
-                load: load,
-                material: material,
-                pop_size: popSize,
-                n_gen: generations
-            })
+            body: JSON.stringify(inputs)
         });
 
         const data = await response.json();
 
-        if (data.success) {
-            currentResults = data.results;
+        if (response.status === 429) {
+            showToast('Optimizer is busy — please try again in a few seconds.', 'info', 6000);
+            setOptimizationLoading(false);
+            return;
+        }
+        if (!data.success) {
+            showToast('Optimization failed: ' + data.error, 'error');
+            setOptimizationLoading(false);
+            return;
+        }
 
-            // Calculate stats for toast
-            const totalDesigns = popSize * generations;
-            const paretoCount = data.results.pareto_front ? data.results.pareto_front.length : 0;
+        streamOptimizationJob(data.job_id, inputs);
+    } catch (error) {
+        showToast('Failed to connect to API. Make sure Flask server is running on port 5000.', 'error');
+        setOptimizationLoading(false);
+    }
+}
+
+/**
+ * Follow a background optimization job over Server-Sent Events
+ */
+function streamOptimizationJob(jobId, inputs) {
+    const source = new EventSource(`${API_BASE_URL}/api/jobs/${jobId}/events`);
+    const mentorMessages = [];
 
-            // Show success toast
-            showToast(
-                `✅ Optimization complete — ${totalDesigns.toLocaleString()} designs explored, ${paretoCount} champions found.`,
-                'success',
-                6000
-            );
+    const finish = () => {
+        source.close();
+        setOptimizationLoading(false);
+    };
 
-            displayResults(data.results);
-            displayMentorInsights(data.results);
+    source.addEventListener('progress', (event) => {
+        const data = JSON.parse(event.data);
+        renderLiveProgress(data.progress, data.pareto_front, mentorMessages);
+    });
+
+    source.addEventListener('mentor', (event) => {
+        mentorMessages.push(JSON.parse(event.data).message);
+    });
+
+    source.addEventListener('completed', (event) => {
+        finish();
+        handleOptimizationResults(JSON.parse(event.data).results, inputs);
+    });
+
+    source.addEventListener('failed', (event) => {
+        finish();
+        showToast('Optimization failed: ' + JSON.parse(event.data).error, 'error');
+    });
+
+    source.addEventListener('cancelled', () => {
+        finish();
+        showToast('Optimization cancelled.', 'info');
+    });
+
+    // Every (re)connection replays the job's mentor log from the start
+    source.addEventListener('open', () => {
+        mentorMessages.length = 0;
+    });
+
+    source.onerror = () => {
+        // A dropped connection is retried by the browser (CONNECTING); a
+        // failed request (e.g. 404 for an unknown job, 5xx) leaves it CLOSED
+        if (source.readyState !== EventSource.CLOSED) {
+            return;
+        }
+        finish();
+        showToast('Lost connection to the optimizer stream.', 'error');
+    };
+}
+
+/**
+ * Run optimization as a single blocking request (no live progress)
+ */
+async function runOptimizationBlocking(inputs) {
+    try {
+        const response = await fetch(`${API_BASE_URL}/api/optimize`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify(inputs)
+        });
+
+        const data = await response.json();
+
+        if (data.success) {
+            handleOptimizationResults(data.results, inputs);
         } else {
             showToast('Optimization failed: ' + data.error, 'error');
         }
     } catch (error) {
         showToast('Failed to connect to API. Make sure Flask server is running on port 5000.', 'error');
     } finally {
-        // Hide loading state
-        document.getElementById('loading-state').classList.add('hidden');
-        document.getElementById('optimize-btn').disabled = false;
-        document.getElementById('demo-btn').disabled = false;
+        setOptimizationLoading(false);
     }
 }
 
@@ -0,0 +1,231 @@
+"""
+Optimizer Benchmark
+Runs run_optimization over a grid of pop_size x n_gen x material x
+evaluator and records where the time goes (model load, NSGA-II loop,
+surrogate calls, cost/DFM scoring, post-processing, STL generation),
+evaluations per second and hypervolume reached per second:
+
+    python benchmark_optimizer.py --pop-sizes 20 50 100 --n-gens 30 100 \\
+        --materials PLA Aluminum6061 --evaluators surrogate physics \\
+        --surrogate compact
+
+Results are written as JSON for sizing hardware and picking default budgets.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from itertools import product
+
+import numpy as np
+from pymoo.indicators.hv import HV
+
+# Add backend directory to path BEFORE importing from backend modules
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend'))
+sys.path.append(BACKEND_DIR)
+
+# Now import from backend modules
+from optimizer import (run_optimization, BracketOptimizationProblem,
+                       EVALUATORS, TERMINATIONS, SURROGATES)
+from geometry_generator import generate_bracket_stl
+from material_library import load_materials
+
+
+RESULTS_FILE = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), '../docs/benchmarks/optimizer_benchmark.json'))
+
+# Phases reported by run_optimization()['timings'], in display order
+PHASES = ('model_load_s', 'nsga_loop_s', 'surrogate_s', 'cost_dfm_s', 'postprocess_s')
+
+
+def reference_point(load, material, n_samples=2000, seed=0):
+    """
+    Fixed (mass, cost) hypervolume reference point for a material.
+
+    Taken 10% beyond the worst mass and cost of random designs, so the
+    hypervolumes of runs with different budgets are comparable.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        problem = BracketOptimizationProblem(load, material, evaluator='physics')
+        rng = np.random.default_rng(seed)
+        X = problem.xl + rng.random((n_samples, problem.n_var)) * (problem.xu - problem.xl)
+        F = problem.evaluate(X, return_values_of=['F'])
+    return F.max(axis=0) * 1.1
+
+
+def time_stl_generation(pareto_front):
+    """Seconds to write an STL for every Pareto design (into a temp dir)."""
+    with tempfile.TemporaryDirectory() as output_dir:
+        start = time.perf_counter()
+        for design in pareto_front:
+            generate_bracket_stl(design['parameters'], output_dir=output_dir)
+        return time.perf_counter() - start
+
+
+def benchmark_run(load, material, pop_size, n_gen, evaluator, ref_point,
+                  termination='n_gen', verbose=False, surrogate='auto'):
+    """
+    One timed optimization.
+
+    Returns:
+        dict: Settings, phase timings and throughput metrics
+    """
+    output = contextlib.nullcontext() if verbose else \
+        contextlib.redirect_stdout(io.StringIO())
+    with output:
+        start = time.perf_counter()
+        results = run_optimization(
+            load=load, material_name=material, pop_size=pop_size, n_gen=n_gen,
+            evaluator=evaluator, termination=termination, surrogate=surrogate)
+        wall_s = time.perf_counter() - start
+        stl_s = time_stl_generation(results['pareto_front'])
+
+    front = results['pareto_front']
+    F = np.array([[design['mass'], design['cost']] for design in front])
+    hypervolume = float(HV(ref_point=ref_point)(F)) if len(F) else 0.0
+    timings = results['timings']
+
+    return {
+        'material': material,
+        'evaluator': evaluator,
+        'surrogate': results['surrogate'],
+        'pop_size': pop_size,
+        'n_gen': n_gen,
+        'n_generations': results['n_generations'],
+        'n_evaluations': results['n_evaluations'],
+        'n_pareto': len(front),
+        'wall_s': wall_s,
+        'timings': {**timings, 'stl_s': stl_s},
+        'evals_per_s': results['n_evaluations'] / timings['nsga_loop_s'],
+        'hypervolume': hypervolume,
+        'hv_per_s': hypervolume / (wall_s + stl_s)
+    }
+
+
+def run_grid(load, pop_sizes, n_gens, materials, evaluators, termination='n_gen',
+             verbose=False, surrogate='auto'):
+    """
+    Benchmark every grid combination (runs are sequential, one core each).
+
+    A failing run is recorded with an 'error' field instead of aborting
+    the grid.
+
+    Raises:
+        ValueError: If a material is unknown (checked before any run)
+    """
+    known = load_materials()
+    unknown = [name for name in materials if name not in known]
+    if unknown:
+        raise ValueError(f"Unknown material(s): {', '.join(unknown)}")
+
+    ref_points = {material: reference_point(load, material) for material in materials}
+    runs = []
+    for material, evaluator, pop_size, n_gen in product(materials, evaluators,
+                                                       pop_sizes, n_gens):
+        print(f"⏱️  {material} / {evaluator} / pop {pop_size} / {n_gen} gens...",
+              end=' ', flush=True)
+        try:
+            run = benchmark_run(load, material, pop_size, n_gen, evaluator,
+                                ref_points[material], termination, verbose, surrogate)
+        except Exception as exc:
+            # e.g. no feasible design at high loads - keep the other runs
+            runs.append({'material': material, 'evaluator': evaluator,
+                         'pop_size': pop_size, 'n_gen': n_gen, 'error': str(exc)})
+            print(f"failed: {exc}")
+            continue
+        runs.append(run)
+        print(f"{run['wall_s']:.1f}s, {run['evals_per_s']:,.0f} evals/s, "
+              f"HV {run['hypervolume']:.4g}")
+
+    return {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'load': load,
+            'termination': termination,
+            'surrogate': surrogate,
+            'reference_points': {material: point.tolist()
+                                 for material, point in ref_points.items()}
+        },
+        'runs': runs
+    }
+
+
+def print_report(report):
+    print("\n" + "=" * 70)
+    print("PHASE BREAKDOWN (seconds)")
+    print("=" * 70)
+    columns = PHASES + ('stl_s',)
+    header = ' '.join(f"{phase[:-2]:>11}" for phase in columns)
+    print(f"{'run':<28} {header} {'evals/s':>9} {'HV/s':>10}")
+    for run in report['runs']:
+        label = f"{run['material']}/{run['evaluator']}/{run['pop_size']}x{run['n_gen']}"
+        if 'error' in run:
+            print(f"{label:<28} failed: {run['error']}")
+            continue
+        phases = ' '.join(f"{run['timings'][phase]:>11.3f}" for phase in columns)
+        print(f"{label:<28} {phases} {run['evals_per_s']:>9,.0f} {run['hv_per_s']:>10.4g}")
+
+    # Cheapest budget that reaches 99% of the best hypervolume per material
+    print("\nSuggested budgets (≥99% of the best hypervolume, lowest wall time):")
+    for material in dict.fromkeys(run['material'] for run in report['runs']):
+        for evaluator in dict.fromkeys(run['evaluator'] for run in report['runs']):
+            group = [run for run in report['runs'] if 'error' not in run
+                     and run['material'] == material and run['evaluator'] == evaluator]
+            if not group:
+                continue
+            best_hv = max(run['hypervolume'] for run in group)
+            good = [run for run in group if run['hypervolume'] >= 0.99 * best_hv]
+            pick = min(good, key=lambda run: run['wall_s'])
+            print(f"   {material}/{evaluator}: pop_size={pick['pop_size']}, "
+                  f"n_gen={pick['n_gen']} ({pick['wall_s']:.1f}s)")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark end-to-end optimization")
+    parser.add_argument('--load', type=float, default=50.0)
+    parser.add_argument('--pop-sizes', nargs='+', type=int, default=[20, 50])
+    parser.add_argument('--n-gens', nargs='+', type=int, default=[30, 100])
+    parser.add_argument('--materials', nargs='+', default=['PLA'])
+    parser.add_argument('--evaluators', nargs='+', choices=EVALUATORS,
+                        default=['surrogate', 'physics'])
+    parser.add_argument('--termination', choices=TERMINATIONS, default='n_gen')
+    parser.add_argument('--surrogate', choices=SURROGATES, default='auto',
+                        help="Surrogate models for the surrogate/hybrid evaluators")
+    parser.add_argument('--output', default=RESULTS_FILE)
+    parser.add_argument('--verbose', action='store_true',
+                        help="Show the optimizer's own output")
+    args = parser.parse_args()
+
+    known = load_materials()
+    unknown = [name for name in args.materials if name not in known]
+    if unknown:
+        parser.error(f"unknown material(s) {', '.join(unknown)} "
+                     f"(available: {', '.join(known)})")
+    return args
+
+
+if __name__ == '__main__':
+    args = parse_args()
+
+    print("=" * 70)
+    print("OPTIMIZER BENCHMARK")
+    print("=" * 70)
+
+    report = run_grid(args.load, args.pop_sizes, args.n_gens, args.materials,
+                      args.evaluators, args.termination, args.verbose, args.surrogate)
+    print_report(report)
+
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Results written to {args.output}")
@@ -0,0 +1,333 @@
+"""
+Surrogate Inference Benchmark
+Measures single-design latency, batch throughput and peak memory of every
+stress/deflection evaluator the optimizer can use, writes the results as
+JSON and compares them against a stored baseline:
+
+    python benchmark_surrogates.py                   # run + compare
+    python benchmark_surrogates.py --save-baseline   # accept current numbers
+    python benchmark_surrogates.py --no-baseline     # run + record only
+
+Exits with status 1 when a metric is slower (or larger) than the baseline
+by more than --tolerance, so it can gate a deploy, and with status 2 when
+there is no baseline to compare against (unless --no-baseline is given).
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import joblib
+import numpy as np
+import sklearn
+
+# Add backend directory to path BEFORE importing from backend modules
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend'))
+sys.path.append(BACKEND_DIR)
+
+# Now import from backend modules
+from compact_surrogate import fit_compact_surrogate, load_compact_surrogate
+from ensemble_predictor import (EnsemblePredictor, JointEnsemblePredictor,
+                                FEATURE_COLUMNS, with_conditions)
+from material_library import get_material
+from model_registry import DATA_DIR, ENSEMBLE_FILES, artifact_dir_for, export_artifact
+from physics_calculator import calculate_stress_and_deflection_batch
+from tree_engine import load_compiled, read_manifest
+
+
+BENCHMARK_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../docs/benchmarks'))
+RESULTS_FILE = os.path.join(BENCHMARK_DIR, 'surrogate_benchmark.json')
+BASELINE_FILE = os.path.join(BENCHMARK_DIR, 'surrogate_baseline.json')
+
+BATCH_SIZES = (1, 50, 1_000, 100_000)
+SINGLE_REPEATS = 200
+MIN_SECONDS = 0.5       # Keep repeating a batch size at least this long...
+MAX_REPEATS = 1_000     # ...but not more often than this
+
+# Design bounds of BracketOptimizationProblem
+LOWER = np.array([40.0, 25.0, 2.0, 2, 1.5, 1.0, 3.0])
+UPPER = np.array([70.0, 40.0, 5.0, 5, 3.5, 4.0, 8.0])
+LOAD, MATERIAL = 80.0, 'PLA'
+
+# Metrics where larger is worse, compared against the baseline (plus the
+# batch_seconds of every batch size)
+GATED_METRICS = ('single_p50_us', 'peak_mb')
+
+
+def random_designs(n, seed=0):
+    """(n, 7) designs inside the optimizer bounds, rib counts rounded."""
+    rng = np.random.default_rng(seed)
+    X = LOWER + rng.random((n, len(LOWER))) * (UPPER - LOWER)
+    X[:, 3] = np.round(X[:, 3])
+    return X
+
+
+def _model_inputs(predictor, X_design):
+    """Append load/material columns for conditioned surrogates."""
+    if predictor.conditioned:
+        return with_conditions(X_design, LOAD, get_material(MATERIAL))
+    return X_design
+
+
+def _per_target(stress, deflection):
+    """Evaluator for a pair of per-target predictors."""
+    def evaluate(X_design):
+        X = _model_inputs(stress, X_design)
+        return stress.predict(X), deflection.predict(X)
+    return evaluate
+
+
+def _joint(predictor):
+    """Evaluator for a multi-output predictor (joint ensemble, compact)."""
+    def evaluate(X_design):
+        return predictor.predict(_model_inputs(predictor, X_design))
+    return evaluate
+
+
+def _open_artifact(path, models):
+    """
+    Memory-mapped engine of an ensemble pickle, as artifact-only workers use it.
+
+    The artifact is exported first when it is missing. The engine has no
+    sklearn members, so every batch size runs the compiled traversal.
+    """
+    artifact_dir = artifact_dir_for(path)
+    if read_manifest(artifact_dir) is None:
+        export_artifact(path, models)
+    engine, _ = load_compiled(artifact_dir, mmap_mode='r')
+    return engine
+
+
+def build_evaluators(names=None):
+    """
+    Evaluators available in this checkout.
+
+    Ensembles are read from backend/data; missing files are skipped.
+    'compiled' is the in-process engine (which hands batches above
+    SKLEARN_CROSSOVER_ROWS to sklearn), 'artifact' the memory-mapped
+    traversal alone. The compact surrogate is fitted on beam theory when no
+    artifact exists, so it is always benchmarked.
+
+    Returns:
+        dict: Name -> callable taking an (N, 7) design matrix
+    """
+    evaluators = {
+        'physics': lambda X: calculate_stress_and_deflection_batch(X, LOAD, MATERIAL)
+    }
+
+    paths = {name: os.path.join(DATA_DIR, filename)
+             for name, filename in ENSEMBLE_FILES.items()}
+    if os.path.exists(paths['stress']) and os.path.exists(paths['deflection']):
+        stress_models = joblib.load(paths['stress'])
+        deflection_models = joblib.load(paths['deflection'])
+        evaluators['sklearn'] = _per_target(
+            EnsemblePredictor(stress_models, compiled=False),
+            EnsemblePredictor(deflection_models, compiled=False))
+        evaluators['compiled'] = _per_target(
+            EnsemblePredictor(stress_models), EnsemblePredictor(deflection_models))
+        evaluators['artifact'] = _per_target(
+            EnsemblePredictor(_open_artifact(paths['stress'], stress_models)),
+            EnsemblePredictor(_open_artifact(paths['deflection'], deflection_models)))
+    else:
+        print("⚠️  Per-target ensembles not found - skipping sklearn/compiled/artifact")
+
+    if os.path.exists(paths['joint']):
+        evaluators['joint'] = _joint(JointEnsemblePredictor(joblib.load(paths['joint'])))
+
+    if os.path.exists(paths['compact']):
+        compact = load_compact_surrogate(paths['compact'])
+    else:
+        X_design = random_designs(5_000, seed=1)
+        physics = calculate_stress_and_deflection_batch(X_design, LOAD, MATERIAL)
+        compact = fit_compact_surrogate(
+            with_conditions(X_design, LOAD, get_material(MATERIAL)),
+            np.column_stack([physics['max_stress'], physics['max_deflection']]),
+            FEATURE_COLUMNS)
+    evaluators['compact'] = _joint(compact)
+
+    if names:
+        evaluators = {name: evaluators[name] for name in names if name in evaluators}
+    return evaluators
+
+
+def _time_calls(evaluate, X, min_seconds=MIN_SECONDS, max_repeats=MAX_REPEATS):
+    """Best wall time of repeated calls (at least one)."""
+    times = []
+    deadline = time.perf_counter() + min_seconds
+    while not times or (time.perf_counter() < deadline and len(times) < max_repeats):
+        start = time.perf_counter()
+        evaluate(X)
+        times.append(time.perf_counter() - start)
+    return min(times), len(times)
+
+
+def benchmark_evaluator(evaluate, batch_sizes=BATCH_SIZES):
+    """
+    Latency, throughput and peak memory of one evaluator.
+
+    Returns:
+        dict: Machine-readable results
+    """
+    # Warm up (lazy compilation, first-call allocations)
+    evaluate(random_designs(50))
+
+    single = random_designs(1, seed=2)
+    latencies = []
+    for _ in range(SINGLE_REPEATS):
+        start = time.perf_counter()
+        evaluate(single)
+        latencies.append((time.perf_counter() - start) * 1e6)
+    latencies.sort()
+
+    batches = {}
+    for n in batch_sizes:
+        seconds, repeats = _time_calls(evaluate, random_designs(n, seed=3))
+        batches[str(n)] = {
+            'batch_seconds': seconds,
+            'designs_per_s': n / seconds,
+            'repeats': repeats
+        }
+
+    # Peak Python + NumPy allocations for the largest batch
+    X_largest = random_designs(max(batch_sizes), seed=4)
+    tracemalloc.start()
+    evaluate(X_largest)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'single_p50_us': statistics.median(latencies),
+        'single_p95_us': latencies[int(0.95 * (len(latencies) - 1))],
+        'batches': batches,
+        'peak_mb': peak / 1e6,
+        'peak_batch': max(batch_sizes)
+    }
+
+
+def run_benchmarks(names=None, batch_sizes=BATCH_SIZES):
+    """Benchmark every available evaluator."""
+    results = {}
+    for name, evaluate in build_evaluators(names).items():
+        print(f"\n⏱️  {name}...")
+        results[name] = benchmark_evaluator(evaluate, batch_sizes)
+        print_result(name, results[name])
+
+    return {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'sklearn': sklearn.__version__,
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'load': LOAD,
+            'material': MATERIAL
+        },
+        'results': results
+    }
+
+
+def print_result(name, result):
+    print(f"   single design: p50 {result['single_p50_us']:.1f} µs, "
+          f"p95 {result['single_p95_us']:.1f} µs")
+    for n, batch in result['batches'].items():
+        print(f"   N={int(n):>7,}: {batch['batch_seconds'] * 1000:9.3f} ms "
+              f"({batch['designs_per_s']:,.0f} designs/s)")
+    print(f"   peak memory (N={result['peak_batch']:,}): {result['peak_mb']:.1f} MB")
+
+
+def compare_to_baseline(report, baseline, tolerance=0.25):
+    """
+    Metrics that got worse than the baseline by more than tolerance.
+
+    Only evaluators and batch sizes present in both runs are compared.
+
+    Returns:
+        list: (evaluator, metric, baseline, current) regressions
+    """
+    regressions = []
+    for name, current in report['results'].items():
+        previous = baseline.get('results', {}).get(name)
+        if previous is None:
+            continue
+
+        pairs = [(metric, previous.get(metric), current[metric])
+                 for metric in GATED_METRICS]
+        pairs += [(f"batch_seconds[N={n}]", previous.get('batches', {}).get(n, {})
+                   .get('batch_seconds'), batch['batch_seconds'])
+                  for n, batch in current['batches'].items()]
+
+        for metric, old, new in pairs:
+            if old and new > old * (1 + tolerance):
+                regressions.append((name, metric, old, new))
+    return regressions
+
+
+def _write_json(path, payload):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(payload, f, indent=2)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark surrogate inference")
+    parser.add_argument('--evaluators', nargs='+',
+                        choices=('sklearn', 'compiled', 'artifact', 'physics',
+                                 'joint', 'compact'),
+                        help="Subset to run (default: all available)")
+    parser.add_argument('--batch-sizes', nargs='+', type=int, default=list(BATCH_SIZES))
+    parser.add_argument('--output', default=RESULTS_FILE)
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="Allowed slowdown before a metric counts as a regression")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="Store this run as the new baseline")
+    parser.add_argument('--no-baseline', action='store_true',
+                        help="Only record results; do not fail without a baseline")
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+
+    print("=" * 70)
+    print("SURROGATE INFERENCE BENCHMARK")
+    print("=" * 70)
+
+    report = run_benchmarks(args.evaluators, tuple(args.batch_sizes))
+    _write_json(args.output, report)
+    print(f"\n✅ Results written to {args.output}")
+
+    if args.save_baseline:
+        _write_json(args.baseline, report)
+        print(f"✅ Baseline saved to {args.baseline}")
+        sys.exit(0)
+
+    if args.no_baseline:
+        sys.exit(0)
+
+    if not os.path.exists(args.baseline):
+        # A gate without a baseline would pass on any fresh checkout
+        print(f"❌ No baseline at {args.baseline} - run with --save-baseline to "
+              f"create one, or --no-baseline to skip the comparison")
+        sys.exit(2)
+
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f)
+    regressions = compare_to_baseline(report, baseline, args.tolerance)
+
+    print("\n" + "=" * 70)
+    if regressions:
+        print(f"❌ {len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+        for name, metric, old, new in regressions:
+            print(f"   {name:>9} {metric:<28} {old:12.4g} -> {new:12.4g} "
+                  f"({new / old - 1:+.0%})")
+        sys.exit(1)
+    print(f"✅ No regressions beyond {args.tolerance:.0%} "
+          f"(baseline from {baseline['meta']['timestamp']})")
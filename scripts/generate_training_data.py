@@ -1,200 +1,349 @@
 """
 Training Data Generator
-Creates 500 design variations using Latin Hypercube Sampling.
-Evaluates each with beam theory physics (fast).
-Outputs training dataset for surrogate model.
+Creates design variations using Latin Hypercube or Sobol sampling, each
+paired with an applied load and a material so the surrogate learns every
+operating condition. Samples are generated and evaluated in blocks with the
+vectorized beam-theory physics on a process pool, and every block is written
+as one shard (NPZ, or Parquet when pyarrow is installed) next to a
+manifest.json. An interrupted run resumes from the manifest, and training
+can stream the shards instead of loading one giant CSV.
+
+    python generate_training_data.py --samples 2000000 --workers 8
 """
 
+import argparse
+import json
 import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 import numpy as np
 import pandas as pd
 from scipy.stats import qmc
 
 # Add backend directory to path BEFORE importing from backend modules
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend'))
+sys.path.append(BACKEND_DIR)
 
 # Now import from backend modules
-from physics_calculator import calculate_stress_and_deflection, calculate_mass
-from dfm_rules import check_dfm_rules
-from cost_estimator import calculate_manufacturing_cost
+from physics_calculator import (calculate_stress_and_deflection_batch,
+                                calculate_mass_batch, DESIGN_COLUMNS)
+from dfm_rules import evaluate_dfm_rules, count_flags
+from cost_estimator import estimate_costs_batch
+from material_library import get_material_table
 
 
-def generate_parameter_samples(n_samples=500):
-    """
-    Generate design parameter samples using Latin Hypercube Sampling.
-    LHS ensures good coverage of the parameter space.
+DATA_DIR = os.path.join(BACKEND_DIR, 'data')
+DEFAULT_OUTPUT_DIR = os.path.join(DATA_DIR, 'training_shards')
 
-    Args:
-        n_samples (int): Number of samples to generate
+# Design parameter bounds (min, max)
+DESIGN_BOUNDS = {
+    'base_length': (40.0, 70.0),      # mm
+    'base_width': (25.0, 40.0),       # mm
+    'base_thickness': (2.0, 5.0),     # mm
+    'rib_count': (2, 5),              # discrete integer
+    'rib_thickness': (1.5, 3.5),      # mm
+    'fillet_radius': (1.0, 4.0),      # mm
+    'hole_diameter': (3.0, 8.0)       # mm
+}
 
-    Returns:
-        list of dict: List of parameter dictionaries
-    """
-    print(
-        f"Generating {n_samples} parameter samples using Latin Hypercube Sampling...")
-
-    # Define parameter bounds (min, max)
-    bounds = {
-        'base_length': (40.0, 70.0),      # mm
-        'base_width': (25.0, 40.0),       # mm
-        'base_thickness': (2.0, 5.0),     # mm
-        'rib_count': (2, 5),              # discrete integer
-        'rib_thickness': (1.5, 3.5),      # mm
-        'fillet_radius': (1.0, 4.0),      # mm
-        'hole_diameter': (3.0, 8.0)       # mm
-    }
+# Applied-load range covered by the surrogate (N)
+LOAD_RANGE = (10.0, 250.0)
 
-    # Create Latin Hypercube sampler
-    n_dims = len(bounds)
-    # Fixed seed for reproducibility
-    sampler = qmc.LatinHypercube(d=n_dims, seed=42)
-    samples_unit = sampler.random(n=n_samples)  # Get samples in [0, 1]
+SAMPLERS = ('sobol', 'lhs')
+MANIFEST_FILE = 'manifest.json'
+SHARD_FORMAT_VERSION = 1
 
-    # Scale samples to actual parameter ranges
-    parameter_samples = []
-    param_names = list(bounds.keys())
 
-    for sample in samples_unit:
-        params = {}
-        for i, param_name in enumerate(param_names):
-            low, high = bounds[param_name]
-            value = low + sample[i] * (high - low)
-
-            # Round discrete parameters
-            if param_name == 'rib_count':
-                value = int(round(value))
-            # Round hole diameter to nearest 0.5mm
-            elif param_name == 'hole_diameter':
-                value = round(value * 2) / 2
-            else:
-                value = round(value, 2)
-
-            params[param_name] = value
+def parquet_available():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
 
-        parameter_samples.append(params)
 
-    print(f"✅ Generated {len(parameter_samples)} parameter sets")
-    return parameter_samples
+def sample_block(block_index, block_size, sampler='sobol', seed=42):
+    """
+    Unit-cube samples of one block, reproducible from its index alone.
 
+    Sobol blocks are consecutive slices of one scrambled sequence (so the
+    union of all blocks keeps its low-discrepancy property); LHS blocks are
+    independent hypercubes seeded per block.
 
-def evaluate_design(params, load=50.0, material='PLA'):
+    Returns:
+        ndarray: (block_size, 9) samples in [0, 1) - 7 design dims, load, material
     """
-    Evaluate a single design using fast physics calculator.
+    n_dims = len(DESIGN_BOUNDS) + 2
+    if sampler == 'sobol':
+        engine = qmc.Sobol(d=n_dims, scramble=True, seed=seed)
+        offset = block_index * block_size
+        if offset > 0:
+            # fast_forward(0) raises OverflowError on scipy 1.11.x
+            engine.fast_forward(offset)
+        return engine.random(block_size)
+    if sampler == 'lhs':
+        return qmc.LatinHypercube(d=n_dims, seed=seed + block_index).random(block_size)
+    raise ValueError(f"Unknown sampler '{sampler}'. Available: {', '.join(SAMPLERS)}")
+
+
+def scale_samples(unit, n_materials):
+    """
+    Map unit samples to designs, loads and material indices.
 
-    Args:
-        params (dict): Design parameters
-        load (float): Applied load in N
-        material (str): Material name
+    Rounding matches what the optimizer sees: integer rib counts, hole
+    diameters on a 0.5 mm grid and 0.01 mm elsewhere.
 
     Returns:
-        dict: Evaluation results
+        tuple: ((N, 7) design matrix, (N,) loads, (N,) material indices)
     """
-    try:
-        # Calculate physics
-        physics = calculate_stress_and_deflection(params, load, material)
-        mass = calculate_mass(params, material)
-
-        # Check DFM rules
-        dfm = check_dfm_rules(params)
-
-        # Calculate cost
-        cost = calculate_manufacturing_cost(params, material, '3d_printing')
-
-        # Combine results
-        result = {
-            **params,  # Include all parameters
-            'max_stress': physics['max_stress'],
-            'max_deflection': physics['max_deflection'],
-            'safety_factor': physics['safety_factor'],
-            'mass': mass,
-            'total_cost': cost['total_cost'],
-            'dfm_valid': dfm['is_valid'],
-            'dfm_violations': len(dfm['violations'])
-        }
+    low = np.array([bounds[0] for bounds in DESIGN_BOUNDS.values()], dtype=float)
+    high = np.array([bounds[1] for bounds in DESIGN_BOUNDS.values()], dtype=float)
+    X = low + unit[:, :7] * (high - low)
+    X = np.round(X, 2)
+    X[:, 3] = np.round(X[:, 3])
+    X[:, 6] = np.round(X[:, 6] * 2) / 2
 
-        return result
+    loads = np.round(LOAD_RANGE[0] + unit[:, 7] * (LOAD_RANGE[1] - LOAD_RANGE[0]), 2)
+    material_idx = np.minimum((unit[:, 8] * n_materials).astype(int), n_materials - 1)
+    return X, loads, material_idx
 
-    except Exception as e:
-        print(f"  ⚠️  Error evaluating design: {e}")
-        return None
 
+def evaluate_block(X, loads, material_idx):
+    """
+    Evaluate a block of designs with the vectorized physics, cost and DFM engines.
 
-def generate_training_dataset(n_samples=500, output_file='training_data.csv'):
+    Returns:
+        dict: Column name -> (N,) array, rounded like the scalar calculators
+    """
+    table, names = get_material_table()
+    materials = table[material_idx]
+
+    physics = calculate_stress_and_deflection_batch(X, loads, materials)
+    mass = calculate_mass_batch(X, materials)
+    cost = estimate_costs_batch(X, materials, ('3d_printing',))
+    violations, _ = evaluate_dfm_rules(X)
+
+    columns = {col: X[:, i] for i, col in enumerate(DESIGN_COLUMNS)}
+    columns['rib_count'] = X[:, 3].astype(int)
+    columns.update({
+        'load': loads,
+        'material': np.asarray(names, dtype=object)[material_idx],
+        'youngs_modulus': materials['youngs_modulus'],
+        'yield_strength': materials['yield_strength'],
+        'max_stress': np.round(physics['max_stress'], 2),
+        'max_deflection': np.round(physics['max_deflection'], 3),
+        'safety_factor': np.round(physics['safety_factor'], 2),
+        'mass': np.round(mass, 2),
+        'total_cost': np.round(cost['total_cost'][0], 2),
+        'dfm_valid': violations == 0,
+        'dfm_violations': count_flags(violations)
+    })
+    return columns
+
+
+def _shard_name(shard_index, fmt):
+    return f"shard-{shard_index:05d}.{fmt}"
+
+
+def generate_shard(output_dir, shard_index, block_size, sampler, seed, fmt):
     """
-    Generate complete training dataset.
+    Worker: sample, evaluate and write one shard atomically.
 
-    Args:
-        n_samples (int): Number of samples
-        output_file (str): Output CSV filename
+    Returns:
+        dict: Manifest entry for the shard
     """
-    print("=" * 70)
-    print("TRAINING DATA GENERATION")
-    print("=" * 70)
+    table, _ = get_material_table()
+    unit = sample_block(shard_index, block_size, sampler, seed)
+    columns = evaluate_block(*scale_samples(unit, len(table)))
+
+    name = _shard_name(shard_index, fmt)
+    tmp_path = os.path.join(output_dir, f".{name}.{os.getpid()}.tmp")
+    if fmt == 'parquet':
+        pd.DataFrame(columns).to_parquet(tmp_path, index=False)
+    else:
+        columns['material'] = columns['material'].astype(str)
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **columns)
+    os.replace(tmp_path, os.path.join(output_dir, name))
+
+    return {
+        'file': name,
+        'rows': int(block_size),
+        'dfm_valid': int(np.sum(columns['dfm_valid']))
+    }
 
-    # Generate parameter samples
-    parameter_samples = generate_parameter_samples(n_samples)
 
-    # Evaluate all designs
-    print(f"\nEvaluating {n_samples} designs...")
-    print("This will take about 30-60 seconds...")
+def read_manifest(output_dir):
+    """Shard manifest of a dataset directory, or None if there is none."""
+    path = os.path.join(output_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        return json.load(f)
+
 
-    results = []
-    valid_count = 0
+def _write_manifest(output_dir, manifest):
+    manifest['updated_at'] = time.time()
+    tmp_path = os.path.join(output_dir, f".{MANIFEST_FILE}.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, os.path.join(output_dir, MANIFEST_FILE))
 
-    for i, params in enumerate(parameter_samples):
-        if (i + 1) % 50 == 0:
-            print(
-                f"  Progress: {i + 1}/{n_samples} ({(i+1)/n_samples*100:.1f}%)")
 
-        result = evaluate_design(params, load=50.0, material='PLA')
+def iter_shards(output_dir, columns=None):
+    """
+    Stream a sharded dataset one DataFrame per shard.
+
+    Args:
+        output_dir (str): Dataset directory with manifest.json
+        columns (list): Optional subset of columns to load
+
+    Yields:
+        DataFrame: One shard
+    """
+    manifest = read_manifest(output_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"No {MANIFEST_FILE} in {output_dir}")
+
+    for key in sorted(manifest['shards'], key=int):
+        path = os.path.join(output_dir, manifest['shards'][key]['file'])
+        if path.endswith('.parquet'):
+            yield pd.read_parquet(path, columns=columns)
+        else:
+            with np.load(path, allow_pickle=False) as shard:
+                names = columns or list(shard.files)
+                yield pd.DataFrame({name: shard[name] for name in names})
+
+
+def load_dataset(output_dir, columns=None, max_rows=None):
+    """Concatenate shards into one DataFrame (optionally only the first max_rows)."""
+    frames, n_rows = [], 0
+    for frame in iter_shards(output_dir, columns):
+        frames.append(frame)
+        n_rows += len(frame)
+        if max_rows is not None and n_rows >= max_rows:
+            break
+    df = pd.concat(frames, ignore_index=True)
+    return df if max_rows is None else df.iloc[:max_rows]
+
+
+def generate_training_dataset(n_samples=131_072, output_dir=DEFAULT_OUTPUT_DIR,
+                              block_size=65_536, sampler='sobol', seed=42,
+                              n_workers=None, fmt=None):
+    """
+    Generate (or resume) a sharded training dataset.
 
-        if result is not None:
-            results.append(result)
-            if result['dfm_valid']:
-                valid_count += 1
+    Args:
+        n_samples (int): Total samples (rounded up to whole blocks)
+        output_dir (str): Dataset directory
+        block_size (int): Samples per shard (use a power of two for Sobol)
+        sampler (str): 'sobol' or 'lhs'
+        seed (int): Sampler seed
+        n_workers (int): Processes (default: CPU count)
+        fmt (str): 'parquet' or 'npz' (default: parquet if pyarrow is installed)
 
-    # Convert to DataFrame
-    df = pd.DataFrame(results)
+    Returns:
+        dict: Final manifest
+    """
+    fmt = fmt or ('parquet' if parquet_available() else 'npz')
+    n_shards = -(-n_samples // block_size)
+    os.makedirs(output_dir, exist_ok=True)
+
+    settings = {'format_version': SHARD_FORMAT_VERSION, 'sampler': sampler,
+                'seed': seed, 'block_size': block_size, 'format': fmt,
+                'load_range': list(LOAD_RANGE),
+                'design_bounds': {k: list(v) for k, v in DESIGN_BOUNDS.items()},
+                'materials': list(get_material_table()[1])}
+
+    manifest = read_manifest(output_dir)
+    if manifest is not None:
+        previous = {key: manifest.get(key) for key in settings}
+        if previous != settings:
+            raise ValueError(
+                f"{output_dir} was generated with different settings; "
+                f"use a new output directory")
+    else:
+        manifest = {**settings, 'shards': {}, 'created_at': time.time()}
+
+    # A shard counts as done only if its manifest entry and file both exist
+    done = {int(key) for key, entry in manifest['shards'].items()
+            if os.path.exists(os.path.join(output_dir, entry['file']))}
+    todo = [index for index in range(n_shards) if index not in done]
+    manifest['n_shards'] = max(n_shards, manifest.get('n_shards', 0))
+    manifest['n_rows'] = sum(manifest['shards'][str(index)]['rows'] for index in done)
 
-    # Save to CSV
-    output_path = os.path.join('../backend/data', output_file)
-    df.to_csv(output_path, index=False)
+    print("=" * 70)
+    print("TRAINING DATA GENERATION")
+    print("=" * 70)
+    print(f"{n_shards} shards x {block_size:,} samples ({sampler}, {fmt}) -> {output_dir}")
+    if done:
+        print(f"Resuming: {len(done)} shards already complete")
+
+    start = time.time()
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        futures = {
+            pool.submit(generate_shard, output_dir, index, block_size,
+                        sampler, seed, fmt): index
+            for index in todo
+        }
+        for i, future in enumerate(as_completed(futures), 1):
+            index = futures[future]
+            manifest['shards'][str(index)] = future.result()
+            manifest['n_rows'] = sum(entry['rows'] for entry in manifest['shards'].values())
+            _write_manifest(output_dir, manifest)
+            elapsed = time.time() - start
+            print(f"  Shard {index:5d} done ({len(done) + i}/{n_shards}, "
+                  f"{i * block_size / max(elapsed, 1e-9):,.0f} samples/s)")
+
+    _write_manifest(output_dir, manifest)
+    n_valid = sum(entry['dfm_valid'] for entry in manifest['shards'].values())
 
-    # Print statistics
     print("\n" + "=" * 70)
     print("DATASET STATISTICS")
     print("=" * 70)
-    print(f"Total designs generated: {len(df)}")
-    print(f"DFM-valid designs: {valid_count} ({valid_count/len(df)*100:.1f}%)")
-    print(
-        f"DFM-invalid designs: {len(df) - valid_count} ({(len(df)-valid_count)/len(df)*100:.1f}%)")
-
-    print("\nParameter Ranges:")
-    for col in ['base_length', 'base_width', 'base_thickness', 'rib_count']:
-        print(f"  {col}: {df[col].min():.1f} - {df[col].max():.1f}")
-
-    print("\nPerformance Ranges:")
-    print(
-        f"  Stress: {df['max_stress'].min():.1f} - {df['max_stress'].max():.1f} MPa")
-    print(
-        f"  Deflection: {df['max_deflection'].min():.3f} - {df['max_deflection'].max():.3f} mm")
-    print(
-        f"  Safety Factor: {df['safety_factor'].min():.2f} - {df['safety_factor'].max():.2f}")
-    print(f"  Mass: {df['mass'].min():.1f} - {df['mass'].max():.1f} g")
-    print(
-        f"  Cost: ₹{df['total_cost'].min():.2f} - ₹{df['total_cost'].max():.2f}")
-
-    print(f"\n✅ Dataset saved to: {output_path}")
+    print(f"Total designs generated: {manifest['n_rows']:,}")
+    print(f"DFM-valid designs: {n_valid:,} ({n_valid / manifest['n_rows'] * 100:.1f}%)")
+    print(f"\n✅ Dataset saved to: {output_dir}")
     print("=" * 70)
 
+    return manifest
+
+
+def export_csv(output_dir, csv_path, max_rows):
+    """Write the first max_rows samples as a CSV (uncertainty calibration, plots)."""
+    df = load_dataset(output_dir, max_rows=max_rows)
+    df.to_csv(csv_path, index=False)
+    print(f"✅ CSV sample ({len(df):,} rows) saved to: {csv_path}")
     return df
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate sharded surrogate training data")
+    parser.add_argument('--samples', type=int, default=131_072)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument('--block-size', type=int, default=65_536)
+    parser.add_argument('--sampler', choices=SAMPLERS, default='sobol')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Processes (default: CPU count)")
+    parser.add_argument('--format', choices=('parquet', 'npz'), default=None)
+    parser.add_argument('--csv', default='training_data.csv',
+                        help="CSV sample written to backend/data ('' to skip)")
+    parser.add_argument('--csv-rows', type=int, default=5000)
+    return parser.parse_args()
+
+
 if __name__ == '__main__':
-    # Generate 500 training samples
-    df = generate_training_dataset(
-        n_samples=500, output_file='training_data.csv')
+    args = parse_args()
+    generate_training_dataset(
+        n_samples=args.samples, output_dir=args.output,
+        block_size=args.block_size, sampler=args.sampler, seed=args.seed,
+        n_workers=args.workers, fmt=args.format)
+
+    if args.csv:
+        export_csv(args.output, os.path.join(DATA_DIR, args.csv), args.csv_rows)
 
     print("\n🚀 Training data generation complete!")
     print("Next step: Train surrogate model using this data")
@@ -0,0 +1,88 @@
+"""
+Load Sweep CLI
+Precomputes Pareto fronts for a grid of patient loads (and materials) into
+the API disk cache, e.g. 20-200 N in 5 N steps:
+
+    python run_load_sweep.py --materials PLA Aluminum6061 --load-min 20 --load-max 200 --load-step 5
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add backend directory to path BEFORE importing from backend modules
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend'))
+sys.path.append(BACKEND_DIR)
+
+# Now import from backend modules
+from load_sweep import load_grid, build_scenarios, run_load_sweep
+from optimizer import EVALUATORS, TERMINATIONS, SURROGATES
+from material_library import load_materials
+
+
+# Same directory the API reads its cache from
+CACHE_DIR = os.path.join(BACKEND_DIR, 'data', 'cache')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Optimize a grid of loads into the disk cache")
+    parser.add_argument('--materials', nargs='+', default=['PLA'])
+    parser.add_argument('--loads', nargs='+', type=float,
+                        help="Explicit loads in N (overrides the min/max/step grid)")
+    parser.add_argument('--load-min', type=float, default=20.0)
+    parser.add_argument('--load-max', type=float, default=200.0)
+    parser.add_argument('--load-step', type=float, default=5.0)
+    parser.add_argument('--pop-size', type=int, default=40)
+    parser.add_argument('--n-gen', type=int, default=50)
+    parser.add_argument('--evaluator', choices=EVALUATORS, default='surrogate')
+    parser.add_argument('--termination', choices=TERMINATIONS, default='n_gen')
+    parser.add_argument('--surrogate', choices=SURROGATES, default='auto')
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Processes (default: CPU count)")
+    parser.add_argument('--cache-dir', default=CACHE_DIR)
+    args = parser.parse_args()
+
+    known = load_materials()
+    unknown = [name for name in args.materials if name not in known]
+    if unknown:
+        parser.error(f"unknown material(s) {', '.join(unknown)} "
+                     f"(available: {', '.join(known)})")
+    return args
+
+
+def print_result(summary, results, cached, error):
+    label = f"{summary['material']:>14} @ {summary['load']:7.1f} N"
+    if error is not None:
+        print(f"  ❌ {label}: {error}")
+    elif cached:
+        print(f"  ♻️  {label}: cached ({summary['n_pareto']} designs)")
+    else:
+        print(f"  ✅ {label}: {summary['n_pareto']} designs, best {summary['best_mass']:.2f} g / "
+              f"₹{summary['best_cost']:.2f} in {summary['elapsed_s']:.1f}s "
+              f"({summary['n_generations']} gens)")
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    loads = args.loads or load_grid(args.load_min, args.load_max, args.load_step)
+    scenarios = build_scenarios(loads, args.materials)
+    os.makedirs(args.cache_dir, exist_ok=True)
+
+    print("=" * 70)
+    print(f"LOAD SWEEP: {len(scenarios)} scenarios")
+    print("=" * 70)
+
+    start = time.time()
+    summaries = run_load_sweep(
+        scenarios, args.cache_dir,
+        pop_size=args.pop_size, n_gen=args.n_gen,
+        evaluator=args.evaluator, termination=args.termination,
+        surrogate=args.surrogate, max_workers=args.workers, on_result=print_result)
+
+    n_failed = sum(1 for summary in summaries if 'error' in summary)
+    n_cached = sum(1 for summary in summaries if summary['cached'])
+    print("\n" + "=" * 70)
+    print(f"✅ Sweep finished in {time.time() - start:.1f}s: "
+          f"{len(summaries) - n_failed} fronts ({n_cached} from cache), {n_failed} failed")
+    print(f"Results cached in {args.cache_dir}")
@@ -4,45 +4,397 @@ Trains Gradient Boosting models to predict stress and deflection.
 These models replace slow beam theory calculations during optimization.
 """
 
+import argparse
 import os
+import shutil
+import time
 import joblib
+from joblib import Parallel, delayed
 from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
 from sklearn.model_selection import train_test_split
-from sklearn.ensemble import GradientBoostingRegressor
+from sklearn.ensemble import GradientBoostingRegressor, HistGradientBoostingRegressor
+from sklearn.inspection import permutation_importance
+from sklearn.compose import TransformedTargetRegressor
+from sklearn.neural_network import MLPRegressor
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import FunctionTransformer, StandardScaler
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import sys
 sys.path.append('../backend')
 
+from ensemble_predictor import FEATURE_COLUMNS, DESIGN_FEATURES, TARGETS
+from compact_surrogate import fit_compact_surrogate, save_compact_surrogate
 
-def load_training_data(filename='training_data.csv'):
-    """Load training data from CSV."""
+
+def load_training_data(filename='training_data.csv', max_rows=None):
+    """
+    Load training data from a sharded dataset directory or a CSV.
+
+    Args:
+        filename (str): CSV file or dataset directory in backend/data
+            (see generate_training_data.py)
+        max_rows (int): Only load the first max_rows samples of a sharded set
+    """
     filepath = os.path.join('../backend/data', filename)
-    df = pd.read_csv(filepath)
+    if os.path.isdir(filepath):
+        from generate_training_data import load_dataset
+        df = load_dataset(filepath, max_rows=max_rows)
+    else:
+        df = pd.read_csv(filepath)
     print(f"✅ Loaded {len(df)} training samples from {filename}")
     return df
 
 
-def train_surrogate_models(df):
+# Regressor types the ensemble can be trained with. 'hist' bins the inputs
+# once per member and fits several times faster on large datasets, but its
+# members are not compiled by tree_engine (they are predicted with sklearn).
+TRAIN_BACKENDS = ('gbr', 'hist')
+N_MEMBERS = 10
+
+# Out-of-bag rows used to estimate permutation importances for 'hist' members
+IMPORTANCE_ROWS = 2000
+
+
+def make_regressor(backend, random_state):
+    """Untrained ensemble member of the given backend."""
+    if backend == 'gbr':
+        return GradientBoostingRegressor(
+            n_estimators=100,
+            max_depth=6,
+            learning_rate=0.1,
+            subsample=0.8,
+            random_state=random_state,
+            verbose=0
+        )
+    if backend == 'hist':
+        return HistGradientBoostingRegressor(
+            max_iter=200,
+            max_leaf_nodes=31,
+            learning_rate=0.1,
+            early_stopping=False,
+            random_state=random_state
+        )
+    raise ValueError(f"Unknown backend '{backend}' (expected one of {TRAIN_BACKENDS})")
+
+
+def bootstrap_indices(n_rows, n_members, seed=42):
+    """
+    Bootstrap row indices for every ensemble member.
+
+    Each member draws from its own child of SeedSequence(seed), so the
+    samples do not depend on which process fits the member or in what order.
+    The stress and deflection models of a member share the same sample.
+
+    Returns:
+        list: n_members index arrays of length n_rows
+    """
+    children = np.random.SeedSequence(seed).spawn(n_members)
+    return [np.random.default_rng(child).integers(0, n_rows, size=n_rows)
+            for child in children]
+
+
+def _permutation_importances(model, X, y, random_state, scoring=None):
+    """Normalized permutation importances (for models without feature_importances_)."""
+    result = permutation_importance(
+        model, X, y, scoring=scoring, n_repeats=3, random_state=random_state)
+    importances = np.clip(result.importances_mean, 0.0, None)
+    total = importances.sum()
+    return importances / total if total > 0 else np.full(len(importances), 1.0 / len(importances))
+
+
+def _fit_member(member, backend, X, y_stress, y_defl, feature_columns, indices, random_state):
+    """
+    Fit the stress and deflection models of one ensemble member.
+
+    Runs in a worker process; X and the targets are plain arrays so joblib
+    can memory-map them instead of pickling a copy per task.
+
+    Returns:
+        tuple: (member, stress_model, deflection_model, fit seconds)
+    """
+    start = time.perf_counter()
+    X_boot = pd.DataFrame(X[indices], columns=feature_columns)
+    models = []
+    for y in (y_stress, y_defl):
+        model = make_regressor(backend, random_state)
+        model.fit(X_boot, y[indices])
+        models.append(model)
+    fit_seconds = time.perf_counter() - start
+
+    if backend == 'hist':
+        # The optimizer's mentor summary and the importance plot expect
+        # feature_importances_, which HistGradientBoosting does not provide
+        oob = np.setdiff1d(np.arange(len(X)), indices)[:IMPORTANCE_ROWS]
+        X_oob = pd.DataFrame(X[oob], columns=feature_columns)
+        for model, y in zip(models, (y_stress, y_defl)):
+            model.feature_importances_ = _permutation_importances(
+                model, X_oob, y[oob], random_state)
+
+    return member, models[0], models[1], fit_seconds
+
+
+def fit_ensembles(X_train, y_stress_train, y_defl_train, backend='gbr',
+                  n_members=N_MEMBERS, n_jobs=-1, seed=42):
+    """
+    Fit stress and deflection ensembles, one member per parallel task.
+
+    Args:
+        X_train (DataFrame): Training inputs
+        y_stress_train (Series): Stress targets
+        y_defl_train (Series): Deflection targets
+        backend (str): Regressor type, see TRAIN_BACKENDS
+        n_members (int): Ensemble members per target
+        n_jobs (int): Parallel fit processes (-1: all cores)
+        seed (int): Seed for the bootstrap samples and the regressors
+
+    Returns:
+        tuple: (stress_models, deflection_models, per-member fit seconds)
+    """
+    if backend not in TRAIN_BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}' (expected one of {TRAIN_BACKENDS})")
+
+    feature_columns = list(X_train.columns)
+    X = X_train.to_numpy(dtype=float)
+    y_stress = y_stress_train.to_numpy(dtype=float)
+    y_defl = y_defl_train.to_numpy(dtype=float)
+    samples = bootstrap_indices(len(X), n_members, seed)
+
+    print(f"\nFitting {n_members} {backend} members per target (n_jobs={n_jobs})...")
+    start = time.perf_counter()
+    # loky limits each worker's OpenMP threads so 'hist' does not oversubscribe
+    fitted = Parallel(n_jobs=n_jobs)(
+        delayed(_fit_member)(i, backend, X, y_stress, y_defl, feature_columns,
+                             samples[i], seed + i)
+        for i in range(n_members)
+    )
+    wall_seconds = time.perf_counter() - start
+
+    fitted.sort(key=lambda item: item[0])
+    stress_models = [item[1] for item in fitted]
+    deflection_models = [item[2] for item in fitted]
+    fit_times = [round(item[3], 3) for item in fitted]
+
+    for i, seconds in enumerate(fit_times):
+        print(f"   Member {i+1}/{n_members}: {seconds:.2f}s")
+    print(f"   Wall clock: {wall_seconds:.2f}s for {sum(fit_times):.2f}s of fitting "
+          f"({sum(fit_times) / wall_seconds:.1f}x parallel speedup)")
+
+    return stress_models, deflection_models, fit_times
+
+
+def make_joint_regressor(random_state):
+    """
+    Untrained multi-output member: an MLP whose two output units predict
+    stress and deflection from one shared hidden representation.
+
+    Targets are log-scaled and standardized so the deflection head (mm)
+    is not drowned out by stress (MPa) in the shared loss.
+    """
+    return TransformedTargetRegressor(
+        regressor=make_pipeline(
+            StandardScaler(),
+            MLPRegressor(hidden_layer_sizes=(64, 64), max_iter=300,
+                         early_stopping=True, random_state=random_state)),
+        transformer=make_pipeline(
+            FunctionTransformer(np.log1p, np.expm1), StandardScaler())
+    )
+
+
+def _target_scorer(index):
+    """R² of one output column, for per-target permutation importances."""
+    def score(estimator, X, y):
+        return r2_score(y[:, index], estimator.predict(X)[:, index])
+    return score
+
+
+def _fit_joint_member(member, X, Y, feature_columns, indices, random_state):
+    """
+    Fit one multi-output ensemble member (runs in a worker process).
+
+    Returns:
+        tuple: (member, model, fit seconds)
+    """
+    start = time.perf_counter()
+    model = make_joint_regressor(random_state)
+    model.fit(pd.DataFrame(X[indices], columns=feature_columns), Y[indices])
+    fit_seconds = time.perf_counter() - start
+
+    # Per-target importances for the optimizer's mentor summary
+    oob = np.setdiff1d(np.arange(len(X)), indices)[:IMPORTANCE_ROWS]
+    X_oob = pd.DataFrame(X[oob], columns=feature_columns)
+    model.target_importances_ = [
+        _permutation_importances(model, X_oob, Y[oob], random_state,
+                                 scoring=_target_scorer(k))
+        for k in range(Y.shape[1])
+    ]
+    return member, model, fit_seconds
+
+
+def train_joint_model(df, n_members=N_MEMBERS, n_jobs=-1, seed=42):
+    """
+    Train one multi-output ensemble for stress and deflection together.
+
+    Args:
+        df (DataFrame): Training data
+        n_members (int): Ensemble members
+        n_jobs (int): Parallel fit processes (-1: all cores)
+        seed (int): Seed for the bootstrap samples and the regressors
+
+    Returns:
+        tuple: (models, metrics)
+    """
+    print("\n" + "=" * 70)
+    print("TRAINING JOINT STRESS/DEFLECTION SURROGATE")
+    print("=" * 70)
+
+    feature_columns = FEATURE_COLUMNS
+    if not set(FEATURE_COLUMNS).issubset(df.columns):
+        print("⚠️  Dataset has no load/material columns - training design-only models")
+        feature_columns = DESIGN_FEATURES
+
+    X_train, X_test, Y_train, Y_test = train_test_split(
+        df[feature_columns], df[TARGETS], test_size=0.2, random_state=42)
+    print(f"\nTraining set: {len(X_train)} samples")
+    print(f"Test set: {len(X_test)} samples")
+
+    X = X_train.to_numpy(dtype=float)
+    Y = Y_train.to_numpy(dtype=float)
+    samples = bootstrap_indices(len(X), n_members, seed)
+
+    print(f"\nFitting {n_members} joint members (n_jobs={n_jobs})...")
+    start = time.perf_counter()
+    fitted = Parallel(n_jobs=n_jobs)(
+        delayed(_fit_joint_member)(i, X, Y, list(feature_columns), samples[i], seed + i)
+        for i in range(n_members)
+    )
+    wall_seconds = time.perf_counter() - start
+
+    fitted.sort(key=lambda item: item[0])
+    models = [item[1] for item in fitted]
+    fit_times = [round(item[2], 3) for item in fitted]
+    for i, seconds in enumerate(fit_times):
+        print(f"   Member {i+1}/{n_members}: {seconds:.2f}s")
+    print(f"   Wall clock: {wall_seconds:.2f}s for {sum(fit_times):.2f}s of fitting "
+          f"({sum(fit_times) / wall_seconds:.1f}x parallel speedup)")
+
+    Y_pred_train = np.mean([model.predict(X_train) for model in models], axis=0)
+    Y_pred_test = np.mean([model.predict(X_test) for model in models], axis=0)
+
+    metrics = {'backend': 'joint', 'fit_seconds': fit_times}
+    for k, (name, target, unit) in enumerate([
+            ('stress', 'max_stress', 'MPa'), ('deflection', 'max_deflection', 'mm')]):
+        y_test = Y_test[target].to_numpy()
+        metrics[name] = {
+            'r2_train': r2_score(Y_train[target], Y_pred_train[:, k]),
+            'r2_test': r2_score(y_test, Y_pred_test[:, k]),
+            'mae_test': mean_absolute_error(y_test, Y_pred_test[:, k]),
+            'rmse_test': np.sqrt(mean_squared_error(y_test, Y_pred_test[:, k]))
+        }
+        print(f"\n{name.capitalize()}:")
+        print(f"   Training R²: {metrics[name]['r2_train']:.4f}")
+        print(f"   Test R²: {metrics[name]['r2_test']:.4f}")
+        print(f"   Test MAE: {metrics[name]['mae_test']:.3f} {unit}")
+        print(f"   Test RMSE: {metrics[name]['rmse_test']:.3f} {unit}")
+
+    return models, metrics
+
+
+def save_joint_model(models):
+    """Save a trained joint ensemble; the optimizer prefers it when present."""
+    joint_path = '../backend/data/joint_ensemble.pkl'
+    joblib.dump(models, joint_path)
+    print(f"\n✅ Joint ensemble ({len(models)} models) saved: {joint_path}")
+
+
+def train_compact_model(df, degree=1, alpha=1e-6):
+    """
+    Fit the log-space ridge surrogate (see compact_surrogate.py).
+
+    Args:
+        df (DataFrame): Training data
+        degree (int): 1 for log-linear, 2 adds pairwise products
+        alpha (float): Ridge penalty
+
+    Returns:
+        tuple: (CompactSurrogate, metrics)
+    """
+    print("\n" + "=" * 70)
+    print("TRAINING COMPACT LOG-SPACE SURROGATE")
+    print("=" * 70)
+
+    feature_columns = FEATURE_COLUMNS
+    if not set(FEATURE_COLUMNS).issubset(df.columns):
+        print("⚠️  Dataset has no load/material columns - training design-only model")
+        feature_columns = DESIGN_FEATURES
+
+    X_train, X_test, Y_train, Y_test = train_test_split(
+        df[feature_columns], df[TARGETS], test_size=0.2, random_state=42)
+
+    start = time.perf_counter()
+    model = fit_compact_surrogate(
+        X_train.to_numpy(dtype=float), Y_train.to_numpy(dtype=float),
+        feature_columns, degree=degree, alpha=alpha)
+    print(f"\nFitted {len(model.terms)} terms in {time.perf_counter() - start:.3f}s")
+
+    Y_pred, _ = model.predict(X_test)
+    metrics = {'backend': 'compact'}
+    for k, (name, target, unit) in enumerate([
+            ('stress', 'max_stress', 'MPa'), ('deflection', 'max_deflection', 'mm')]):
+        y_test = Y_test[target].to_numpy()
+        metrics[name] = {
+            'r2_test': r2_score(y_test, Y_pred[:, k]),
+            'mae_test': mean_absolute_error(y_test, Y_pred[:, k]),
+            'rmse_test': np.sqrt(mean_squared_error(y_test, Y_pred[:, k]))
+        }
+        print(f"\n{name.capitalize()}:")
+        print(f"   Test R²: {metrics[name]['r2_test']:.4f}")
+        print(f"   Test MAE: {metrics[name]['mae_test']:.3f} {unit}")
+        print(f"   Residual σ (log): {model.residual_sigma[k]:.4f}")
+
+    # Inference cost for one NSGA-II population
+    population = X_test.to_numpy(dtype=float)[:100]
+    start = time.perf_counter()
+    for _ in range(1000):
+        model.predict(population)
+    per_call = (time.perf_counter() - start) / 1000
+    print(f"\n⚡ {len(population)}-design population: {per_call * 1e6:.1f} µs per prediction")
+
+    return model, metrics
+
+
+def save_compact_model(model):
+    """Save a compact surrogate; the optimizer prefers it when present."""
+    compact_path = '../backend/data/compact_surrogate.json'
+    save_compact_surrogate(model, compact_path)
+    print(f"\n✅ Compact surrogate ({len(model.terms)} terms) saved: {compact_path}")
+
+
+def train_surrogate_models(df, backend='gbr', n_members=N_MEMBERS, n_jobs=-1, seed=42):
     """
     Train separate models for stress and deflection prediction.
 
     Args:
         df (DataFrame): Training data
+        backend (str): Regressor type, see TRAIN_BACKENDS
+        n_members (int): Ensemble members per target
+        n_jobs (int): Parallel fit processes (-1: all cores)
+        seed (int): Seed for the bootstrap samples and the regressors
 
     Returns:
-        tuple: (stress_model, deflection_model, metrics)
+        tuple: (stress_models, deflection_models, metrics)
     """
     print("\n" + "=" * 70)
     print("TRAINING SURROGATE MODELS")
     print("=" * 70)
 
-    # Define features (design parameters)
-    feature_columns = [
-        'base_length', 'base_width', 'base_thickness',
-        'rib_count', 'rib_thickness', 'fillet_radius', 'hole_diameter'
-    ]
+    # Define features (design parameters + load and material properties).
+    # Datasets generated before load was sampled only have design columns.
+    feature_columns = FEATURE_COLUMNS
+    if not set(FEATURE_COLUMNS).issubset(df.columns):
+        print("⚠️  Dataset has no load/material columns - training design-only models")
+        feature_columns = DESIGN_FEATURES
 
     X = df[feature_columns]
     y_stress = df['max_stress']
@@ -60,45 +412,11 @@ def train_surrogate_models(df):
     print(f"\nTraining set: {len(X_train)} samples")
     print(f"Test set: {len(X_test)} samples")
 
-    # Train ensemble of models (10 models for better robustness)
-    print("\n1. Training stress prediction ensemble (10 models)...")
-    stress_models = []
-    deflection_models = []
-
-    for i in range(10):
-        print(f"   Training ensemble member {i+1}/10...")
-
-        # Bootstrap sample (sample with replacement)
-        indices = np.random.choice(
-            len(X_train), size=len(X_train), replace=True)
-        X_boot = X_train.iloc[indices]
-        y_stress_boot = y_stress_train.iloc[indices]
-        y_defl_boot = y_defl_train.iloc[indices]
-
-        # Train stress model
-        stress_model = GradientBoostingRegressor(
-            n_estimators=100,
-            max_depth=6,
-            learning_rate=0.1,
-            subsample=0.8,
-            random_state=i,
-            verbose=0
-        )
-        stress_model.fit(X_boot, y_stress_boot)
-        stress_models.append(stress_model)
-
-        # Train deflection model
-        defl_model = GradientBoostingRegressor(
-            n_estimators=100,
-            max_depth=6,
-            learning_rate=0.1,
-            subsample=0.8,
-            random_state=i,
-            verbose=0
-        )
-        defl_model.fit(X_boot, y_defl_boot)
-        deflection_models.append(defl_model)
+    stress_models, deflection_models, fit_times = fit_ensembles(
+        X_train, y_stress_train, y_defl_train,
+        backend=backend, n_members=n_members, n_jobs=n_jobs, seed=seed)
 
+    print("\n1. Evaluating stress prediction ensemble...")
     # Evaluate stress ensemble (average predictions from all models)
     y_stress_pred_train = np.mean(
         [model.predict(X_train) for model in stress_models], axis=0)
@@ -148,6 +466,8 @@ def train_surrogate_models(df):
 
     # Collect metrics
     metrics = {
+        'backend': backend,
+        'fit_seconds': fit_times,
         'stress': {
             'r2_train': stress_r2_train,
             'r2_test': stress_r2_test,
@@ -174,12 +494,84 @@ def save_models(stress_models, deflection_models):
     joblib.dump(deflection_models, deflection_path)
 
     print(f"\n✅ Ensemble models saved:")
-    print(f"   Stress ensemble (10 models): {stress_path}")
-    print(f"   Deflection ensemble (10 models): {deflection_path}")
+    print(f"   Stress ensemble ({len(stress_models)} models): {stress_path}")
+    print(f"   Deflection ensemble ({len(deflection_models)} models): {deflection_path}")
+
+    # Memory-mappable compiled arrays shared by all API workers
+    from model_registry import export_artifact, artifact_dir_for
+    for path, models in [(stress_path, stress_models),
+                         (deflection_path, deflection_models)]:
+        try:
+            artifact_dir = export_artifact(path, models=models)
+        except TypeError:
+            # Only GradientBoostingRegressor members can be compiled; drop any
+            # artifact of a previous ensemble so it cannot be mapped instead
+            shutil.rmtree(artifact_dir_for(path), ignore_errors=True)
+            print(f"   No compiled artifact for {os.path.basename(path)} "
+                  f"({type(models[0]).__name__} members)")
+            continue
+        print(f"   Compiled artifact: {artifact_dir}")
+
+
+def benchmark_training(df, backends=TRAIN_BACKENDS, n_members=N_MEMBERS, n_jobs=-1,
+                       seed=42):
+    """
+    Compare fit time and accuracy of the backends, serial vs. parallel.
+
+    Args:
+        df (DataFrame): Training data
+        backends (tuple): Backends to compare
+        n_members (int): Ensemble members per run
+        n_jobs (int): Parallel fit processes, compared against a serial run
+        seed (int): Seed shared by every run
+
+    Returns:
+        list: One dict per (backend, n_jobs) run
+    """
+    print("\n" + "=" * 70)
+    print("TRAINING BENCHMARK")
+    print("=" * 70)
+
+    feature_columns = FEATURE_COLUMNS if set(FEATURE_COLUMNS).issubset(df.columns) \
+        else DESIGN_FEATURES
+    X_train, X_test, y_stress_train, y_stress_test, y_defl_train, y_defl_test = \
+        train_test_split(df[feature_columns], df['max_stress'], df['max_deflection'],
+                         test_size=0.2, random_state=42)
+
+    rows = []
+    for backend in backends:
+        for jobs in dict.fromkeys((1, n_jobs)):
+            start = time.perf_counter()
+            stress_models, deflection_models, fit_times = fit_ensembles(
+                X_train, y_stress_train, y_defl_train, backend=backend,
+                n_members=n_members, n_jobs=jobs, seed=seed)
+            wall_seconds = time.perf_counter() - start
+            rows.append({
+                'backend': backend,
+                'n_jobs': jobs,
+                'wall_s': wall_seconds,
+                'member_s': float(np.mean(fit_times)),
+                'stress_r2': r2_score(y_stress_test, np.mean(
+                    [model.predict(X_test) for model in stress_models], axis=0)),
+                'deflection_r2': r2_score(y_defl_test, np.mean(
+                    [model.predict(X_test) for model in deflection_models], axis=0))
+            })
+
+    print(f"\n{'backend':>8} {'n_jobs':>6} {'wall (s)':>9} {'per member (s)':>15} "
+          f"{'stress R²':>10} {'defl. R²':>9}")
+    for row in rows:
+        print(f"{row['backend']:>8} {row['n_jobs']:>6} {row['wall_s']:>9.2f} "
+              f"{row['member_s']:>15.2f} {row['stress_r2']:>10.4f} {row['deflection_r2']:>9.4f}")
+    return rows
 
 
 def test_prediction_speed(stress_models, deflection_models):
-    """Test prediction speed vs. original physics calculator."""
+    """
+    Test prediction speed vs. original physics calculator.
+
+    Quick sanity check after training; benchmark_surrogates.py measures
+    latency, throughput and memory of every evaluator against a baseline.
+    """
     print("\n" + "=" * 70)
     print("PREDICTION SPEED TEST")
     print("=" * 70)
@@ -197,7 +589,12 @@ def test_prediction_speed(stress_models, deflection_models):
 
     # Test surrogate prediction (ensemble average)
     import time
-    X_test = pd.DataFrame([test_params])
+    from material_library import get_material
+    pla = get_material('PLA')
+    model_inputs = {**test_params, 'load': 50.0,
+                    'youngs_modulus': pla['youngs_modulus'],
+                    'yield_strength': pla['yield_strength']}
+    X_test = pd.DataFrame([model_inputs])[list(stress_models[0].feature_names_in_)]
 
     start = time.time()
     for _ in range(1000):
@@ -253,8 +650,15 @@ def plot_feature_importance(stress_models):
     avg_importances = np.mean(
         [model.feature_importances_ for model in stress_models], axis=0)
 
-    feature_names = ['Length', 'Width', 'Thickness',
-                     'Ribs', 'Rib Thick', 'Fillet', 'Hole']
+    feature_labels = {
+        'base_length': 'Length', 'base_width': 'Width',
+        'base_thickness': 'Thickness', 'rib_count': 'Ribs',
+        'rib_thickness': 'Rib Thick', 'fillet_radius': 'Fillet',
+        'hole_diameter': 'Hole', 'load': 'Load',
+        'youngs_modulus': 'E', 'yield_strength': 'Yield'
+    }
+    feature_names = [feature_labels.get(col, col)
+                     for col in stress_models[0].feature_names_in_]
 
     # Sort by importance
     indices = np.argsort(avg_importances)[::-1]
@@ -265,7 +669,7 @@ def plot_feature_importance(stress_models):
             avg_importances[indices], color='steelblue')
     plt.xticks(range(len(avg_importances)), [
                feature_names[i] for i in indices], rotation=45)
-    plt.xlabel('Design Parameter', fontsize=12)
+    plt.xlabel('Model Input', fontsize=12)
     plt.ylabel('Importance (Gini)', fontsize=12)
     plt.title('Feature Importance for Stress Prediction (Ensemble Average)',
               fontsize=14, fontweight='bold')
@@ -279,16 +683,61 @@ def plot_feature_importance(stress_models):
     plt.close()
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Train the surrogate ensembles")
+    parser.add_argument('--backend', choices=TRAIN_BACKENDS, default='gbr')
+    parser.add_argument('--members', type=int, default=N_MEMBERS,
+                        help="Ensemble members per target")
+    parser.add_argument('--jobs', type=int, default=-1,
+                        help="Parallel fit processes (-1: all cores)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--max-rows', type=int, default=200_000,
+                        help="Samples to load from a sharded dataset")
+    parser.add_argument('--joint', action='store_true',
+                        help="Train one multi-output stress+deflection ensemble instead")
+    parser.add_argument('--compact', action='store_true',
+                        help="Fit the log-space ridge surrogate instead (JSON artifact)")
+    parser.add_argument('--degree', type=int, default=1, choices=(1, 2),
+                        help="Compact surrogate: 2 adds pairwise log-feature products")
+    parser.add_argument('--benchmark', action='store_true',
+                        help="Only compare backend fit times, do not save models")
+    return parser.parse_args()
+
+
 if __name__ == '__main__':
+    args = parse_args()
+
     print("=" * 70)
     print("SURROGATE MODEL TRAINING PIPELINE")
     print("=" * 70)
 
     # Load data
-    df = load_training_data('training_data.csv')
+    if os.path.exists('../backend/data/training_shards/manifest.json'):
+        df = load_training_data('training_shards', max_rows=args.max_rows)
+    else:
+        df = load_training_data('training_data.csv')
+
+    if args.benchmark:
+        benchmark_training(df, n_members=args.members, n_jobs=args.jobs, seed=args.seed)
+        sys.exit(0)
+
+    if args.compact:
+        compact_model, metrics = train_compact_model(df, degree=args.degree)
+        save_compact_model(compact_model)
+        sys.exit(0)
+
+    if args.joint:
+        joint_models, metrics = train_joint_model(
+            df, n_members=args.members, n_jobs=args.jobs, seed=args.seed)
+        save_joint_model(joint_models)
+        print(f"\n✅ Stress R²: {metrics['stress']['r2_test']:.4f}, "
+              f"Deflection R²: {metrics['deflection']['r2_test']:.4f}")
+        sys.exit(0)
 
     # Train ensemble models
-    stress_models, deflection_models, metrics = train_surrogate_models(df)
+    stress_models, deflection_models, metrics = train_surrogate_models(
+        df, backend=args.backend, n_members=args.members,
+        n_jobs=args.jobs, seed=args.seed)
 
     # Save ensemble models
     save_models(stress_models, deflection_models)